@@ -4,7 +4,10 @@ Run: python run_sample.py (from repo root) or python app.py (from sample-dashboa
 """
 from __future__ import annotations
 
+import json
 import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
 
 # Ensure sample-dashboard on path so local imports (components, pages, data, utils) resolve
@@ -12,24 +15,48 @@ _root = Path(__file__).resolve().parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
-import dash_bootstrap_components as dbc
-from dash import Dash, Input, Output, dcc, html
+from utils.startup import format_startup_report, import_timed, lazy_import, mark, timed_imports
 
-from components.layout import make_config_panel, make_navbar, make_page_container
-from pages import charts, config as config_page, insights
-from utils.config import DEFAULT_CHART_CONFIG
+with timed_imports("dash"):
+    import dash_bootstrap_components as dbc
+    from dash import ClientsideFunction, Dash, Input, Output, State, ctx, dcc, html, no_update
 
-# Bootstrap theme per docs/08-UI-ACCESSIBILITY
+from components.layout import make_config_panel, make_navbar, make_page_container, progress_id, visible_store_id
+from pages import PAGES, load_page, page_for_path
+from utils.config import (
+    BACKGROUND_JOBS_DIR,
+    CHART_UPDATE_MODE,
+    DEFAULT_CHART_CONFIG,
+    FIGURE_TEMPLATE,
+    GRAPH_LOADING,
+    METRICS_ALLOW_REMOTE,
+    METRICS_ENABLED,
+    STARTUP_REPORT,
+    STARTUP_WARMUP,
+)
+from utils.metrics import instrument
+from utils.templates import serve_templates
+
+# Builders (and pandas, loaders) are imported on first use, not at app import (utils/startup.py)
+chart_builders = lazy_import("components.charts")
+page_render = lazy_import("components.render")
+encoding = lazy_import("utils.encoding")
+loaders = lazy_import("data.loaders")
+
+# Bootstrap theme per docs/08-UI-ACCESSIBILITY. Page graphs are not in the initial layout, so
+# callbacks targeting them need suppress_callback_exceptions.
 app = Dash(
     __name__,
     use_pages=False,
     external_stylesheets=[dbc.themes.BOOTSTRAP],
+    suppress_callback_exceptions=True,
 )
 
 app.layout = html.Div(
     [
         dcc.Location(id="url", refresh=False),
         dcc.Store(id="config-store", data=DEFAULT_CHART_CONFIG),
+        dcc.Store(id="clientside-theme-applied"),
         html.Div(
             [
                 make_navbar(),
@@ -45,6 +72,35 @@ app.layout = html.Div(
 )
 
 
+# Registered chart templates, loaded once per browser instead of inside every figure
+if FIGURE_TEMPLATE == "reference":
+    serve_templates(app)
+
+# Python palettes/templates for assets/clientside_theme.js, so the two cannot drift
+THEME_EXPORT_URL = "/_dashboard/clientside-theme.js"
+
+
+@lru_cache(maxsize=1)
+def clientside_theme_script() -> str:
+    """JavaScript defining window.dashboardThemeExport (clientside_theme_export())."""
+    return f"window.dashboardThemeExport = {json.dumps(chart_builders.clientside_theme_export())};\n"
+
+
+if CHART_UPDATE_MODE == "clientside":
+
+    @app.server.route(THEME_EXPORT_URL)
+    def serve_clientside_theme():
+        """Build the export on the first request for it, so app import does not load the builders."""
+        import flask
+
+        response = flask.Response(clientside_theme_script(), mimetype="application/javascript")
+        response.add_etag()
+        response.headers["Cache-Control"] = "no-cache"
+        return response.make_conditional(flask.request)
+
+    app.config.external_scripts.append(app.get_relative_path(THEME_EXPORT_URL))
+
+
 @app.callback(
     Output("theme-store", "data"),
     Output("theme-wrapper", "className"),
@@ -92,23 +148,281 @@ def toggle_config_panel_visibility(pathname: str | None) -> dict:
     return {"display": "none"}
 
 
+# In patch/clientside mode theme/config changes are applied to the rendered graphs in place, so
+# they must not re-render the page; the current values are still read when the route changes.
+_ThemeConfigDep = State if CHART_UPDATE_MODE in ("patch", "clientside") else Input
+
+
 @app.callback(
     Output("page-content", "children"),
     Input("url", "pathname"),
-    Input("theme-store", "data"),
-    Input("config-store", "data"),
+    Input("navbar-refresh-btn", "n_clicks"),
+    _ThemeConfigDep("theme-store", "data"),
+    _ThemeConfigDep("config-store", "data"),
 )
-def render_page_content(pathname: str | None, theme: str | None, chart_config: dict | None):
-    """Route pathname to the correct page layout; pass theme and chart config."""
+def render_page_content(
+    pathname: str | None, _refresh_clicks: int | None, theme: str | None, chart_config: dict | None
+):
+    """Route pathname to the correct page layout; pass theme and chart config. Pages load on first hit.
+
+    The navbar refresh button drops the cached loader results first, so the page is rebuilt from fresh data.
+    """
+    if "navbar-refresh-btn.n_clicks" in ctx.triggered_prop_ids:
+        loaders.invalidate_loaders()
     theme = theme or "light"
     config = chart_config if isinstance(chart_config, dict) else DEFAULT_CHART_CONFIG
-    if pathname in (None, "", "/", "/charts"):
-        return charts.layout(theme, config)
-    if pathname == "/insights":
-        return insights.layout(theme, config)
-    if pathname == "/config":
-        return config_page.layout(theme, config)
-    return html.Div("Not found", className="text-muted")
+    name = page_for_path(pathname)
+    if name is None:
+        return html.Div("Not found", className="text-muted")
+    content = load_page(name).layout(theme, config)
+    if mark("first_layout") and STARTUP_REPORT:
+        print(format_startup_report(), file=sys.stderr)
+    return content
+
+
+def register_patch_callback(name: str) -> None:
+    """Update a page's rendered graphs in place on theme/config changes (CHART_UPDATE_MODE="patch")."""
+    graph_ids = list(PAGES[name]["graph_ids"])
+
+    @app.callback(
+        *[Output(graph_id, "figure") for graph_id in graph_ids],
+        *[Output(graph_id, "config") for graph_id in graph_ids],
+        Input("theme-store", "data"),
+        Input("config-store", "data"),
+        prevent_initial_call=True,
+    )
+    def patch_page_figures(theme: str | None, chart_config: dict | None) -> tuple:
+        """Send only the theme/config-controlled figure properties (Dash Patch); data arrays stay put."""
+        theme = theme or "light"
+        config = chart_config if isinstance(chart_config, dict) else DEFAULT_CHART_CONFIG
+        triggered = ctx.triggered_prop_ids
+        theme_changed = "theme-store.data" in triggered
+        config_changed = "config-store.data" in triggered
+        figures = load_page(name).build_figures(theme, config)
+        # Pre-rendered figures (dicts) cost nothing to send whole; built ones are diffed into a Patch
+        patches = [
+            encoding.wire_figure(figures[graph_id])
+            if isinstance(figures[graph_id], dict)
+            else chart_builders.figure_patch(figures[graph_id], theme_changed, config_changed)
+            for graph_id in graph_ids
+        ]
+        graph_config = {"displayModeBar": config.get("show_modebar", True)} if config_changed else no_update
+        return (*patches, *[graph_config] * len(graph_ids))
+
+
+def register_lazy_graph_callback(name: str, graph_id: str) -> None:
+    """Fill one graph when its cell scrolls into view (GRAPH_LOADING="lazy", assets/lazy_graphs.js).
+
+    In patch mode theme/config changes also arrive here and patch the graph once it is filled; in
+    rerender mode the page re-render and in clientside mode the browser apply them instead.
+    """
+    visible_id = visible_store_id(graph_id)
+    theme_config_dep = Input if CHART_UPDATE_MODE == "patch" else State
+
+    @app.callback(
+        Output(graph_id, "figure"),
+        Output(graph_id, "config"),
+        Input(visible_id, "data"),
+        theme_config_dep("theme-store", "data"),
+        theme_config_dep("config-store", "data"),
+        prevent_initial_call=True,
+    )
+    def render_graph(visible_token: str | None, theme: str | None, chart_config: dict | None) -> tuple:
+        """Full figure when the graph becomes visible or is pre-rendered; a Patch for later theme/config changes."""
+        if not visible_token:
+            return no_update, no_update
+        theme = theme or "light"
+        config = chart_config if isinstance(chart_config, dict) else DEFAULT_CHART_CONFIG
+        graph_config = {"displayModeBar": config.get("show_modebar", True)}
+        fig = page_render.build_page_figure(load_page(name).GRAPHS, graph_id, theme, config)
+        triggered = ctx.triggered_prop_ids
+        if f"{visible_id}.data" in triggered or isinstance(fig, dict):
+            return encoding.wire_figure(fig), graph_config
+        config_changed = "config-store.data" in triggered
+        patch = chart_builders.figure_patch(fig, "theme-store.data" in triggered, config_changed)
+        return patch, graph_config if config_changed else no_update
+
+
+def register_background_graph_callback(name: str, graph_id: str) -> None:
+    """Like register_lazy_graph_callback, but the graph is built by a background job (utils/jobs.py):
+    the request returns at once and the browser polls for the figure, with the job's progress in
+    the cell's status line. Navigating away cancels the job (unless other users wait on it).
+
+    Theme/config changes rebuild the full figure (a job result is a figure, not a Patch).
+    """
+    visible_id = visible_store_id(graph_id)
+    theme_config_dep = Input if CHART_UPDATE_MODE == "patch" else State
+
+    @app.callback(
+        Output(graph_id, "figure"),
+        Output(graph_id, "config"),
+        Input(visible_id, "data"),
+        theme_config_dep("theme-store", "data"),
+        theme_config_dep("config-store", "data"),
+        # Dash keys background results by the callback's source code and its arguments, not by
+        # its outputs, and every graph registered here shares this source (graph_id is a closure
+        # variable). The graph's own id as an argument keeps two graphs with the same theme and
+        # config from sharing a job or a cached figure.
+        State(graph_id, "id"),
+        background=True,
+        manager=JOB_MANAGER,
+        progress=[Output(progress_id(graph_id), "children")],
+        progress_default=[""],
+        cancel=[Input("url", "pathname")],
+        # Argument 0, the render token, differs per page view and is left out of the key, so jobs
+        # and results are shared per (graph id, theme, config)
+        cache_args_to_ignore=[0],
+        prevent_initial_call=True,
+    )
+    def render_graph_job(
+        set_progress,
+        visible_token: str | None,
+        theme: str | None,
+        chart_config: dict | None,
+        _graph_id: str,
+    ) -> tuple:
+        """Full figure for the graph, built in a job process."""
+        if not visible_token:
+            return no_update, no_update
+        theme = theme or "light"
+        config = chart_config if isinstance(chart_config, dict) else DEFAULT_CHART_CONFIG
+        set_progress("Building chart…")
+        fig = page_render.build_page_figure(load_page(name).GRAPHS, graph_id, theme, config)
+        return encoding.wire_figure(fig), {"displayModeBar": config.get("show_modebar", True)}
+
+
+# Shared job manager for background graphs; None (all graphs built in the request) when not configured
+JOB_MANAGER = None
+if BACKGROUND_JOBS_DIR:
+    from utils.jobs import job_manager
+
+    JOB_MANAGER = job_manager(BACKGROUND_JOBS_DIR, queued_progress=["Waiting for a worker…"])
+
+if GRAPH_LOADING == "lazy":
+    for _name, _page in PAGES.items():
+        for _graph_id in _page["graph_ids"]:
+            if JOB_MANAGER is not None and _graph_id in _page.get("background_graph_ids", ()):
+                register_background_graph_callback(_name, _graph_id)
+            else:
+                register_lazy_graph_callback(_name, _graph_id)
+elif CHART_UPDATE_MODE == "patch":
+    for _name, _page in PAGES.items():
+        if _page["graph_ids"]:
+            register_patch_callback(_name)
+
+
+def register_filter_callback(name: str) -> None:
+    """Refill a page's filtered graphs when one of its dropdowns changes (e.g. pages/explore.py).
+
+    The page's build_figures takes the dropdown values as keyword arguments named by dimension
+    and answers from a precomputed cube (data/cubes.py). The page layout already holds the
+    figures for the initial dropdown values, so the callback skips its initial call.
+    Theme/config changes are Inputs only in patch mode, as for the lazy graphs; otherwise a
+    page re-render or the browser applies them.
+    """
+    filters, graph_ids = PAGES[name]["filters"], PAGES[name]["filter_graph_ids"]
+    theme_config_dep = Input if CHART_UPDATE_MODE == "patch" else State
+
+    @app.callback(
+        *[Output(graph_id, "figure") for graph_id in graph_ids],
+        *[Input(dropdown_id, "value") for dropdown_id in filters],
+        theme_config_dep("theme-store", "data"),
+        theme_config_dep("config-store", "data"),
+        prevent_initial_call=True,
+    )
+    def filter_page_figures(*values) -> tuple:
+        """Figures for the selected filter values, sliced from the page's aggregate cube."""
+        *filter_values, theme, chart_config = values
+        config = chart_config if isinstance(chart_config, dict) else DEFAULT_CHART_CONFIG
+        selected = dict(zip(filters.values(), filter_values))
+        figures = load_page(name).build_figures(theme or "light", config, **selected)
+        return tuple(encoding.wire_figure(figures[graph_id]) for graph_id in graph_ids)
+
+
+for _name, _page in PAGES.items():
+    if "filters" in _page:
+        register_filter_callback(_name)
+
+
+def register_stream_callback(name: str) -> None:
+    """Append new rows to a page's streamed graph on each Interval tick (e.g. pages/live.py).
+
+    The graph's watermark lives in the page's Store, so the server keeps no per-session state.
+    In patch mode theme/config changes also arrive here and patch the graph's layout from the
+    page's style_figure, without loading rows; the streamed data stays in place.
+    """
+    stream = PAGES[name]["stream"]
+    graph_id = stream["graph_id"]
+    theme_config_dep = Input if CHART_UPDATE_MODE == "patch" else State
+
+    @app.callback(
+        Output(graph_id, "extendData"),
+        Output(stream["store_id"], "data"),
+        Output(graph_id, "figure"),
+        Input(stream["interval_id"], "n_intervals"),
+        State(stream["store_id"], "data"),
+        theme_config_dep("theme-store", "data"),
+        theme_config_dep("config-store", "data"),
+        prevent_initial_call=True,
+    )
+    def stream_rows(_n_intervals: int, state: dict | None, theme: str | None, chart_config: dict | None) -> tuple:
+        """extendData with the rows after the stored watermark; a layout Patch on theme/config changes."""
+        page = load_page(name)
+        triggered = ctx.triggered_prop_ids
+        if f"{stream['interval_id']}.n_intervals" not in triggered:
+            config = chart_config if isinstance(chart_config, dict) else DEFAULT_CHART_CONFIG
+            patch = chart_builders.figure_patch(
+                page.style_figure(theme or "light", config),
+                "theme-store.data" in triggered,
+                "config-store.data" in triggered,
+                trace_types=(state or {}).get("trace_types"),
+            )
+            return no_update, no_update, patch
+        extend, watermark = page.stream_update((state or {}).get("watermark"))
+        if extend is None:
+            return no_update, no_update, no_update
+        return extend, {**(state or {}), "watermark": watermark}, no_update
+
+
+for _name, _page in PAGES.items():
+    if "stream" in _page:
+        register_stream_callback(_name)
+
+# Clientside: re-style every rendered graph in the browser (assets/clientside_theme.js); no
+# server round trip for theme or config toggles.
+if CHART_UPDATE_MODE == "clientside":
+    app.clientside_callback(
+        ClientsideFunction(namespace="dashboardTheme", function_name="applyTheme"),
+        Output("clientside-theme-applied", "data"),
+        Input("theme-store", "data"),
+        Input("config-store", "data"),
+        prevent_initial_call=True,
+    )
+
+# Server-Timing headers and /metrics for every callback above (register callbacks before this)
+if METRICS_ENABLED:
+    instrument(app, allow_remote=METRICS_ALLOW_REMOTE)
+
+
+def warm_up(pages: tuple[str, ...] | None = None, build_figures: bool = True) -> None:
+    """Import page modules and plotly.express ahead of the first request and, with build_figures,
+    build each page's default figures so loader and figure caches are filled.
+
+    Call from a gunicorn post_fork hook, or set STARTUP_WARMUP to run it in a background thread on boot.
+    """
+    for name in pages or tuple(PAGES):
+        page = load_page(name)
+        if build_figures and hasattr(page, "build_figures"):
+            page.build_figures("light", DEFAULT_CHART_CONFIG)
+    import_timed("plotly.express")
+    mark("warm_up")
+
+
+mark("app_ready")
+if STARTUP_WARMUP:
+    threading.Thread(target=warm_up, name="startup-warm-up", daemon=True).start()
+if STARTUP_REPORT:
+    print(format_startup_report(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+/*
+ * Template restore for FIGURE_TEMPLATE=reference. Figures arrive without layout.template and
+ * name it in layout.meta.template instead; the templates themselves are loaded once from
+ * /_dashboard/chart-templates.js (window.dashboardTemplates, utils/templates.py). This wraps
+ * Plotly.react / Plotly.newPlot so the named template is put back before plotly.js draws.
+ * Inert when window.dashboardTemplates is not defined. See docs/04-PLOTLY-GUIDE.md §4.
+ */
+(function () {
+  function withTemplate(layout) {
+    var templates = window.dashboardTemplates;
+    var name = layout && layout.meta && layout.meta.template;
+    if (!templates || !name || layout.template || !templates[name]) {
+      return layout;
+    }
+    // Copy: the figure object belongs to the dcc.Graph props
+    return Object.assign({}, layout, { template: templates[name] });
+  }
+
+  function wrap(plot) {
+    return function (gd, dataOrFigure, layout, config) {
+      var args = Array.prototype.slice.call(arguments);
+      if (dataOrFigure && !Array.isArray(dataOrFigure) && typeof dataOrFigure === "object") {
+        // Plotly.react(gd, {data, layout, config, frames}) - the form dcc.Graph uses
+        args[1] = Object.assign({}, dataOrFigure, { layout: withTemplate(dataOrFigure.layout) });
+      } else if (args.length > 2) {
+        args[2] = withTemplate(layout);
+      }
+      return plot.apply(this, args);
+    };
+  }
+
+  function install(Plotly) {
+    if (Plotly && !Plotly.__dashboardTemplates) {
+      Plotly.react = wrap(Plotly.react);
+      Plotly.newPlot = wrap(Plotly.newPlot);
+      Plotly.__dashboardTemplates = true;
+    }
+    return Plotly;
+  }
+
+  if (window.Plotly) {
+    install(window.Plotly);
+    return;
+  }
+  // dcc.Graph loads plotly.js on demand; wrap it as soon as it is assigned to window.Plotly
+  var current;
+  Object.defineProperty(window, "Plotly", {
+    configurable: true,
+    get: function () {
+      return current;
+    },
+    set: function (value) {
+      current = install(value);
+    },
+  });
+})();
@@ -0,0 +1,79 @@
+/*
+ * Clientside theme/config engine (CHART_UPDATE_MODE=clientside). Mirrors apply_theme and the
+ * DEFAULT_CHART_CONFIG toggles in components/charts.py and re-styles the rendered graphs in place
+ * with Plotly.update, so theme and config toggles never reach the server.
+ * Theme values come from window.dashboardThemeExport (clientside_theme_export() in Python, served
+ * at /_dashboard/clientside-theme.js); nothing palette-related is hardcoded here. See docs/05-DASH-GUIDE.md §5.
+ */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+  dashboardTheme: {
+    applyTheme: function (theme, config) {
+      var Plotly = window.Plotly;
+      var exported = window.dashboardThemeExport;
+      if (!Plotly || !exported) {
+        return window.dash_clientside.no_update;
+      }
+      var target = exported[theme === "dark" ? "dark" : "light"];
+      // FIGURE_TEMPLATE=reference exports only the name; the template was loaded with the page
+      var template = target.template || (window.dashboardTemplates || {})[target.template_name];
+      var cfg = config || {};
+      var flag = function (key) {
+        return cfg[key] === undefined ? true : Boolean(cfg[key]);
+      };
+      var root = document.getElementById("page-content") || document;
+      var graphs = root.querySelectorAll(".js-plotly-plot");
+
+      graphs.forEach(function (gd) {
+        var layout = gd.layout || {};
+        var meta = layout.meta || {};
+        var oldColorway = layout.colorway || [];
+        var layoutUpdate = {
+          template: template,
+          "meta.template": target.template_name,
+          paper_bgcolor: target.paper_bgcolor,
+          plot_bgcolor: target.plot_bgcolor,
+          "font.color": target.font_color,
+          colorway: target.colorway,
+          showlegend: flag("show_legend"),
+          "xaxis.showgrid": flag("show_grid"),
+          "yaxis.showgrid": flag("show_grid"),
+          "title.text": flag("show_titles") ? meta.title || "" : "",
+        };
+        if (layout.piecolorway) {
+          layoutUpdate.piecolorway = target.colorway;
+        }
+        if (layout.coloraxis) {
+          layoutUpdate["coloraxis.colorscale"] = target.heatmap_colorscale;
+        }
+
+        // Per-trace values; undefined leaves a trace untouched, null resets to the default.
+        // Builders take trace colors from the theme colorway by position; map them across themes.
+        var markerColors = [];
+        var textTemplates = [];
+        var textInfos = [];
+        (gd.data || []).forEach(function (trace) {
+          var color = trace.marker && trace.marker.color;
+          var idx = typeof color === "string" ? oldColorway.indexOf(color) : -1;
+          markerColors.push(idx >= 0 ? target.colorway[idx % target.colorway.length] : undefined);
+          var barLabel = trace.orientation === "h" ? "%{x}" : "%{y}";
+          var labelled = trace.type === "bar" && meta.bar_labels;
+          textTemplates.push(labelled ? (flag("show_data_labels") ? barLabel : null) : undefined);
+          var pieLabel = flag("show_data_labels") ? exported.pie_textinfo : "none";
+          textInfos.push(trace.type === "pie" ? pieLabel : undefined);
+        });
+        var traceUpdate = {
+          "marker.color": markerColors,
+          texttemplate: textTemplates,
+          textinfo: textInfos,
+        };
+        Plotly.update(gd, traceUpdate, layoutUpdate);
+
+        var modebar = gd.querySelector(".modebar-container");
+        if (modebar) {
+          modebar.style.display = flag("show_modebar") ? "" : "none";
+        }
+      });
+      return { theme: theme, config: cfg };
+    },
+  },
+});
@@ -0,0 +1,68 @@
+/*
+ * Lazy graph loading (GRAPH_LOADING=lazy). Page layouts render empty graphs in cells marked with
+ * data-visible-store (make_lazy_graph_grid in components/layout.py); when a cell comes within
+ * ROOT_MARGIN of the viewport its Store is set to the render token, which fires that graph's
+ * callback. Graphs that are never scrolled to are never built. See docs/05-DASH-GUIDE.md §6.
+ */
+(function () {
+  var ROOT_MARGIN = "200px";
+  var SELECTOR = "[data-visible-store]";
+  var warned = false;
+
+  function reveal(cell) {
+    var dashClientside = window.dash_clientside;
+    if (!dashClientside || !dashClientside.set_props) {
+      // dash_clientside.set_props needs Dash >= 2.16 (requirements.txt); use GRAPH_LOADING=eager before that
+      if (!warned) {
+        warned = true;
+        console.warn("lazy_graphs.js: dash_clientside.set_props is unavailable (Dash < 2.16); graphs cannot load lazily");
+      }
+      return;
+    }
+    dashClientside.set_props(cell.getAttribute("data-visible-store"), {
+      data: cell.getAttribute("data-render-token"),
+    });
+  }
+
+  // Without IntersectionObserver every graph loads right away
+  var observer =
+    "IntersectionObserver" in window
+      ? new IntersectionObserver(
+          function (entries) {
+            entries.forEach(function (entry) {
+              if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                reveal(entry.target);
+              }
+            });
+          },
+          { rootMargin: ROOT_MARGIN }
+        )
+      : null;
+
+  // A cell is (re)observed whenever it carries a render token it has not been revealed for,
+  // including DOM nodes React reuses when the same page layout is rendered again
+  function scan() {
+    document.querySelectorAll(SELECTOR).forEach(function (cell) {
+      var token = cell.getAttribute("data-render-token");
+      if (cell.getAttribute("data-observed-token") === token) {
+        return;
+      }
+      cell.setAttribute("data-observed-token", token);
+      if (observer) {
+        observer.unobserve(cell);
+        observer.observe(cell);
+      } else {
+        reveal(cell);
+      }
+    });
+  }
+
+  new MutationObserver(scan).observe(document.documentElement, {
+    childList: true,
+    subtree: true,
+    attributes: true,
+    attributeFilter: ["data-render-token"],
+  });
+  scan();
+})();
@@ -0,0 +1,4 @@
+"""
+Benchmarks for chart builders, page layouts and figure serialization. Run from sample-dashboard/:
+python -m benchmarks --help. See README.md (Benchmarks).
+"""
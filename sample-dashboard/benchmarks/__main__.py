@@ -0,0 +1,75 @@
+"""
+Command line entry point: python -m benchmarks [--sizes ...] [--output FILE] [--compare BASELINE].
+
+Examples (from sample-dashboard/):
+  python -m benchmarks --output benchmarks/baseline.json       # record a baseline
+  python -m benchmarks --compare benchmarks/baseline.json      # exit 1 on regressions
+  python -m benchmarks --sizes 100 10000 --pages-only
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# Page timings cover the whole page: build every figure into render_page_content's response
+# rather than leaving graphs to their lazy callbacks (read by utils.config on import)
+os.environ.setdefault("GRAPH_LOADING", "eager")
+
+from benchmarks.runner import (
+    DEFAULT_SIZES,
+    TIME_TOLERANCE,
+    bench_builders,
+    bench_pages,
+    compare,
+    environment,
+    summarize_pages,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="row counts per builder")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case below 1M rows (median is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory pass")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--builders-only", action="store_true")
+    group.add_argument("--pages-only", action="store_true")
+    parser.add_argument("--output", type=Path, help="write results as JSON (use as a baseline later)")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to check for regressions")
+    parser.add_argument(
+        "--time-tolerance", type=float, default=TIME_TOLERANCE, help="relative slowdown allowed (default 0.25)"
+    )
+    args = parser.parse_args(argv)
+
+    results = {"environment": environment()}
+    if not args.pages_only:
+        print("Builders")
+        results["builders"] = bench_builders(args.sizes, repeat=args.repeat, memory=not args.no_memory)
+    if not args.builders_only:
+        print("Pages (render_page_content, theme × config)")
+        results["pages"] = bench_pages()
+        results["page_summary"] = summarize_pages(results["pages"])
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Wrote {args.output}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("environment") != results["environment"]:
+            print("Note: baseline was recorded with different library versions:", baseline.get("environment"))
+        regressions = compare(results, baseline, time_tolerance=args.time_tolerance)
+        for item in regressions:
+            print(
+                f"REGRESSION {item['section']} {item['case']} {item['metric']}: "
+                f"{item['baseline']} -> {item['current']} (×{item['ratio']})"
+            )
+        print(f"{len(regressions)} regression(s) against {args.compare}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Benchmark cases: every graph on the dashboard pages, fed synthetic data of a given row count
+shaped like its loader's output (same columns, realistic cardinalities).
+"""
+from __future__ import annotations
+
+import itertools
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from data.loaders import stamp_version
+from pages import PAGES, load_page
+
+REGIONS = ["North", "South", "East", "West", "Central"]
+SEGMENTS = ["A", "B", "C"]
+CATEGORIES = ["Electronics", "Clothing", "Home", "Sports", "Other"]
+TEAMS = ["Alpha", "Beta", "Gamma", "Delta", "Epsilon", "Zeta", "Eta", "Theta"]
+
+
+def _sales_by_region(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    return pd.DataFrame({
+        "region": rng.choice(REGIONS, n),
+        "sales": rng.integers(50, 200, n),
+        "orders": rng.integers(10, 80, n),
+    })
+
+
+def _timeseries(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    return pd.DataFrame({
+        "month": pd.date_range("2000-01-01", periods=n, freq="min"),
+        "revenue": 100 + rng.standard_normal(n).cumsum(),
+        "costs": 70 + rng.standard_normal(n).cumsum(),
+    })
+
+
+def _scatter(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    units = rng.uniform(0, 100, n)
+    return pd.DataFrame({
+        "units": units,
+        "revenue": units * 9 + rng.normal(0, 40, n),
+        "segment": rng.choice(SEGMENTS, n),
+    })
+
+
+def _pie(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    return pd.DataFrame({"category": rng.choice(CATEGORIES, n), "share": rng.uniform(0, 10, n)})
+
+
+def _box(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    team = rng.integers(0, len(TEAMS), n)
+    return pd.DataFrame({"team": np.asarray(TEAMS)[team], "score": rng.normal(70 + team * 5, 12)})
+
+
+def _histogram(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    return pd.DataFrame({"response_ms": rng.exponential(200, n)})
+
+
+def _heatmap(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    quarters = [f"{year}Q{q}" for year in range(2015, 2025) for q in range(1, 5)]
+    return pd.DataFrame({
+        "quarter": rng.choice(quarters, n),
+        "region": rng.choice([f"Region {i:02d}" for i in range(50)], n),
+        "revenue": rng.uniform(50, 150, n),
+    })
+
+
+# Loader name -> synthetic generator with the loader's columns
+GENERATORS: dict[str, Callable[[int, np.random.Generator], pd.DataFrame]] = {
+    "load_sales_by_region": _sales_by_region,
+    "load_timeseries": _timeseries,
+    "load_scatter_data": _scatter,
+    "load_pie_data": _pie,
+    "load_box_data": _box,
+    "load_histogram_data": _histogram,
+    "load_heatmap_data": _heatmap,
+}
+
+# Builders that draw one mark per row (no downsampling/aggregation) are capped at these sizes
+MAX_ROWS = {"bar_chart": 100_000, "pie_chart": 1_000_000}
+
+_FRAME_SEQ = itertools.count(1)
+
+
+def graph_specs() -> list[dict]:
+    """GRAPHS specs of every page, in manifest order."""
+    return [spec for name in PAGES for spec in getattr(load_page(name), "GRAPHS", ())]
+
+
+def make_frame(loader_name: str, n: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic n-row frame for a loader, stamped with a fresh version like a real load (so
+    aggregate and figure caches miss, as after a data refresh)."""
+    df = GENERATORS[loader_name](n, np.random.default_rng(seed))
+    stamp_version(df, f"bench:{loader_name}:{n}:{next(_FRAME_SEQ)}")
+    return df
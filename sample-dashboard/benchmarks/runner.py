@@ -0,0 +1,233 @@
+"""
+Benchmark runner: chart builders across data sizes, page renders across theme × config, and
+comparison of a run against a stored baseline.
+"""
+from __future__ import annotations
+
+import gc
+import itertools
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Callable
+
+import dash
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from benchmarks.cases import MAX_ROWS, graph_specs, make_frame
+from components.charts import FIGURE_CACHE
+from data.aggregate import AGGREGATE_CACHE
+from pages import PAGES
+from utils.config import DEFAULT_CHART_CONFIG, FIGURE_BUILD
+from utils.encoding import to_compact_json
+from utils.theme import THEMES
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Figure serializers to time per builder case: name -> fig -> str. Add alternatives here to
+# compare them against plotly's default encoder.
+SERIALIZERS: dict[str, Callable[[go.Figure], str]] = {
+    "to_json": lambda fig: fig.to_json(),
+    "compact": to_compact_json,
+}
+
+# Relative slowdown / growth past which a metric counts as a regression, and the absolute
+# floors below which differences are treated as noise
+TIME_TOLERANCE = 0.25
+BYTES_TOLERANCE = 0.05
+MIN_TIME_DELTA_MS = 2.0
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _timed(func: Callable, repeat: int):
+    """Median wall time (ms) of func over repeat runs, and the last result."""
+    times, result = [], None
+    for _ in range(repeat):
+        AGGREGATE_CACHE.clear()
+        started = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - started)
+    return _ms(statistics.median(times)), result
+
+
+def _peak_mb(func: Callable) -> float:
+    """Peak traced allocation (MiB) while running func; NumPy buffers are included."""
+    AGGREGATE_CACHE.clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return round(peak / 2**20, 2)
+
+
+def environment() -> dict:
+    """Library and interpreter versions (and the figure build mode), stored with results so
+    baselines can be compared fairly."""
+    return {
+        "figure_build": FIGURE_BUILD,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "dash": dash.__version__,
+        "plotly": plotly.__version__,
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def bench_builders(sizes=DEFAULT_SIZES, repeat: int = 3, memory: bool = True, log=print) -> list[dict]:
+    """Build, serialize and measure every page graph's builder at each row count.
+
+    Builders run uncached (FIGURE_CACHE bypassed, aggregate cache cleared per run), so numbers
+    are for a cold build after a data refresh.
+    """
+    results = []
+    for spec in graph_specs():
+        builder = spec["builder"].uncached
+        for rows in sizes:
+            if rows > MAX_ROWS.get(builder.__name__, rows):
+                continue
+            df = make_frame(spec["loader"].__name__, rows)
+
+            def build() -> go.Figure:
+                return builder(df, theme="light", config=DEFAULT_CHART_CONFIG, **spec["kwargs"])
+
+            case_repeat = repeat if rows < 1_000_000 else 1
+            build_ms, fig = _timed(build, case_repeat)
+            row = {"graph": spec["id"], "builder": builder.__name__, "rows": rows, "build_ms": build_ms}
+            for name, serialize in SERIALIZERS.items():
+                ms, payload = _timed(lambda: serialize(fig), case_repeat)
+                row[f"{name}_ms"] = ms
+                row[f"{name}_bytes"] = len(payload.encode())
+            if memory:
+                row["peak_mb"] = _peak_mb(lambda: SERIALIZERS["to_json"](build()))
+            results.append(row)
+            log(_format_row(row))
+            del df, fig
+    return results
+
+
+def config_variants() -> list[dict]:
+    """Every on/off combination of the chart config toggles (2**5 = 32)."""
+    keys = list(DEFAULT_CHART_CONFIG)
+    return [dict(zip(keys, values)) for values in itertools.product((True, False), repeat=len(keys))]
+
+
+def _config_label(config: dict) -> str:
+    return "".join("1" if config[key] else "0" for key in DEFAULT_CHART_CONFIG)
+
+
+def bench_pages(log=print) -> list[dict]:
+    """Time render_page_content end to end for every page route × theme × config variant.
+
+    cold_ms clears the figure and aggregate caches first (loaders stay cached); warm_ms is the
+    immediate re-render. bytes is the size of the JSON Dash sends for page-content.
+    """
+    from app import render_page_content
+
+    results = []
+    for name, page in PAGES.items():
+        path = next(p for p in page["paths"] if p)
+        render_page_content(path, "light", DEFAULT_CHART_CONFIG)  # import the page outside the timings
+        for theme, config in itertools.product(THEMES, config_variants()):
+            FIGURE_CACHE.clear()
+            AGGREGATE_CACHE.clear()
+            started = time.perf_counter()
+            content = render_page_content(path, theme, config)
+            cold = time.perf_counter() - started
+            started = time.perf_counter()
+            render_page_content(path, theme, config)
+            warm = time.perf_counter() - started
+            row = {
+                "page": name,
+                "path": path,
+                "theme": theme,
+                "config": _config_label(config),
+                "cold_ms": _ms(cold),
+                "warm_ms": _ms(warm),
+                "bytes": len(pio.json.to_json_plotly(content).encode()),
+            }
+            results.append(row)
+    for row in summarize_pages(results):
+        log(
+            f"{row['page']:<10} {row['theme']:<6} {row['renders']} configs  cold median {row['cold_ms']:>8.1f} ms  "
+            f"warm median {row['warm_ms']:>6.2f} ms  max {row['bytes'] / 1024:>8.1f} KiB"
+        )
+    return results
+
+
+def summarize_pages(rows: list[dict]) -> list[dict]:
+    """Per page and theme: median cold/warm render time over the config variants and the largest payload.
+
+    Single renders are too noisy to compare one by one; baselines compare these summaries.
+    """
+    summary = []
+    for (page, theme), group in itertools.groupby(rows, key=lambda row: (row["page"], row["theme"])):
+        group = list(group)
+        summary.append({
+            "page": page,
+            "theme": theme,
+            "renders": len(group),
+            "cold_ms": round(statistics.median(row["cold_ms"] for row in group), 3),
+            "warm_ms": round(statistics.median(row["warm_ms"] for row in group), 3),
+            "bytes": max(row["bytes"] for row in group),
+        })
+    return summary
+
+
+def _format_row(row: dict) -> str:
+    parts = [f"{row['graph']:<26}", f"{row['rows']:>10,}", f"build {row['build_ms']:>9.1f} ms"]
+    for name in SERIALIZERS:
+        parts.append(f"{name} {row[f'{name}_ms']:>8.1f} ms {row[f'{name}_bytes'] / 1024:>10.1f} KiB")
+    if "peak_mb" in row:
+        parts.append(f"peak {row['peak_mb']:>8.1f} MiB")
+    return "  ".join(parts)
+
+
+def _case_key(section: str, row: dict) -> tuple:
+    if section == "builders":
+        return (row["graph"], row["rows"])
+    return (row["page"], row["theme"])
+
+
+def compare(current: dict, baseline: dict, time_tolerance: float = TIME_TOLERANCE) -> list[dict]:
+    """Metrics in current that regressed against baseline (matching cases only).
+
+    Times (*_ms) regress when slower by more than time_tolerance and MIN_TIME_DELTA_MS; sizes
+    (*bytes, peak_mb) when larger by more than BYTES_TOLERANCE.
+    """
+    regressions = []
+    for section in ("builders", "page_summary"):
+        base_rows = {_case_key(section, row): row for row in baseline.get(section, [])}
+        for row in current.get(section, []):
+            base = base_rows.get(_case_key(section, row))
+            if base is None:
+                continue
+            for metric, value in row.items():
+                old = base.get(metric)
+                if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or metric in ("rows", "renders"):
+                    continue
+                if metric.endswith("_ms"):
+                    regressed = value > old * (1 + time_tolerance) and value - old > MIN_TIME_DELTA_MS
+                else:
+                    regressed = value > old * (1 + BYTES_TOLERANCE)
+                if regressed:
+                    regressions.append({
+                        "section": section,
+                        "case": _case_key(section, row),
+                        "metric": metric,
+                        "baseline": old,
+                        "current": value,
+                        "ratio": round(value / old, 2) if old else float("inf"),
+                    })
+    return regressions
@@ -4,19 +4,169 @@ See docs/07-COMPONENTS.md and docs/04-PLOTLY-GUIDE.md.
 """
 from __future__ import annotations
 
+import inspect
+from functools import lru_cache, wraps
+from typing import Callable, Sequence
+
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+from dash import Patch
 
-from utils.theme import get_palette, get_colorway
+from components import fast_traces
+from data.aggregate import box_stats, histogram_bins, pivot_matrix
+from data.loaders import dataset_version
+from data.sampling import capped_sample, downsample_series, stratified_sample
+from data.sql import sql_table
+from utils.cache import LRUCache
+from utils.config import (
+    CHART_POINT_BUDGET,
+    FIGURE_BUILD,
+    FIGURE_CACHE_SIZE,
+    FIGURE_TEMPLATE,
+    HEATMAP_MAX_CELLS,
+    normalize_chart_config,
+)
+from utils.metrics import phase, record_cache
+from utils.startup import lazy_import
+from utils.templates import register_templates
+from utils.theme import THEMES, get_palette, get_colorway
 
+# Imported on first use by a builder (see utils/startup.py)
+px = lazy_import("plotly.express")
 
-def apply_theme(
-    fig: go.Figure,
-    theme: str = "light",
-    config: dict | None = None,
-) -> go.Figure:
-    """Apply sample app theme and chart config to a figure. See docs/08-UI-ACCESSIBILITY.md."""
+# Registered project template per theme name (utils/templates.py)
+TEMPLATES = register_templates()
+
+# Pie slice labels when show_data_labels is on
+PIE_TEXTINFO = "label+percent"
+
+# Hover text of a prebinned histogram bar: the bin's edges and its count
+HISTOGRAM_HOVERTEMPLATE = "%{customdata[0]:.4g} – %{customdata[1]:.4g}<br>Count: %{y}<extra>%{fullData.name}</extra>"
+
+# Built figures keyed by (builder, args, dataset version, theme, config). Cached figures are
+# shared between callers: treat them as read-only.
+FIGURE_CACHE = LRUCache(maxsize=FIGURE_CACHE_SIZE)
+
+
+def _cache_key_part(value):
+    """Hashable stand-in for a builder argument; raises TypeError when there is none."""
+    if isinstance(value, pd.DataFrame):
+        version = dataset_version(value)
+        if version is None:
+            raise TypeError("DataFrame cannot be versioned")
+        return ("df", version)
+    if isinstance(value, (list, tuple)):
+        return tuple(_cache_key_part(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _cache_key_part(item)) for key, item in value.items()))
+    hash(value)
+    return value
+
+
+def cached_figure(builder: Callable[..., go.Figure]) -> Callable[..., go.Figure]:
+    """Memoize a chart builder in FIGURE_CACHE. Only figure-affecting config keys are part of the key."""
+    signature = inspect.signature(builder)
+
+    def cache_key(*args, **kwargs) -> tuple | None:
+        """FIGURE_CACHE key for a call, or None if an argument cannot be keyed."""
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        try:
+            return (builder.__name__,) + tuple(
+                (name, normalize_chart_config(value) if name == "config" else _cache_key_part(value))
+                for name, value in bound.arguments.items()
+            )
+        except TypeError:
+            return None
+
+    @wraps(builder)
+    def wrapper(*args, **kwargs) -> go.Figure:
+        key = cache_key(*args, **kwargs)
+        if key is None:
+            return builder(*args, **kwargs)
+        fig = FIGURE_CACHE.get(key)
+        record_cache("figure", hit=fig is not None)
+        if fig is None:
+            fig = builder(*args, **kwargs)
+            FIGURE_CACHE.set(key, fig)
+        return fig
+
+    wrapper.uncached = builder
+    wrapper.cache_key = cache_key
+    return wrapper
+
+
+def figure_cache_stats() -> dict:
+    """Hit/miss/eviction counters of the chart builder cache."""
+    return FIGURE_CACHE.stats()
+
+
+# Builder arguments that name DataFrame columns
+COLUMN_ARGS = ("x", "y", "color", "names", "values", "z")
+
+
+def plotted_columns(kwargs: dict) -> tuple[str, ...]:
+    """Columns a builder call reads from its DataFrame, in first-seen order (for loader projection)."""
+    columns: list[str] = []
+    for name in COLUMN_ARGS:
+        value = kwargs.get(name)
+        for column in value if isinstance(value, (list, tuple)) else [value]:
+            if column is not None and column not in columns:
+                columns.append(column)
+    return tuple(columns)
+
+
+def pushdown_spec(builder_name: str, kwargs: dict) -> tuple[tuple, dict] | None:
+    """Aggregation (data/sql.py spec) a builder call can have its loader run at the source, and
+    the builder kwargs to use on the aggregated rows; None when the builder needs raw rows."""
+    if builder_name == "bar_chart":
+        by = tuple(dict.fromkeys(key for key in (kwargs["x"], kwargs.get("color")) if key is not None))
+        return ("group", by, ((kwargs["y"], "sum"),)), {}
+    if builder_name == "heatmap_chart":
+        aggfunc = kwargs.get("aggfunc", "sum")
+        # Sums and maxima of per-cell sums/maxima are exact when pivot_matrix merges cells; means are not
+        if aggfunc not in ("sum", "count", "max"):
+            return None
+        spec = ("group", (kwargs["x"], kwargs["y"]), ((kwargs["z"], aggfunc),))
+        return spec, {"aggfunc": "sum"} if aggfunc == "count" else {}
+    if builder_name == "histogram_chart":
+        if not kwargs.get("prebinned", True) or not kwargs.get("nbins") or kwargs.get("clip_quantiles"):
+            return None
+        return ("bins", kwargs["x"], kwargs["nbins"], kwargs.get("color")), {}
+    return None
+
+
+def graph_data(spec: dict) -> tuple[pd.DataFrame, dict]:
+    """Load one page GRAPHS cell's data: the builder's aggregated rows when the loader is backed by
+    a SQL table (pushdown_spec), otherwise only the plotted columns. Returns (df, builder kwargs)."""
+    kwargs = spec["kwargs"]
+    pushdown = pushdown_spec(spec["builder"].__name__, kwargs) if sql_table(spec["loader"].__name__) else None
+    if pushdown is None:
+        return spec["loader"](columns=plotted_columns(kwargs)), kwargs
+    aggregate, overrides = pushdown
+    return spec["loader"](aggregate=aggregate), {**kwargs, **overrides}
+
+
+def build_graph(spec: dict, theme: str = "light", config: dict | None = None) -> go.Figure:
+    """Build one page GRAPHS cell, loading only the columns (or aggregates) its builder plots."""
+    with phase("load"):
+        df, kwargs = graph_data(spec)
+    with phase("build"):
+        return spec["builder"](df, theme=theme, config=config or {}, **kwargs)
+
+
+def placeholder_figure(message: str, title: str | None = None, theme: str = "light", config: dict | None = None) -> go.Figure:
+    """Empty themed figure with a centered message, for grid cells that failed or timed out."""
+    fig = go.Figure(layout=dict(title=title))
+    fig.add_annotation(text=message, showarrow=False, xref="paper", yref="paper", x=0.5, y=0.5, font_size=14)
+    fig.update_xaxes(visible=False)
+    fig.update_yaxes(visible=False)
+    return apply_theme(fig, theme, config)
+
+
+def _theme_layout(theme: str, config: dict | None, meta: dict | None, title: str | None) -> dict:
+    """Layout updates apply_theme makes, for a figure with the given meta and title text."""
     palette = get_palette(theme)
     cfg = config or {}
     show_legend = cfg.get("show_legend", True)
@@ -24,7 +174,7 @@ def apply_theme(
     show_grid = cfg.get("show_grid", True)
 
     layout_updates = dict(
-        template="plotly_dark" if theme == "dark" else "plotly_white",
+        template=TEMPLATES["dark" if theme == "dark" else "light"],
         paper_bgcolor=palette["chart_paper"],
         plot_bgcolor=palette["chart_plot"],
         font=dict(
@@ -32,18 +182,142 @@ def apply_theme(
             size=12,
             color=palette["text_primary"],
         ),
-        title_font_size=16,
+        title=dict(font=dict(size=16)),
         colorway=get_colorway(theme),
         margin=dict(t=40, b=40, l=50, r=20),
         showlegend=show_legend,
         xaxis=dict(showgrid=show_grid),
         yaxis=dict(showgrid=show_grid),
     )
+    # Keep the builder's title in meta so clientside re-theming can restore it (assets/clientside_theme.js);
+    # the template name lets FIGURE_TEMPLATE=reference drop the template itself from the wire
+    layout_updates["meta"] = {**(meta or {}), "title": title, "template": layout_updates["template"]}
     if not show_titles:
-        layout_updates["title"] = {"text": ""}
-    return fig.update_layout(**layout_updates)
+        layout_updates["title"]["text"] = ""
+    return layout_updates
+
+
+def apply_theme(
+    fig: go.Figure,
+    theme: str = "light",
+    config: dict | None = None,
+) -> go.Figure:
+    """Apply sample app theme and chart config to a figure. See docs/08-UI-ACCESSIBILITY.md."""
+    return fig.update_layout(**_theme_layout(theme, config, fig.layout.meta, fig.layout.title.text))
+
+
+@lru_cache(maxsize=8)
+def _template_json(name: str) -> dict:
+    """A registered template as a plain dict (unvalidated figures need the expanded template)."""
+    return pio.templates[name].to_plotly_json()
 
 
+def _merge(target: dict, updates: dict) -> dict:
+    """Recursively merge updates into target (update_layout semantics for nested dicts)."""
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+
+def _fast_figure(traces: list[dict], layout: dict, theme: str = "light", config: dict | None = None) -> go.Figure:
+    """FIGURE_BUILD="fast": themed figure from px-equivalent traces/layout in one unvalidated construction.
+
+    layout carries the builder's own updates (title, axis titles, meta); apply_theme's updates
+    are merged in here, so the figure matches the px builder followed by apply_theme.
+    """
+    updates = _theme_layout(theme, config, layout.get("meta"), layout.get("title", {}).get("text"))
+    updates["template"] = _template_json(updates["template"])
+    return go.Figure(data=traces, layout=_merge(layout, updates), _validate=False)
+
+
+def _use_fast(df: pd.DataFrame, color: str | None = None, numeric: tuple[str, ...] = ()) -> bool:
+    return FIGURE_BUILD == "fast" and fast_traces.supports(df, color=color, numeric=numeric)
+
+
+def _axis_titles(x_title: str, y_title: str) -> dict:
+    return {"xaxis": {"title": {"text": x_title}}, "yaxis": {"title": {"text": y_title}}}
+
+
+def heatmap_colorscale(theme: str = "light") -> list[list]:
+    """Two-stop heatmap colorscale from chart paper to primary."""
+    palette = get_palette(theme)
+    return [[0.0, palette["chart_paper"]], [1.0, palette["primary"]]]
+
+
+def clientside_theme_export() -> dict:
+    """Theme values assets/clientside_theme.js needs to mirror apply_theme, generated from utils/theme.py."""
+    export = {"pie_textinfo": PIE_TEXTINFO}
+    for theme in THEMES:
+        palette = get_palette(theme)
+        export[theme] = {
+            "template_name": TEMPLATES[theme],
+            # With FIGURE_TEMPLATE=reference the browser already has the templates (window.dashboardTemplates)
+            "template": None if FIGURE_TEMPLATE == "reference" else pio.templates[TEMPLATES[theme]].to_plotly_json(),
+            "paper_bgcolor": palette["chart_paper"],
+            "plot_bgcolor": palette["chart_plot"],
+            "font_color": palette["text_primary"],
+            "colorway": get_colorway(theme),
+            "heatmap_colorscale": heatmap_colorscale(theme),
+        }
+    return export
+
+
+def _template_for(fig: go.Figure, trace_types: Sequence[str] | None = None) -> dict:
+    """The figure's template, with trace defaults limited to the trace types it uses (or trace_types)."""
+    template = fig.layout.template
+    types = set(trace_types) if trace_types else {trace.type for trace in fig.data}
+    data = {name: value for name, value in template.data.to_plotly_json().items() if name in types}
+    return {"layout": template.layout.to_plotly_json(), "data": data}
+
+
+def figure_patch(
+    fig: go.Figure,
+    theme_changed: bool = True,
+    config_changed: bool = True,
+    trace_types: Sequence[str] | None = None,
+) -> Patch:
+    """Dash Patch that moves a rendered graph to fig's theme and/or config without resending data.
+
+    fig is the figure the builders produce for the new theme/config (usually a FIGURE_CACHE hit);
+    only the properties apply_theme and the config toggles control are copied into the patch.
+    trace_types are the rendered graph's trace types when fig's differ (e.g. fig built on no
+    rows, so scatter where the graph has scattergl).
+    """
+    patch = Patch()
+    layout = fig.layout
+    if theme_changed:
+        patch["layout"]["meta"]["template"] = layout.meta["template"]
+        if FIGURE_TEMPLATE != "reference":
+            patch["layout"]["template"] = _template_for(fig, trace_types)
+        patch["layout"]["paper_bgcolor"] = layout.paper_bgcolor
+        patch["layout"]["plot_bgcolor"] = layout.plot_bgcolor
+        patch["layout"]["font"]["color"] = layout.font.color
+        patch["layout"]["colorway"] = layout.colorway
+        if layout.piecolorway is not None:
+            patch["layout"]["piecolorway"] = layout.piecolorway
+        if layout.coloraxis.colorscale is not None:
+            patch["layout"]["coloraxis"]["colorscale"] = layout.coloraxis.colorscale
+        for i, trace in enumerate(fig.data):
+            color = getattr(getattr(trace, "marker", None), "color", None)
+            if isinstance(color, str):
+                patch["data"][i]["marker"]["color"] = color
+    if config_changed:
+        patch["layout"]["showlegend"] = layout.showlegend
+        patch["layout"]["xaxis"]["showgrid"] = layout.xaxis.showgrid
+        patch["layout"]["yaxis"]["showgrid"] = layout.yaxis.showgrid
+        patch["layout"]["title"]["text"] = layout.title.text
+        for i, trace in enumerate(fig.data):
+            if trace.type == "bar":
+                patch["data"][i]["texttemplate"] = trace.texttemplate
+            elif trace.type == "pie":
+                patch["data"][i]["textinfo"] = trace.textinfo
+    return patch
+
+
+@cached_figure
 def bar_chart(
     df: pd.DataFrame,
     x: str,
@@ -56,8 +330,14 @@ def bar_chart(
     """Bar chart for category comparisons. Id pattern: {page}-bar-{suffix}."""
     cfg = config or {}
     show_data_labels = cfg.get("show_data_labels", True)
+    if _use_fast(df, color, numeric=(y,)):
+        traces, layout = fast_traces.bar(df, x, y, color=color, text_auto=show_data_labels)
+        _merge(layout, {"meta": {"bar_labels": True}, "title": {"text": title}})
+        _merge(layout, _axis_titles(x.replace("_", " ").title(), y.replace("_", " ").title()))
+        return _fast_figure(traces, layout, theme, config)
     fig = px.bar(df, x=x, y=y, color=color, text_auto=show_data_labels)
     fig.update_layout(
+        meta={"bar_labels": True},
         title=title,
         xaxis_title=x.replace("_", " ").title(),
         yaxis_title=y.replace("_", " ").title(),
@@ -65,6 +345,17 @@ def bar_chart(
     return apply_theme(fig, theme, config)
 
 
+def _record_points(fig: go.Figure, original: int, rendered: int) -> None:
+    """Note input and plotted point counts in layout.meta (read by benchmarks and debugging)."""
+    fig.update_layout(meta={**(fig.layout.meta or {}), "points": {"original": original, "rendered": rendered}})
+
+
+def _points_meta(original: int, rendered: int) -> dict:
+    """_record_points for a fast-path layout dict."""
+    return {"meta": {"points": {"original": original, "rendered": rendered}}}
+
+
+@cached_figure
 def line_chart(
     df: pd.DataFrame,
     x: str,
@@ -72,20 +363,50 @@ def line_chart(
     title: str,
     theme: str = "light",
     config: dict | None = None,
+    max_points: int | None = CHART_POINT_BUDGET,
 ) -> go.Figure:
-    """Line chart for time series. Id pattern: {page}-line-{suffix}."""
+    """Line chart for time series. Id pattern: {page}-line-{suffix}.
+
+    Above max_points (summed over series) rows are LTTB-downsampled; None disables the budget.
+    """
     if isinstance(y, str):
         y = [y]
-    fig = px.line(df, x=x, y=y, markers=True)
+    plot_df = downsample_series(df, x, y, max_points) if max_points else df
+    if _use_fast(plot_df):
+        traces, layout = fast_traces.line(plot_df, x, y, markers=True)
+        _merge(layout, {"title": {"text": title}, "legend": {"title": {"text": ""}}})
+        _merge(layout, _axis_titles(x.replace("_", " ").title(), "Value"))
+        _merge(layout, _points_meta(len(df) * len(y), len(plot_df) * len(y)))
+        return _fast_figure(traces, layout, theme, config)
+    fig = px.line(plot_df, x=x, y=y, markers=True)
     fig.update_layout(
         title=title,
         xaxis_title=x.replace("_", " ").title(),
         yaxis_title="Value",
         legend_title="",
     )
+    _record_points(fig, len(df) * len(y), len(plot_df) * len(y))
     return apply_theme(fig, theme, config)
 
 
+def line_extend(rows: pd.DataFrame, x: str, y: str | list[str], max_points: int | None = None) -> tuple | None:
+    """dcc.Graph extendData appending rows to a line_chart(df, x, y) figure: one list per y
+    column, for traces 0..len(y)-1 in line_chart's order, each trimmed to its last max_points
+    points in the browser. None when there are no rows (send no_update).
+
+    The figure being extended should be built with max_points=None, so its traces hold raw points.
+    """
+    if isinstance(y, str):
+        y = [y]
+    if rows.empty:
+        return None
+    x_values = rows[x].tolist()
+    update = {"x": [x_values] * len(y), "y": [rows[column].tolist() for column in y]}
+    indices = list(range(len(y)))
+    return (update, indices, max_points) if max_points else (update, indices)
+
+
+@cached_figure
 def scatter_chart(
     df: pd.DataFrame,
     x: str,
@@ -94,17 +415,40 @@ def scatter_chart(
     color: str | None = None,
     theme: str = "light",
     config: dict | None = None,
+    max_points: int | None = CHART_POINT_BUDGET,
+    sample: bool = False,
 ) -> go.Figure:
-    """Scatter chart for two continuous variables. Id pattern: {page}-scatter-{suffix}."""
-    fig = px.scatter(df, x=x, y=y, color=color, size_max=12)
+    """Scatter chart for two continuous variables. Id pattern: {page}-scatter-{suffix}.
+
+    Above max_points the chart renders with WebGL (Scattergl); with sample=True it is also
+    reduced to about max_points rows, stratified by color so every group stays visible.
+    """
+    over_budget = bool(max_points) and len(df) > max_points
+    plot_df = stratified_sample(df, max_points, by=color) if over_budget and sample else df
+    if _use_fast(plot_df, color):
+        traces, layout = fast_traces.scatter(plot_df, x, y, color=color, render_mode="webgl" if over_budget else "auto")
+        _merge(layout, {"title": {"text": title}})
+        _merge(layout, _axis_titles(x.replace("_", " ").title(), y.replace("_", " ").title()))
+        _merge(layout, _points_meta(len(df), len(plot_df)))
+        return _fast_figure(traces, layout, theme, config)
+    fig = px.scatter(
+        plot_df,
+        x=x,
+        y=y,
+        color=color,
+        size_max=12,
+        render_mode="webgl" if over_budget else "auto",
+    )
     fig.update_layout(
         title=title,
         xaxis_title=x.replace("_", " ").title(),
         yaxis_title=y.replace("_", " ").title(),
     )
+    _record_points(fig, len(df), len(plot_df))
     return apply_theme(fig, theme, config)
 
 
+@cached_figure
 def pie_chart(
     df: pd.DataFrame,
     names: str,
@@ -116,17 +460,49 @@ def pie_chart(
     """Pie chart for proportions. Id pattern: {page}-pie-{suffix}."""
     cfg = config or {}
     show_data_labels = cfg.get("show_data_labels", True)
+    if _use_fast(df, numeric=(values,)):
+        traces, layout = fast_traces.pie(df, names, values, colorway=get_colorway(theme))
+        traces[0]["textinfo"] = PIE_TEXTINFO if show_data_labels else "none"
+        _merge(layout, {"title": {"text": title}})
+        return _fast_figure(traces, layout, theme, config)
     fig = px.pie(
         df,
         names=names,
         values=values,
         color_discrete_sequence=get_colorway(theme),
     )
-    fig.update_traces(textinfo="label+percent" if show_data_labels else "none")
+    fig.update_traces(textinfo=PIE_TEXTINFO if show_data_labels else "none")
     fig.update_layout(title=title)
     return apply_theme(fig, theme, config)
 
 
+def _box_traces(stats: pd.DataFrame, x: str, color: str | None, theme: str) -> list[dict]:
+    """One box trace per color group from precomputed statistics; outliers ride along as samples."""
+    colorway = get_colorway(theme)
+    groups = stats.groupby(color, sort=False, observed=True) if color else [("", stats)]
+    return [
+        dict(
+            type="box",
+            x=part[x].to_numpy(),
+            q1=part["q1"].to_numpy(),
+            median=part["median"].to_numpy(),
+            q3=part["q3"].to_numpy(),
+            lowerfence=part["lowerfence"].to_numpy(),
+            upperfence=part["upperfence"].to_numpy(),
+            mean=part["mean"].to_numpy(),
+            y=part["outliers"].tolist(),
+            boxpoints="outliers",
+            name=str(name),
+            legendgroup=str(name),
+            offsetgroup=str(name),
+            marker=dict(color=colorway[i % len(colorway)]),
+            showlegend=color is not None,
+        )
+        for i, (name, part) in enumerate(groups)
+    ]
+
+
+@cached_figure
 def box_chart(
     df: pd.DataFrame,
     x: str,
@@ -135,9 +511,42 @@ def box_chart(
     color: str | None = None,
     theme: str = "light",
     config: dict | None = None,
+    precomputed: bool = True,
+    stats: pd.DataFrame | None = None,
+    max_outliers: int = 50,
 ) -> go.Figure:
-    """Box plot for distribution by category. Id pattern: {page}-box-{suffix}."""
-    fig = px.box(df, x=x, y=y, color=color, color_discrete_sequence=get_colorway(theme))
+    """Box plot for distribution by category. Id pattern: {page}-box-{suffix}.
+
+    precomputed=True sends per-group q1/median/q3/fences and at most max_outliers outliers
+    (data/aggregate.box_stats, or a stats frame with the same columns) instead of raw samples.
+    """
+    raw = not precomputed and stats is None
+    if FIGURE_BUILD == "fast" and (not raw or fast_traces.supports(df, color=color, numeric=(y,))):
+        if raw:
+            traces, layout = fast_traces.box(df, x, y, color, colorway=get_colorway(theme))
+        else:
+            if stats is None:
+                stats = box_stats(df, x, y, color=color, max_outliers=max_outliers)
+            traces = _box_traces(stats, x, color, theme)
+            layout = {
+                "boxmode": "overlay" if color in (None, x) else "group",
+                "legend": {"title": {"text": color or ""}},
+                **_points_meta(len(df), int(stats["outliers"].str.len().sum())),
+            }
+        _merge(layout, {"title": {"text": title}})
+        _merge(layout, _axis_titles(x.replace("_", " ").title(), y.replace("_", " ").title()))
+        return _fast_figure(traces, layout, theme, config)
+    if raw:
+        fig = px.box(df, x=x, y=y, color=color, color_discrete_sequence=get_colorway(theme))
+    else:
+        if stats is None:
+            stats = box_stats(df, x, y, color=color, max_outliers=max_outliers)
+        fig = go.Figure(_box_traces(stats, x, color, theme))
+        fig.update_layout(
+            boxmode="overlay" if color in (None, x) else "group",
+            legend_title_text=color or "",
+            meta={"points": {"original": len(df), "rendered": int(stats["outliers"].str.len().sum())}},
+        )
     fig.update_layout(
         title=title,
         xaxis_title=x.replace("_", " ").title(),
@@ -146,6 +555,7 @@ def box_chart(
     return apply_theme(fig, theme, config)
 
 
+@cached_figure
 def strip_chart(
     df: pd.DataFrame,
     x: str,
@@ -154,17 +564,31 @@ def strip_chart(
     color: str | None = None,
     theme: str = "light",
     config: dict | None = None,
+    max_points_per_group: int | None = 1000,
 ) -> go.Figure:
-    """Strip plot: individual points by category. Id pattern: {page}-strip-{suffix}."""
-    fig = px.strip(df, x=x, y=y, color=color, stripmode="overlay", color_discrete_sequence=get_colorway(theme))
+    """Strip plot: individual points by category. Id pattern: {page}-strip-{suffix}.
+
+    Each x/color group is capped at max_points_per_group points by uniform (reservoir) sampling.
+    """
+    keys = [x] if color in (None, x) else [x, color]
+    plot_df = capped_sample(df, keys, max_points_per_group) if max_points_per_group else df
+    if _use_fast(plot_df, color, numeric=(y,)):
+        traces, layout = fast_traces.strip(plot_df, x, y, color, colorway=get_colorway(theme))
+        _merge(layout, {"title": {"text": title}})
+        _merge(layout, _axis_titles(x.replace("_", " ").title(), y.replace("_", " ").title()))
+        _merge(layout, _points_meta(len(df), len(plot_df)))
+        return _fast_figure(traces, layout, theme, config)
+    fig = px.strip(plot_df, x=x, y=y, color=color, stripmode="overlay", color_discrete_sequence=get_colorway(theme))
     fig.update_layout(
         title=title,
         xaxis_title=x.replace("_", " ").title(),
         yaxis_title=y.replace("_", " ").title(),
     )
+    _record_points(fig, len(df), len(plot_df))
     return apply_theme(fig, theme, config)
 
 
+@cached_figure
 def histogram_chart(
     df: pd.DataFrame,
     x: str,
@@ -173,9 +597,55 @@ def histogram_chart(
     nbins: int | None = None,
     theme: str = "light",
     config: dict | None = None,
+    prebinned: bool = True,
+    clip_quantiles: tuple[float, float] | None = None,
 ) -> go.Figure:
-    """Histogram for single-variable distribution. Id pattern: {page}-hist-{suffix}."""
-    fig = px.histogram(df, x=x, color=color, nbins=nbins, color_discrete_sequence=get_colorway(theme))
+    """Histogram for single-variable distribution. Id pattern: {page}-hist-{suffix}.
+
+    prebinned=True bins on the server (data/aggregate.histogram_bins) and draws one bar per
+    bin, so the payload is O(bins) instead of O(rows). clip_quantiles applies to that mode. df may
+    also be bins already counted at the source (bin_left, bin_right, count; see graph_data).
+    """
+    # A frame binned at the source has no x column to check
+    numeric = (x,) if x in df.columns else ()
+    if FIGURE_BUILD == "fast" and fast_traces.supports(df, color=color, numeric=numeric):
+        if not prebinned:
+            traces, layout = fast_traces.histogram(df, x, color, nbins, colorway=get_colorway(theme))
+        else:
+            bins = histogram_bins(df, x, nbins=nbins, color=color, clip_quantiles=clip_quantiles)
+            traces, layout = fast_traces.bar(
+                bins,
+                "bin_center",
+                "count",
+                color=color,
+                custom_data=["bin_left", "bin_right"],
+                colorway=get_colorway(theme),
+            )
+            width = float(bins["bin_right"].iloc[0] - bins["bin_left"].iloc[0]) if len(bins) else None
+            for trace in traces:
+                trace["width"] = width
+                trace["hovertemplate"] = HISTOGRAM_HOVERTEMPLATE
+            layout.update(bargap=0, meta={"bins": {"rows": bins.attrs.get("rows", len(df)), "clipped": bins.attrs.get("clipped", 0)}})
+        _merge(layout, {"title": {"text": title}})
+        _merge(layout, _axis_titles(x.replace("_", " ").title(), "Count"))
+        return _fast_figure(traces, layout, theme, config)
+    if not prebinned:
+        fig = px.histogram(df, x=x, color=color, nbins=nbins, color_discrete_sequence=get_colorway(theme))
+    else:
+        bins = histogram_bins(df, x, nbins=nbins, color=color, clip_quantiles=clip_quantiles)
+        fig = px.bar(
+            bins,
+            x="bin_center",
+            y="count",
+            color=color,
+            custom_data=["bin_left", "bin_right"],
+            color_discrete_sequence=get_colorway(theme),
+        )
+        fig.update_traces(
+            width=float(bins["bin_right"].iloc[0] - bins["bin_left"].iloc[0]) if len(bins) else None,
+            hovertemplate=HISTOGRAM_HOVERTEMPLATE,
+        )
+        fig.update_layout(bargap=0, meta={"bins": {"rows": bins.attrs.get("rows", len(df)), "clipped": bins.attrs.get("clipped", 0)}})
     fig.update_layout(
         title=title,
         xaxis_title=x.replace("_", " ").title(),
@@ -184,6 +654,7 @@ def histogram_chart(
     return apply_theme(fig, theme, config)
 
 
+@cached_figure
 def heatmap_chart(
     df: pd.DataFrame,
     x: str,
@@ -192,17 +663,41 @@ def heatmap_chart(
     title: str,
     theme: str = "light",
     config: dict | None = None,
+    aggfunc: str = "sum",
+    top_k_rows: int | None = None,
+    top_k_cols: int | None = None,
+    max_cells: int | None = HEATMAP_MAX_CELLS,
 ) -> go.Figure:
-    """Heatmap for matrix / 2D density. Id pattern: {page}-heatmap-{suffix}."""
-    palette = get_palette(theme)
-    pivot = df.pivot_table(values=z, index=y, columns=x, aggfunc="sum")
+    """Heatmap for matrix / 2D density. Id pattern: {page}-heatmap-{suffix}.
+
+    The matrix comes from data/aggregate.pivot_matrix (cached per dataset version); top_k_* and
+    max_cells bound its size for high-cardinality axes.
+    """
+    pivot = pivot_matrix(
+        df,
+        x,
+        y,
+        z,
+        aggfunc=aggfunc,
+        top_k_rows=top_k_rows,
+        top_k_cols=top_k_cols,
+        max_cells=max_cells,
+    )
+    if FIGURE_BUILD == "fast":
+        traces, layout = fast_traces.imshow(
+            pivot,
+            x.replace("_", " ").title(),
+            y.replace("_", " ").title(),
+            z,
+            colorscale=heatmap_colorscale(theme),
+        )
+        _merge(layout, {"title": {"text": title}})
+        return _fast_figure(traces, layout, theme, config)
     fig = px.imshow(
         pivot,
         labels=dict(x=x.replace("_", " ").title(), y=y.replace("_", " ").title(), color=z),
-        color_continuous_scale=[palette["chart_paper"], palette["primary"]],
+        color_continuous_scale=heatmap_colorscale(theme),
         aspect="auto",
     )
     fig.update_layout(title=title)
     return apply_theme(fig, theme, config)
-
-
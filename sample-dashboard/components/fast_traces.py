@@ -0,0 +1,292 @@
+"""
+plotly.express-equivalent trace and layout dicts for the chart builders' fast path
+(FIGURE_BUILD=fast). Traces are assembled from NumPy column arrays, one per color group in
+first-appearance order, with the keys and values px would produce for the same call, so the
+builders can construct the figure once without validation. Only the argument combinations the
+builders use are covered; supports() tells a builder when to fall back to plotly.express.
+See docs/04-PLOTLY-GUIDE.md §4.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+# Above this many rows px renders line/scatter traces with WebGL (render_mode="auto")
+PX_WEBGL_THRESHOLD = 1000
+
+_FULL_DOMAIN = [0.0, 1.0]
+
+
+@lru_cache(maxsize=8)
+def _template_colorway(template_name: str) -> tuple[str, ...]:
+    return tuple(pio.templates[template_name].layout.colorway or ())
+
+
+def default_colorway() -> list[str]:
+    """Discrete colors px uses when no color_discrete_sequence is given (the default template's colorway)."""
+    return list(_template_colorway(pio.templates.default))
+
+
+def _is_continuous(series: pd.Series) -> bool:
+    return series.dtype.kind in "iufc"
+
+
+def supports(df: pd.DataFrame, color: str | None = None, numeric: tuple[str, ...] = ()) -> bool:
+    """True when the fast path reproduces px for this call: a discrete color column without
+    missing values, and numeric value columns (px would otherwise pick another orientation)."""
+    if color is not None and (_is_continuous(df[color]) or df[color].isna().any()):
+        return False
+    return all(_is_continuous(df[column]) for column in numeric)
+
+
+def _groups(df: pd.DataFrame, color: str | None) -> list[tuple[object, np.ndarray | None]]:
+    """(color value, row positions) per group in first-appearance order; one all-rows group without color."""
+    if color is None:
+        return [(None, None)]
+    codes, uniques = pd.factorize(df[color], sort=False)
+    order = np.argsort(codes, kind="stable")
+    splits = np.split(order, np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1])
+    return list(zip(uniques, splits))
+
+
+def _column(df: pd.DataFrame, column: str, rows: np.ndarray | None) -> np.ndarray:
+    values = df[column].to_numpy()
+    return values if rows is None else values[rows]
+
+
+def _hovertemplate(parts: list[str]) -> str:
+    return "<br>".join(parts) + "<extra></extra>"
+
+
+def _group_fields(color: str | None, value, i: int, colorway: list[str], x: str | None = None) -> tuple[dict, str, list[str]]:
+    """name/legendgroup/showlegend of one color group, its color and its hover prefix."""
+    name = "" if color is None else str(value)
+    prefix = [] if color is None or color == x else [f"{color}={value}"]
+    fields = {"legendgroup": name, "name": name, "showlegend": color is not None}
+    return fields, colorway[i % len(colorway)], prefix
+
+
+def _cartesian_layout(df: pd.DataFrame, x: str, y_title: str, color: str | None, x_title: str | None = None) -> dict:
+    """Axes and legend px lays out for a single-panel cartesian chart."""
+    xaxis = {"anchor": "y", "domain": list(_FULL_DOMAIN), "title": {"text": x_title or x}}
+    if color is not None and color == x:
+        xaxis["categoryorder"] = "array"
+        xaxis["categoryarray"] = [str(value) for value in pd.unique(df[x])]
+    legend = {"tracegroupgap": 0}
+    if color is not None:
+        legend = {"title": {"text": color}, "tracegroupgap": 0}
+    return {
+        "xaxis": xaxis,
+        "yaxis": {"anchor": "x", "domain": list(_FULL_DOMAIN), "title": {"text": y_title}},
+        "legend": legend,
+        "margin": {"t": 60},
+    }
+
+
+def bar(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    color: str | None = None,
+    text_auto: bool = False,
+    custom_data: list[str] | None = None,
+    colorway: list[str] | None = None,
+) -> tuple[list[dict], dict]:
+    """px.bar(df, x, y, color, text_auto, custom_data, color_discrete_sequence) with a numeric y."""
+    colorway = colorway or default_colorway()
+    traces = []
+    for i, (value, rows) in enumerate(_groups(df, color)):
+        fields, trace_color, prefix = _group_fields(color, value, i, colorway, x)
+        hover = prefix + [f"{x}=%{{x}}", f"{y}=%{{y}}"]
+        trace = {}
+        if custom_data:
+            trace["customdata"] = np.column_stack([_column(df, column, rows) for column in custom_data])
+            hover += [f"{column}=%{{customdata[{j}]}}" for j, column in enumerate(custom_data)]
+        trace.update(
+            hovertemplate=_hovertemplate(hover),
+            marker={"color": trace_color, "pattern": {"shape": ""}},
+            orientation="v",
+            textposition="auto",
+            **fields,
+        )
+        if text_auto:
+            trace["texttemplate"] = "%{y}"
+        trace.update(x=_column(df, x, rows), xaxis="x", y=_column(df, y, rows), yaxis="y", type="bar")
+        traces.append(trace)
+    layout = _cartesian_layout(df, x, y, color)
+    layout["barmode"] = "relative"
+    return traces, layout
+
+
+def line(df: pd.DataFrame, x: str, y: list[str], markers: bool = True) -> tuple[list[dict], dict]:
+    """Wide-form px.line(df, x, y=[...], markers): one trace per y column, legend titled "variable"."""
+    colorway = default_colorway()
+    webgl = len(df) * len(y) > PX_WEBGL_THRESHOLD
+    x_values = df[x].to_numpy()
+    traces = []
+    for i, column in enumerate(y):
+        trace = {
+            "hovertemplate": _hovertemplate([f"variable={column}", f"{x}=%{{x}}", "value=%{y}"]),
+            "legendgroup": column,
+            "line": {"color": colorway[i % len(colorway)], "dash": "solid"},
+            "marker": {"symbol": "circle"},
+            "mode": "lines+markers" if markers else "lines",
+            "name": column,
+            "orientation": "v",
+            "showlegend": True,
+            "x": x_values,
+            "xaxis": "x",
+            "y": df[column].to_numpy(),
+            "yaxis": "y",
+            "type": "scattergl" if webgl else "scatter",
+        }
+        if webgl:
+            del trace["orientation"]
+        traces.append(trace)
+    layout = _cartesian_layout(df, x, "value", "variable")
+    layout["xaxis"].pop("categoryorder", None)
+    return traces, layout
+
+
+def scatter(df: pd.DataFrame, x: str, y: str, color: str | None = None, render_mode: str = "auto") -> tuple[list[dict], dict]:
+    """px.scatter(df, x, y, color, render_mode)."""
+    colorway = default_colorway()
+    webgl = render_mode == "webgl" or (render_mode == "auto" and len(df) > PX_WEBGL_THRESHOLD)
+    traces = []
+    for i, (value, rows) in enumerate(_groups(df, color)):
+        fields, trace_color, prefix = _group_fields(color, value, i, colorway, x)
+        trace = {
+            "hovertemplate": _hovertemplate(prefix + [f"{x}=%{{x}}", f"{y}=%{{y}}"]),
+            **fields,
+            "marker": {"color": trace_color, "symbol": "circle"},
+            "mode": "markers",
+            "orientation": "v",
+            "x": _column(df, x, rows),
+            "xaxis": "x",
+            "y": _column(df, y, rows),
+            "yaxis": "y",
+            "type": "scattergl" if webgl else "scatter",
+        }
+        if webgl:
+            del trace["orientation"]
+        traces.append(trace)
+    return traces, _cartesian_layout(df, x, y, color)
+
+
+def pie(df: pd.DataFrame, names: str, values: str, colorway: list[str]) -> tuple[list[dict], dict]:
+    """px.pie(df, names, values, color_discrete_sequence=colorway)."""
+    trace = {
+        "domain": {"x": list(_FULL_DOMAIN), "y": list(_FULL_DOMAIN)},
+        "hovertemplate": _hovertemplate([f"{names}=%{{label}}", f"{values}=%{{value}}"]),
+        "labels": df[names].to_numpy(),
+        "legendgroup": "",
+        "name": "",
+        "showlegend": True,
+        "values": df[values].to_numpy(),
+        "type": "pie",
+    }
+    return [trace], {"legend": {"tracegroupgap": 0}, "margin": {"t": 60}, "piecolorway": list(colorway)}
+
+
+def _box_like(df: pd.DataFrame, x: str, y: str, color: str | None, colorway: list[str], extra: dict) -> list[dict]:
+    """Box traces per color group as px.box / px.strip build them; extra holds the per-function keys."""
+    traces = []
+    for i, (value, rows) in enumerate(_groups(df, color)):
+        fields, trace_color, prefix = _group_fields(color, value, i, colorway, x)
+        traces.append(
+            {
+                "alignmentgroup": "True",
+                "hovertemplate": _hovertemplate(prefix + [f"{x}=%{{x}}", f"{y}=%{{y}}"]),
+                **fields,
+                "marker": {"color": trace_color},
+                "offsetgroup": fields["name"],
+                "orientation": "v",
+                "x": _column(df, x, rows),
+                "x0": " ",
+                "xaxis": "x",
+                "y": _column(df, y, rows),
+                "y0": " ",
+                "yaxis": "y",
+                "type": "box",
+                **extra,
+            }
+        )
+    return traces
+
+
+def box(df: pd.DataFrame, x: str, y: str, color: str | None, colorway: list[str]) -> tuple[list[dict], dict]:
+    """px.box(df, x, y, color, color_discrete_sequence=colorway) on raw samples."""
+    traces = _box_like(df, x, y, color, colorway, {"notched": False})
+    layout = _cartesian_layout(df, x, y, color)
+    layout["boxmode"] = "group"
+    return traces, layout
+
+
+def strip(df: pd.DataFrame, x: str, y: str, color: str | None, colorway: list[str]) -> tuple[list[dict], dict]:
+    """px.strip(df, x, y, color, stripmode="overlay", color_discrete_sequence=colorway)."""
+    traces = _box_like(
+        df,
+        x,
+        y,
+        color,
+        colorway,
+        {
+            "boxpoints": "all",
+            "fillcolor": "rgba(255,255,255,0)",
+            "hoveron": "points",
+            "line": {"color": "rgba(255,255,255,0)"},
+            "pointpos": 0,
+        },
+    )
+    layout = _cartesian_layout(df, x, y, color)
+    layout["boxmode"] = "overlay"
+    return traces, layout
+
+
+def histogram(df: pd.DataFrame, x: str, color: str | None, nbins: int | None, colorway: list[str]) -> tuple[list[dict], dict]:
+    """px.histogram(df, x, color, nbins, color_discrete_sequence=colorway) on raw samples."""
+    traces = []
+    for i, (value, rows) in enumerate(_groups(df, color)):
+        fields, trace_color, prefix = _group_fields(color, value, i, colorway, x)
+        trace = {
+            "bingroup": "x",
+            "hovertemplate": _hovertemplate(prefix + [f"{x}=%{{x}}", "count=%{y}"]),
+            **fields,
+            "marker": {"color": trace_color, "pattern": {"shape": ""}},
+            "orientation": "v",
+            "x": _column(df, x, rows),
+            "xaxis": "x",
+            "yaxis": "y",
+            "type": "histogram",
+        }
+        if nbins:
+            trace["nbinsx"] = nbins
+        traces.append(trace)
+    layout = _cartesian_layout(df, x, "count", color)
+    layout["barmode"] = "relative"
+    return traces, layout
+
+
+def imshow(matrix: pd.DataFrame, x_label: str, y_label: str, z_label: str, colorscale: list) -> tuple[list[dict], dict]:
+    """px.imshow(matrix, labels=dict(x=..., y=..., color=...), color_continuous_scale, aspect="auto")."""
+    trace = {
+        "coloraxis": "coloraxis",
+        "name": "0",
+        "x": np.asarray(matrix.columns),
+        "y": np.asarray(matrix.index),
+        "z": matrix.to_numpy(),
+        "type": "heatmap",
+        "xaxis": "x",
+        "yaxis": "y",
+        "hovertemplate": _hovertemplate([f"{x_label}: %{{x}}", f"{y_label}: %{{y}}", f"{z_label}: %{{z}}"]),
+    }
+    layout = {
+        "xaxis": {"anchor": "y", "domain": list(_FULL_DOMAIN), "title": {"text": x_label}},
+        "yaxis": {"anchor": "x", "domain": list(_FULL_DOMAIN), "autorange": "reversed", "title": {"text": y_label}},
+        "coloraxis": {"colorbar": {"title": {"text": z_label}}, "colorscale": colorscale, "autocolorscale": False},
+        "margin": {"t": 60},
+    }
+    return [trace], layout
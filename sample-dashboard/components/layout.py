@@ -3,10 +3,28 @@ Layout components: navbar and page shell. See docs/07-COMPONENTS.md.
 """
 from __future__ import annotations
 
+import uuid
+
 import dash_bootstrap_components as dbc
 from dash import dcc, html
 
+from components.filters import refresh_button
 from utils.config import DEFAULT_CHART_CONFIG
+from utils.startup import lazy_import
+
+# NumPy-based; only needed once a page with graphs renders
+encoding = lazy_import("utils.encoding")
+
+# Shown by a lazy graph until its callback fills it: no axes, transparent on either theme
+EMPTY_FIGURE = {
+    "data": [],
+    "layout": {
+        "xaxis": {"visible": False},
+        "yaxis": {"visible": False},
+        "paper_bgcolor": "rgba(0,0,0,0)",
+        "plot_bgcolor": "rgba(0,0,0,0)",
+    },
+}
 
 
 def make_theme_toggle(toggle_id: str = "theme-toggle", store_id: str = "theme-store") -> list:
@@ -40,6 +58,12 @@ def make_navbar(theme_toggle_id: str = "theme-toggle", theme_store_id: str = "th
                                 dbc.NavItem(
                                     dbc.NavLink("Insights", href="/insights", active="exact", className="nav-link-custom"),
                                 ),
+                                dbc.NavItem(
+                                    dbc.NavLink("Explore", href="/explore", active="exact", className="nav-link-custom"),
+                                ),
+                                dbc.NavItem(
+                                    dbc.NavLink("Live", href="/live", active="exact", className="nav-link-custom"),
+                                ),
                                 dbc.NavItem(
                                     dbc.NavLink("Config", href="/config", active="exact", className="nav-link-custom"),
                                 ),
@@ -47,6 +71,7 @@ def make_navbar(theme_toggle_id: str = "theme-toggle", theme_store_id: str = "th
                             navbar=True,
                             className="navbar-links",
                         ),
+                        refresh_button("navbar-refresh-btn"),
                         html.Div(
                             make_theme_toggle(toggle_id=theme_toggle_id, store_id=theme_store_id),
                             className="navbar-theme-pill",
@@ -141,3 +166,50 @@ def make_config_panel() -> html.Div:
 def make_page_container(children: list) -> dbc.Container:
     """Page content container with consistent padding. Uses same gutter as navbar for alignment."""
     return dbc.Container(children, fluid=True, className="py-3 main-content-container")
+
+
+def make_graph_grid(figures: dict, graph_config: dict, columns: int = 2) -> list[dbc.Row]:
+    """Rows of dcc.Graph cells (md=6 for two columns), one per {graph id: figure} entry, in order.
+    Figures are encoded per FIGURE_ENCODING (utils/encoding.wire_figure)."""
+    cells = [
+        dbc.Col(dcc.Graph(id=graph_id, figure=encoding.wire_figure(fig), config=graph_config), md=12 // columns, className="mb-3")
+        for graph_id, fig in figures.items()
+    ]
+    return [dbc.Row(cells[i : i + columns]) for i in range(0, len(cells), columns)]
+
+
+def visible_store_id(graph_id: str) -> str:
+    """Id of the Store assets/lazy_graphs.js sets once the graph's cell scrolls into view."""
+    return f"{graph_id}-visible"
+
+
+def progress_id(graph_id: str) -> str:
+    """Id of the status line a background-built graph reports progress to (utils/jobs.py)."""
+    return f"{graph_id}-progress"
+
+
+def make_lazy_graph_grid(graph_ids, graph_config: dict, columns: int = 2, background_ids=()) -> list[dbc.Row]:
+    """Like make_graph_grid, but each cell is an empty dcc.Graph in dcc.Loading, filled by its own callback.
+
+    assets/lazy_graphs.js sets the cell's visible Store to this render's token when the cell nears
+    the viewport; the token makes a re-rendered page with reused DOM nodes get observed again.
+    Cells in background_ids get a status line for their background job's progress.
+    """
+    token = uuid.uuid4().hex
+    cells = [
+        dbc.Col(
+            html.Div(
+                [
+                    dcc.Store(id=visible_store_id(graph_id)),
+                    *([html.Div(id=progress_id(graph_id), className="small text-muted")] if graph_id in background_ids else []),
+                    dcc.Loading(dcc.Graph(id=graph_id, figure=EMPTY_FIGURE, config=graph_config), type="circle"),
+                ],
+                className="lazy-graph",
+                **{"data-visible-store": visible_store_id(graph_id), "data-render-token": token},
+            ),
+            md=12 // columns,
+            className="mb-3",
+        )
+        for graph_id in graph_ids
+    ]
+    return [dbc.Row(cells[i : i + columns]) for i in range(0, len(cells), columns)]
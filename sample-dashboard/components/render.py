@@ -0,0 +1,183 @@
+"""
+Page-render scheduler: builds the cells of a page's graph grid concurrently, so page
+latency approaches the slowest cell instead of the sum. Cells run on a bounded thread
+pool; cells marked "executor": "process" build on a process pool when
+RENDER_PROCESS_WORKERS is set. A cell that raises or exceeds its timeout is replaced by
+a placeholder figure. With PRERENDER_DIR, cells pre-rendered by `python -m prerender`
+are read from the figure store instead (utils/figure_store.py).
+See docs/05-DASH-GUIDE.md §6.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import plotly.graph_objects as go
+
+from components.charts import FIGURE_CACHE, build_graph, graph_data, placeholder_figure
+from utils.config import (
+    CELL_TIMEOUT_SEC,
+    PRERENDER_DIR,
+    RENDER_PROCESS_WORKERS,
+    RENDER_WORKERS,
+)
+from utils.figure_store import FigureStore
+from utils.metrics import phase, record_cache
+
+logger = logging.getLogger(__name__)
+
+# Shared by all page renders; bounded so concurrent requests cannot pile up builds
+RENDER_POOL = ThreadPoolExecutor(
+    max_workers=max(1, RENDER_WORKERS), thread_name_prefix="page-render"
+)
+
+# Pre-rendered figures; None builds every cell
+PRERENDERED = FigureStore(PRERENDER_DIR) if PRERENDER_DIR else None
+
+_process_pool: ProcessPoolExecutor | None = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor | None:
+    """The builder process pool (spawned on first use); None without process workers."""
+    global _process_pool
+    if RENDER_PROCESS_WORKERS <= 0:
+        return None
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=RENDER_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def _build_uncached(builder_name: str, df, **kwargs) -> go.Figure:
+    """Process-pool entry point; builders go by name (cached wrappers don't pickle)."""
+    import components.charts
+
+    return getattr(components.charts, builder_name).uncached(df, **kwargs)
+
+
+def _build_in_process(
+    spec: dict, theme: str, config: dict, pool: ProcessPoolExecutor
+) -> go.Figure:
+    """Load here, build in the pool; the figure is cached here like a local build."""
+    with phase("load"):
+        df, kwargs = graph_data(spec)
+    builder = spec["builder"]
+    kwargs = dict(theme=theme, config=config, **kwargs)
+    key = builder.cache_key(df, **kwargs)
+    fig = FIGURE_CACHE.get(key) if key is not None else None
+    record_cache("figure", hit=fig is not None)
+    if fig is None:
+        with phase("build"):
+            fig = pool.submit(_build_uncached, builder.__name__, df, **kwargs).result()
+        if key is not None:
+            FIGURE_CACHE.set(key, fig)
+    return fig
+
+
+def _build_cell(spec: dict, theme: str, config: dict) -> go.Figure:
+    pool = _get_process_pool() if spec.get("executor") == "process" else None
+    if pool is not None:
+        return _build_in_process(spec, theme, config, pool)
+    return build_graph(spec, theme, config)
+
+
+def _run_now(func, *args) -> Future:
+    """Run func in the calling thread; a completed Future with its result or error."""
+    future: Future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def _placeholder(spec: dict, message: str, theme: str, config: dict) -> go.Figure:
+    return placeholder_figure(
+        message, title=spec["kwargs"].get("title"), theme=theme, config=config
+    )
+
+
+def prerendered_figure(graph_id: str, theme: str, config: dict) -> dict | None:
+    """The cell's figure dict from the pre-rendered store, or None to build it."""
+    if PRERENDERED is None:
+        return None
+    with phase("load"):
+        figure = PRERENDERED.get(graph_id, theme, config)
+    record_cache("prerendered", hit=figure is not None)
+    return figure
+
+
+def build_page_figures(
+    graphs, theme: str = "light", config: dict | None = None
+) -> dict[str, go.Figure | dict]:
+    """Build every GRAPHS cell concurrently, keyed by graph id in grid order.
+
+    Pre-rendered cells come back as figure dicts, ready to send
+    (utils/encoding.wire_figure). Each cell has spec["timeout"] seconds (default
+    CELL_TIMEOUT_SEC) from the start of the render; a timed-out cell keeps running in
+    the background but the page gets a placeholder. With RENDER_WORKERS <= 1 cells are
+    built serially (errors still become placeholders).
+    """
+    config = config or {}
+    stored = {
+        spec["id"]: prerendered_figure(spec["id"], theme, config) for spec in graphs
+    }
+    pending = [spec for spec in graphs if stored[spec["id"]] is None]
+    if RENDER_WORKERS <= 1:
+        futures = {
+            spec["id"]: _run_now(_build_cell, spec, theme, config) for spec in pending
+        }
+    else:
+        # Tasks run in a copy of the request context so phase()/record_cache() report
+        futures = {
+            spec["id"]: RENDER_POOL.submit(
+                contextvars.copy_context().run, _build_cell, spec, theme, config
+            )
+            for spec in pending
+        }
+    started = time.monotonic()
+    figures = {}
+    for spec in graphs:
+        if stored[spec["id"]] is not None:
+            figures[spec["id"]] = stored[spec["id"]]
+            continue
+        future = futures[spec["id"]]
+        timeout = spec.get("timeout", CELL_TIMEOUT_SEC)
+        try:
+            remaining = max(0.0, started + timeout - time.monotonic())
+            figures[spec["id"]] = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            future.cancel()
+            logger.warning(
+                "Graph %s timed out after %ss; showing a placeholder",
+                spec["id"],
+                timeout,
+            )
+            figures[spec["id"]] = _placeholder(
+                spec, "Taking longer than expected. Try again shortly.", theme, config
+            )
+        except Exception:
+            logger.exception(
+                "Graph %s failed to build; showing a placeholder", spec["id"]
+            )
+            figures[spec["id"]] = _placeholder(
+                spec, "This chart could not be loaded.", theme, config
+            )
+    return figures
+
+
+def build_page_figure(
+    graphs, graph_id: str, theme: str = "light", config: dict | None = None
+) -> go.Figure | dict:
+    """One GRAPHS cell by id (a lazy graph's callback), with the same timeouts."""
+    spec = next(spec for spec in graphs if spec["id"] == graph_id)
+    return build_page_figures((spec,), theme, config)[graph_id]
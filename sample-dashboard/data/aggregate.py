@@ -0,0 +1,281 @@
+"""
+Server-side aggregations that let chart builders send O(groups/bins) instead of O(rows) to the
+browser. Results are cached per dataset version and spec. See docs/06-DATA-PATTERNS.md §3–4.
+"""
+from __future__ import annotations
+
+import math
+from typing import Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+from data.loaders import dataset_version
+from utils.cache import LRUCache
+from utils.config import AGGREGATE_CACHE_SIZE
+from utils.metrics import record_cache
+
+# Aggregates keyed by (kind, dataset version, spec). Cached frames are shared: treat as read-only.
+AGGREGATE_CACHE = LRUCache(maxsize=AGGREGATE_CACHE_SIZE)
+
+
+def cached_aggregate(kind: str, df: pd.DataFrame, spec: tuple, compute: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """Return compute() for (kind, df version, spec), computing it at most once per version."""
+    version = dataset_version(df)
+    if version is None:
+        return compute()
+    key: Hashable = (kind, version, spec)
+    result = AGGREGATE_CACHE.get(key)
+    record_cache("aggregate", hit=result is not None)
+    if result is None:
+        result = compute()
+        AGGREGATE_CACHE.set(key, result)
+    return result
+
+
+def histogram_bins(
+    df: pd.DataFrame,
+    x: str,
+    nbins: int | None = None,
+    color: str | None = None,
+    clip_quantiles: tuple[float, float] | None = None,
+) -> pd.DataFrame:
+    """Equal-width bin counts for df[x], optionally split by color.
+
+    Columns: bin_left, bin_right, bin_center, count (+ color). nbins defaults to the
+    Freedman–Diaconis/Sturges choice of np.histogram_bin_edges("auto"), capped at 200.
+    clip_quantiles=(lo, hi) limits the binned range to those quantiles of x; values outside
+    are dropped (their number is in attrs["clipped"]). Empty bins are kept so bars tile the range.
+    A frame that is already binned (bin_left, bin_right, count, no x column; e.g. counted in SQL,
+    data/sql.py) is returned with bin_center added; attrs["rows"] then holds the counted rows.
+    """
+    if x not in df.columns and {"bin_left", "bin_right", "count"} <= set(df.columns):
+        result = df.copy()
+        result["bin_center"] = (result["bin_left"] + result["bin_right"]) / 2
+        result.attrs.update(clipped=0, rows=int(result["count"].sum()))
+        return result
+
+    def compute() -> pd.DataFrame:
+        values = df[x].to_numpy(dtype="float64")
+        finite = np.isfinite(values)
+        if not finite.any():
+            # Nothing to bin (filtered to no rows, or all missing): no bars, like px.histogram
+            columns = [color] if color is not None else []
+            result = pd.DataFrame(columns=[*columns, "bin_left", "bin_right", "count", "bin_center"])
+            result = result.astype({"bin_left": "float64", "bin_right": "float64", "count": "int64", "bin_center": "float64"})
+            result.attrs["clipped"] = 0
+            return result
+        if clip_quantiles is not None:
+            lo, hi = np.quantile(values[finite], clip_quantiles)
+        else:
+            lo, hi = values[finite].min(), values[finite].max()
+        if hi <= lo:
+            hi = lo + 1.0
+        if nbins:
+            edges = np.linspace(lo, hi, nbins + 1)
+        else:
+            edges = np.histogram_bin_edges(values[finite], bins="auto", range=(lo, hi))
+            if len(edges) > 201:
+                edges = np.linspace(lo, hi, 201)
+        n_bins = len(edges) - 1
+        in_range = finite & (values >= lo) & (values <= hi)
+        # Right edge is inclusive for the last bin, as in np.histogram
+        bin_idx = np.clip(np.searchsorted(edges, values[in_range], side="right") - 1, 0, n_bins - 1)
+        if color is None:
+            counts = np.bincount(bin_idx, minlength=n_bins)
+            result = pd.DataFrame({"bin_left": edges[:-1], "bin_right": edges[1:], "count": counts})
+        else:
+            codes, groups = pd.factorize(df[color], use_na_sentinel=False)
+            counts = np.bincount(codes[in_range] * n_bins + bin_idx, minlength=len(groups) * n_bins)
+            result = pd.DataFrame(
+                {
+                    color: np.repeat(groups, n_bins),
+                    "bin_left": np.tile(edges[:-1], len(groups)),
+                    "bin_right": np.tile(edges[1:], len(groups)),
+                    "count": counts,
+                }
+            )
+        result["bin_center"] = (result["bin_left"] + result["bin_right"]) / 2
+        result.attrs["clipped"] = int(finite.sum() - in_range.sum())
+        return result
+
+    clip_spec = tuple(clip_quantiles) if clip_quantiles is not None else None
+    return cached_aggregate("histogram_bins", df, (x, nbins, color, clip_spec), compute)
+
+
+def _group_codes(df: pd.DataFrame, keys: list[str]) -> tuple[np.ndarray, pd.DataFrame]:
+    """Dense group code per row plus one row of key values per group (in first-seen order)."""
+    grouped = df.groupby(keys, sort=False, observed=True, dropna=False)
+    codes = grouped.ngroup().to_numpy()
+    groups = grouped.size().reset_index()[keys]
+    return codes, groups
+
+
+def box_stats(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    color: str | None = None,
+    max_outliers: int = 50,
+) -> pd.DataFrame:
+    """Tukey box statistics of df[y] per x (and color) group, computed in one sort pass.
+
+    One row per group with the key columns and q1, median, q3, lowerfence, upperfence (last
+    sample inside 1.5×IQR), mean, n and outliers (a list of at most max_outliers values, evenly
+    spread over the sorted outliers and including both extremes). Quartiles use plotly.js's
+    default "linear" quartilemethod, so the boxes match the ones it draws from raw samples.
+    Groups without any non-NaN y value are left out (an empty frame when there are none).
+    """
+
+    def compute() -> pd.DataFrame:
+        keys = [x] if color in (None, x) else [x, color]
+        values = df[y].to_numpy(dtype="float64")
+        valid = ~np.isnan(values)
+        codes, groups = _group_codes(df[valid], keys)
+        values = values[valid]
+        if groups.empty:
+            columns = ["q1", "median", "q3", "lowerfence", "upperfence", "mean", "n", "outliers"]
+            return groups.reindex(columns=[*keys, *columns]).astype({"n": "int64", "outliers": object})
+        order = np.lexsort((values, codes))
+        sorted_vals, sorted_codes = values[order], codes[order]
+        counts = np.bincount(sorted_codes, minlength=len(groups))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        def quantile(q: float) -> np.ndarray:
+            # plotly.js Lib.interp: position q*n - 0.5 in the sorted group, clamped to its ends
+            pos = starts + np.clip(q * counts - 0.5, 0, counts - 1)
+            lo = np.floor(pos).astype(np.int64)
+            hi = np.ceil(pos).astype(np.int64)
+            return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+        q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+        iqr = q3 - q1
+        lower, upper = (q1 - 1.5 * iqr)[sorted_codes], (q3 + 1.5 * iqr)[sorted_codes]
+        inside = (sorted_vals >= lower) & (sorted_vals <= upper)
+        inside_idx = np.flatnonzero(inside)
+        first_in = np.unique(sorted_codes[inside_idx], return_index=True)[1]
+        last_in = len(inside_idx) - 1 - np.unique(sorted_codes[inside_idx][::-1], return_index=True)[1]
+
+        out_idx = np.flatnonzero(~inside)
+        out_codes = sorted_codes[out_idx]
+        out_counts = np.bincount(out_codes, minlength=len(groups))
+        out_rank = np.arange(len(out_idx)) - np.concatenate(([0], np.cumsum(out_counts)[:-1]))[out_codes]
+        n_out = out_counts[out_codes]
+        # The minimum plus the last value of each of (max_outliers - 1) equal slots (ends at the maximum)
+        slots = max(1, max_outliers - 1)
+        keep = (n_out <= max_outliers) | (out_rank == 0) | (
+            (out_rank * slots) // n_out != ((out_rank + 1) * slots) // n_out
+        )
+        kept_codes = out_codes[keep]
+        kept_vals = sorted_vals[out_idx[keep]]
+        splits = np.cumsum(np.bincount(kept_codes, minlength=len(groups)))[:-1]
+
+        stats = groups.copy()
+        stats["q1"], stats["median"], stats["q3"] = q1, median, q3
+        stats["lowerfence"] = sorted_vals[inside_idx[first_in]]
+        stats["upperfence"] = sorted_vals[inside_idx[last_in]]
+        stats["mean"] = np.bincount(sorted_codes, weights=sorted_vals, minlength=len(groups)) / counts
+        stats["n"] = counts
+        stats["outliers"] = [part.tolist() for part in np.split(kept_vals, splits)]
+        return stats
+
+    return cached_aggregate("box_stats", df, (x, y, color, max_outliers), compute)
+
+
+def axis_codes(values: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    """Sorted category codes for a pivot axis, observed values only (categoricals keep their order)."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.cat.remove_unused_categories()
+        return values.cat.codes.to_numpy(), pd.Index(values.cat.categories)
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes, pd.Index(uniques)
+
+
+def _truncate_axis(
+    codes: np.ndarray, labels: pd.Index, weights: np.ndarray, top_k: int | None, other_label: str
+) -> tuple[np.ndarray, pd.Index]:
+    """Keep the top_k categories by total weight; fold the rest into one other_label category."""
+    if not top_k or len(labels) <= top_k:
+        return codes, labels
+    totals = np.bincount(codes, weights=weights, minlength=len(labels))
+    keep = np.sort(np.argsort(-totals, kind="stable")[:top_k])
+    remap = np.full(len(labels), top_k, dtype=np.int64)
+    remap[keep] = np.arange(top_k)
+    return remap[codes], labels[keep].append(pd.Index([other_label]))
+
+
+def _coarsen_axis(codes: np.ndarray, labels: pd.Index, factor: int) -> tuple[np.ndarray, pd.Index]:
+    """Merge runs of `factor` adjacent categories into one, labelled "first–last"."""
+    if factor <= 1:
+        return codes, labels
+    names = [str(label) for label in labels]
+    merged = []
+    for start in range(0, len(names), factor):
+        chunk = names[start : start + factor]
+        merged.append(chunk[0] if len(chunk) == 1 else f"{chunk[0]}–{chunk[-1]}")
+    return codes // factor, pd.Index(merged)
+
+
+def pivot_matrix(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    z: str,
+    aggfunc: str = "sum",
+    top_k_rows: int | None = None,
+    top_k_cols: int | None = None,
+    max_cells: int | None = None,
+    other_label: str = "Other",
+) -> pd.DataFrame:
+    """y × x matrix of aggfunc(z) ("sum", "mean", "count" or "max"); like pivot_table, empty cells are NaN.
+
+    Built from category codes with a NumPy scatter-add (bincount / maximum.at) instead of a
+    pandas groupby. top_k_rows/top_k_cols keep the largest categories by total z (count for
+    "count") and fold the rest into other_label. If the matrix still has more than max_cells
+    cells, adjacent categories are merged (coarsened) along the longer axis until it fits.
+    """
+    if aggfunc not in ("sum", "mean", "count", "max"):
+        raise ValueError(f"Unsupported aggfunc: {aggfunc!r}")
+
+    def compute() -> pd.DataFrame:
+        values = df[z].to_numpy(dtype="float64")
+        valid = ~np.isnan(values) & df[x].notna().to_numpy() & df[y].notna().to_numpy()
+        values = values[valid]
+        x_codes, x_labels = axis_codes(df[x][valid])
+        y_codes, y_labels = axis_codes(df[y][valid])
+        weights = np.ones_like(values) if aggfunc == "count" else values
+        y_codes, y_labels = _truncate_axis(y_codes, y_labels, weights, top_k_rows, other_label)
+        x_codes, x_labels = _truncate_axis(x_codes, x_labels, weights, top_k_cols, other_label)
+        y_factor = x_factor = 1
+        while max_cells:
+            n_rows, n_cols = math.ceil(len(y_labels) / y_factor), math.ceil(len(x_labels) / x_factor)
+            if n_rows * n_cols <= max_cells or n_rows == n_cols == 1:
+                break
+            if n_rows >= n_cols:
+                y_factor += 1
+            else:
+                x_factor += 1
+        y_codes, y_labels = _coarsen_axis(y_codes, y_labels, y_factor)
+        x_codes, x_labels = _coarsen_axis(x_codes, x_labels, x_factor)
+
+        n_rows, n_cols = len(y_labels), len(x_labels)
+        flat = y_codes.astype(np.int64) * n_cols + x_codes
+        counts = np.bincount(flat, minlength=n_rows * n_cols)
+        if aggfunc == "max":
+            cells = np.full(n_rows * n_cols, -np.inf)
+            np.maximum.at(cells, flat, values)
+        elif aggfunc == "count":
+            cells = counts.astype("float64")
+        else:
+            cells = np.bincount(flat, weights=values, minlength=n_rows * n_cols)
+            if aggfunc == "mean":
+                cells = cells / np.where(counts, counts, 1)
+        cells = np.where(counts > 0, cells, np.nan)
+        return pd.DataFrame(
+            cells.reshape(n_rows, n_cols),
+            index=y_labels.rename(y),
+            columns=x_labels.rename(x),
+        )
+
+    spec = (x, y, z, aggfunc, top_k_rows, top_k_cols, max_cells, other_label)
+    return cached_aggregate("pivot_matrix", df, spec, compute)
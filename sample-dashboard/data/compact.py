@@ -0,0 +1,125 @@
+"""
+Memory-compact loader frames: every @dataset_source result (data/sources.py) is normalized once per
+load, before it is cached, so the copies kept by the loader cache, the aggregates and the filter
+cubes are all built from the small representation. See docs/06-DATA-PATTERNS.md §3.
+
+  - String columns with few distinct values (region, month, segment) become categoricals: one
+    small integer code per row plus one copy of each value.
+  - Other string columns become Arrow-backed strings (one contiguous buffer instead of a Python
+    object per row) when pyarrow is installed.
+  - Integer columns are downcast to the smallest type holding their range; float columns to
+    float32 only when every value survives the round trip, so plotted values never change.
+
+memory_reports() holds the before/after bytes per column of each loader's last load.
+"""
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from utils.config import LOADER_CATEGORY_MAX_RATIO
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # optional dependency; without it high-cardinality strings stay as they are
+    pyarrow = None
+
+# Columns with fewer rows than this are left as they are (categorical overhead outweighs savings)
+_MIN_CATEGORY_ROWS = 8
+
+# Loader name -> memory report of its last load; see memory_reports
+_REPORTS: dict[str, dict] = {}
+
+
+def _arrow_string_dtype() -> pd.StringDtype | None:
+    """Arrow-backed strings with NaN for missing values (the object dtype's semantics), or None."""
+    if pyarrow is None:
+        return None
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:  # pandas < 2.3
+        return pd.StringDtype("pyarrow_numpy")
+
+
+def _is_text(column: pd.Series) -> bool:
+    if isinstance(column.dtype, pd.StringDtype):
+        return True
+    return column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) == "string"
+
+
+def _compact_text(column: pd.Series, max_ratio: float) -> pd.Series:
+    if len(column) >= _MIN_CATEGORY_ROWS and column.nunique(dropna=True) <= max_ratio * len(column):
+        return column.astype("category")
+    dtype = _arrow_string_dtype()
+    if dtype is None or column.dtype == dtype:
+        return column
+    return column.astype(dtype)
+
+
+def _compact_float(column: pd.Series) -> pd.Series:
+    values = column.to_numpy()
+    narrow = values.astype(np.float32)
+    if np.array_equal(narrow.astype(values.dtype), values, equal_nan=True):
+        return pd.Series(narrow, index=column.index, name=column.name)
+    return column
+
+
+def compact_column(column: pd.Series, max_ratio: float = LOADER_CATEGORY_MAX_RATIO) -> pd.Series:
+    """column in the smallest dtype that keeps every value (module docstring)."""
+    dtype = column.dtype
+    if _is_text(column):
+        return _compact_text(column, max_ratio)
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu" and dtype.itemsize > 1:
+        return pd.to_numeric(column, downcast="integer" if dtype.kind == "i" else "unsigned")
+    if isinstance(dtype, np.dtype) and dtype.kind == "f" and dtype.itemsize > 4:
+        return _compact_float(column)
+    return column
+
+
+def _bytes(df: pd.DataFrame) -> dict[str, int]:
+    return {str(name): int(size) for name, size in df.memory_usage(deep=True, index=False).items()}
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> dict:
+    """Rows, total bytes and per-column dtype and bytes of a frame before and after compact_frame."""
+    sizes_before, sizes_after = _bytes(before), _bytes(after)
+    columns = {
+        str(name): {
+            "dtype_before": str(before[name].dtype),
+            "dtype_after": str(after[name].dtype),
+            "bytes_before": sizes_before[str(name)],
+            "bytes_after": sizes_after[str(name)],
+        }
+        for name in after.columns
+    }
+    return {
+        "rows": len(after),
+        "bytes_before": sum(sizes_before.values()),
+        "bytes_after": sum(sizes_after.values()),
+        "columns": columns,
+    }
+
+
+def compact_frame(df: pd.DataFrame, max_ratio: float = LOADER_CATEGORY_MAX_RATIO, name: str | None = None) -> pd.DataFrame:
+    """df with every column compacted (compact_column); df itself is not modified.
+
+    With name (a loader name), the before/after memory report is kept for memory_reports().
+    """
+    if df.columns.has_duplicates:
+        return df
+    compacted = pd.DataFrame({column: compact_column(df[column], max_ratio) for column in df.columns}, index=df.index)
+    compacted.attrs = dict(df.attrs)
+    if name is not None:
+        report = memory_report(df, compacted)
+        _REPORTS[name] = report
+        logger.debug("%s: %d -> %d bytes in %d rows", name, report["bytes_before"], report["bytes_after"], report["rows"])
+    return compacted
+
+
+def memory_reports() -> dict[str, dict]:
+    """memory_report of each loader's last load, by loader name."""
+    return dict(_REPORTS)
@@ -0,0 +1,106 @@
+"""
+Aggregate cubes for filter callbacks: a dataset is grouped once per loaded version over declared
+dimensions (e.g. region × month × segment) into dense NumPy arrays of summed measures and row
+counts. A filter change then slices the cube by dimension positions and sums over the remaining
+axes, so it costs O(selected cells) instead of re-filtering and re-grouping O(rows). Dropdown
+options come from the cube's dimension indexes. See docs/06-DATA-PATTERNS.md §3.
+"""
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from data.aggregate import axis_codes, cached_aggregate
+from data.loaders import load_sales_detail
+
+# Filter value meaning "no filter on this dimension" (the dropdowns' "All ..." option)
+ALL = "__all__"
+
+# Declared cubes: name -> loader, dimensions and summed measures. Loaders read only these columns.
+CUBES = {
+    "sales": {
+        "loader": load_sales_detail,
+        "dims": ("region", "month", "segment"),
+        "measures": ("revenue", "units"),
+    },
+}
+
+
+class Cube:
+    """Summed measures and row counts for every combination of dimension values.
+
+    indexes[dim] holds a dimension's values in axis order (sorted; categoricals keep their
+    category order); sums[measure] and counts have one axis per dimension. Combinations with
+    no rows have count 0 and are left out of query results. Treat instances as read-only.
+    """
+
+    def __init__(self, df: pd.DataFrame, dims: Sequence[str], measures: Sequence[str]) -> None:
+        self.dims = tuple(dims)
+        self.measures = tuple(measures)
+        codes, self.indexes = [], {}
+        for dim in self.dims:
+            dim_codes, labels = axis_codes(df[dim])
+            codes.append(dim_codes)
+            self.indexes[dim] = labels
+        shape = tuple(len(self.indexes[dim]) for dim in self.dims)
+        # Rows with a missing dimension value (code -1) are left out, as in a groupby
+        valid = np.logical_and.reduce([dim_codes >= 0 for dim_codes in codes]) if codes else np.ones(len(df), bool)
+        flat = np.ravel_multi_index([dim_codes[valid] for dim_codes in codes], shape)
+        size = int(np.prod(shape))
+        self.counts = np.bincount(flat, minlength=size).reshape(shape)
+        self.sums = {
+            measure: np.bincount(
+                flat, weights=np.nan_to_num(df[measure].to_numpy(dtype="float64")[valid]), minlength=size
+            ).reshape(shape)
+            for measure in self.measures
+        }
+
+    def options(self, dim: str, all_label: str | None = None) -> list[dict]:
+        """dcc.Dropdown options for a dimension, optionally led by an all_label option (value ALL)."""
+        options = [{"label": str(value), "value": value} for value in self.indexes[dim].tolist()]
+        if all_label is not None:
+            options.insert(0, {"label": all_label, "value": ALL})
+        return options
+
+    def _positions(self, dim: str, selected: Any) -> np.ndarray:
+        """Axis positions for a filter value, a list of values, or None / ALL (the whole axis)."""
+        index = self.indexes[dim]
+        if selected is None or (isinstance(selected, str) and selected == ALL):
+            return np.arange(len(index))
+        values = list(selected) if isinstance(selected, (list, tuple, set)) else [selected]
+        positions = index.get_indexer(values)
+        return np.sort(positions[positions >= 0])
+
+    def query(self, filters: dict[str, Any] | None = None, group_by: Sequence[str] = ()) -> pd.DataFrame:
+        """Measures summed over the rows matching filters, per group_by combination.
+
+        filters maps dimensions to a value or list of values (None / ALL or a missing key = no
+        filter). Columns: group_by dimensions (in that order), the measures, and count (rows).
+        """
+        filters = filters or {}
+        group_by = tuple(group_by)
+        selection = np.ix_(*[self._positions(dim, filters.get(dim)) for dim in self.dims])
+        other_axes = tuple(i for i, dim in enumerate(self.dims) if dim not in group_by)
+        # Remaining axes follow self.dims; reorder them to group_by
+        kept = [dim for dim in self.dims if dim in group_by]
+        order = [kept.index(dim) for dim in group_by]
+
+        def reduce(values: np.ndarray) -> np.ndarray:
+            return values[selection].sum(axis=other_axes).transpose(order).ravel()
+
+        counts = reduce(self.counts)
+        present = counts > 0
+        labels = [self.indexes[dim].to_numpy()[self._positions(dim, filters.get(dim))] for dim in group_by]
+        columns = {dim: grid.ravel()[present] for dim, grid in zip(group_by, np.meshgrid(*labels, indexing="ij"))}
+        columns.update({measure: reduce(self.sums[measure])[present] for measure in self.measures})
+        columns["count"] = counts[present]
+        return pd.DataFrame(columns)
+
+
+def get_cube(name: str) -> Cube:
+    """The named CUBES cube for the loader's current data, built at most once per loaded version."""
+    spec = CUBES[name]
+    df = spec["loader"](columns=spec["dims"] + spec["measures"])
+    return cached_aggregate("cube", df, (spec["dims"], spec["measures"]), lambda: Cube(df, spec["dims"], spec["measures"]))
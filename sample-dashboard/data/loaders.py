@@ -1,16 +1,87 @@
 """
 Sample data loaders for the dashboard. Uses in-memory data for the sample; in production
-replace with API/DB/file load per docs/06-DATA-PATTERNS.md.
+replace with API/DB/file load per docs/06-DATA-PATTERNS.md, or point a loader at a
+Parquet/Arrow dataset (data/sources.py) and it reads only the requested columns and rows.
 """
 from __future__ import annotations
 
+import itertools
 import random
-from functools import lru_cache
+import time
+import weakref
+from functools import wraps
+from typing import Callable
 
+import numpy as np
 import pandas as pd
 
+from data.compact import memory_reports
+from data.sources import dataset_source
+from utils.cache import TTLCache, ttl_cache
+from utils.config import LOADER_CACHE_DIR, LOADER_STALE_TTL_SEC, LOADER_TTL_SEC
+from utils.shared_cache import ArrowFileCache
 
-@lru_cache(maxsize=None)
+# Cross-worker Arrow file cache under the per-process TTL cache; None keeps loads in-process
+SHARED_CACHE = ArrowFileCache(LOADER_CACHE_DIR, ttl=LOADER_TTL_SEC) if LOADER_CACHE_DIR else None
+
+# id(df) -> (weakref to df, version token); filled by @versioned loaders
+_DATASET_VERSIONS: dict[int, tuple[weakref.ref, str]] = {}
+_VERSION_SEQ = itertools.count(1)
+
+
+def _forget_version(key: int, ref: weakref.ref) -> None:
+    entry = _DATASET_VERSIONS.get(key)
+    if entry is not None and entry[0] is ref:
+        del _DATASET_VERSIONS[key]
+
+
+def stamp_version(df: pd.DataFrame, token: str) -> None:
+    """Give df the version token dataset_version reports for it, as @versioned does for loader
+    results (e.g. for frames loaded outside a loader); use a new token whenever the data changes."""
+    key = id(df)
+    ref = weakref.ref(df, lambda r, key=key: _forget_version(key, r))
+    _DATASET_VERSIONS[key] = (ref, token)
+
+
+def versioned(loader: Callable[..., pd.DataFrame]) -> Callable[..., pd.DataFrame]:
+    """Stamp each DataFrame a loader produces with a version token (see dataset_version).
+
+    With SHARED_CACHE the load goes through the Arrow file cache and the token is the file's
+    version stamp, so it is the same in every worker; otherwise each real load gets a new token.
+    """
+
+    @wraps(loader)
+    def wrapper(*args, **kwargs) -> pd.DataFrame:
+        if SHARED_CACHE is not None:
+            df, token = SHARED_CACHE.load(loader.__name__, loader, args, kwargs)
+        else:
+            df, token = loader(*args, **kwargs), f"{loader.__name__}:{next(_VERSION_SEQ)}"
+        stamp_version(df, token)
+        return df
+
+    return wrapper
+
+
+def dataset_version(df: pd.DataFrame) -> str | None:
+    """Version token for a DataFrame: the loader stamp if df came from a loader, else a content hash.
+
+    Tokens change whenever a loader actually re-runs, so caches keyed on them (e.g. the figure
+    cache in components/charts.py) never serve figures built from older data. Derived frames
+    (filtered, sliced) are not stamped and fall back to hashing. Returns None if df cannot be hashed.
+    """
+    entry = _DATASET_VERSIONS.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    try:
+        digest = int(pd.util.hash_pandas_object(df, index=True).sum())
+    except TypeError:
+        return None
+    return f"hash:{tuple(df.columns)}:{len(df)}:{digest}"
+
+
+@ttl_cache(ttl=LOADER_TTL_SEC, stale_ttl=LOADER_STALE_TTL_SEC)
+@versioned
+@dataset_source
 def load_sales_by_region() -> pd.DataFrame:
     """Load sample sales-by-region data. In production, load from API/file/DB."""
     return pd.DataFrame({
@@ -20,7 +91,9 @@ def load_sales_by_region() -> pd.DataFrame:
     })
 
 
-@lru_cache(maxsize=None)
+@ttl_cache(ttl=LOADER_TTL_SEC, stale_ttl=LOADER_STALE_TTL_SEC)
+@versioned
+@dataset_source
 def load_timeseries() -> pd.DataFrame:
     """Load sample time series data for line chart. month is pre-formatted as YYYY-MM string."""
     dates = pd.date_range("2024-01-01", periods=12, freq="MS").strftime("%Y-%m")
@@ -31,7 +104,9 @@ def load_timeseries() -> pd.DataFrame:
     })
 
 
-@lru_cache(maxsize=None)
+@ttl_cache(ttl=LOADER_TTL_SEC, stale_ttl=LOADER_STALE_TTL_SEC)
+@versioned
+@dataset_source
 def load_scatter_data() -> pd.DataFrame:
     """Sample data for scatter (e.g. units vs revenue by segment)."""
     return pd.DataFrame({
@@ -41,7 +116,9 @@ def load_scatter_data() -> pd.DataFrame:
     })
 
 
-@lru_cache(maxsize=None)
+@ttl_cache(ttl=LOADER_TTL_SEC, stale_ttl=LOADER_STALE_TTL_SEC)
+@versioned
+@dataset_source
 def load_pie_data() -> pd.DataFrame:
     """Sample data for pie (e.g. share by category)."""
     return pd.DataFrame({
@@ -50,18 +127,23 @@ def load_pie_data() -> pd.DataFrame:
     })
 
 
-@lru_cache(maxsize=None)
+@ttl_cache(ttl=LOADER_TTL_SEC, stale_ttl=LOADER_STALE_TTL_SEC)
+@versioned
+@dataset_source
 def load_box_data() -> pd.DataFrame:
     """Sample data for box/violin (e.g. score distribution by team)."""
     random.seed(42)
     teams = ["Alpha", "Beta", "Gamma", "Delta"]
-    data = []
-    for i, t in enumerate(teams):
-        data.extend([{"team": t, "score": random.gauss(70 + i * 5, 12)} for _ in range(25)])
-    return pd.DataFrame(data)
+    per_team = 25
+    return pd.DataFrame({
+        "team": np.repeat(teams, per_team),
+        "score": [random.gauss(70 + i * 5, 12) for i in range(len(teams)) for _ in range(per_team)],
+    })
 
 
-@lru_cache(maxsize=None)
+@ttl_cache(ttl=LOADER_TTL_SEC, stale_ttl=LOADER_STALE_TTL_SEC)
+@versioned
+@dataset_source
 def load_histogram_data() -> pd.DataFrame:
     """Sample data for histogram (e.g. response times)."""
     random.seed(43)
@@ -70,7 +152,9 @@ def load_histogram_data() -> pd.DataFrame:
     })
 
 
-@lru_cache(maxsize=None)
+@ttl_cache(ttl=LOADER_TTL_SEC, stale_ttl=LOADER_STALE_TTL_SEC)
+@versioned
+@dataset_source
 def load_heatmap_data() -> pd.DataFrame:
     """Sample data for heatmap (e.g. value by row and column)."""
     return pd.DataFrame({
@@ -78,3 +162,66 @@ def load_heatmap_data() -> pd.DataFrame:
         "region": ["North", "South", "East", "North", "South", "East", "North", "South", "East", "North", "South", "East"],
         "revenue": [80, 65, 90, 95, 70, 88, 102, 78, 95, 110, 85, 100],
     })
+
+
+@ttl_cache(ttl=LOADER_TTL_SEC, stale_ttl=LOADER_STALE_TTL_SEC)
+@versioned
+@dataset_source
+def load_sales_detail() -> pd.DataFrame:
+    """Sample order-level sales (region, month, segment, revenue, units) for the filtered Explore page."""
+    random.seed(44)
+    regions = ["North", "South", "East", "West", "Central"]
+    months = pd.date_range("2024-01-01", periods=12, freq="MS").strftime("%Y-%m")
+    segments = ["A", "B", "C"]
+    rows = []
+    for (r, region), month, (s, segment) in itertools.product(enumerate(regions), months, enumerate(segments)):
+        for _ in range(random.randint(20, 40)):
+            units = random.randint(1, 12)
+            rows.append((region, month, segment, round(units * random.uniform(8, 12) * (1 + 0.1 * r + 0.2 * s), 2), units))
+    return pd.DataFrame(rows, columns=["region", "month", "segment", "revenue", "units"])
+
+
+# Interval between rows of load_live_metrics, in seconds
+LIVE_STEP_SEC = 10
+
+
+@dataset_source
+def load_live_metrics() -> pd.DataFrame:
+    """Sample live ops metrics: one row per LIVE_STEP_SEC over the last 24 hours, up to now.
+
+    Read incrementally with data/streaming.load_since (filters on "time", a sortable
+    "YYYY-MM-DD HH:MM:SS" string), so it has no TTL cache: every call asks for different rows.
+    """
+    now = int(time.time()) // LIVE_STEP_SEC * LIVE_STEP_SEC
+    seconds = np.arange(now - 86_400 + LIVE_STEP_SEC, now + 1, LIVE_STEP_SEC)
+    # Deterministic in the timestamp, so every worker and every reload sees the same values
+    noise = (seconds * 2_654_435_761 % 1_000) / 1_000
+    requests = 400 + 250 * np.sin(2 * np.pi * (seconds % 86_400) / 86_400) + 60 * noise
+    return pd.DataFrame({
+        "time": pd.to_datetime(seconds, unit="s").strftime("%Y-%m-%d %H:%M:%S"),
+        "requests": requests.round(1),
+        "errors": (requests * (0.01 + 0.02 * noise)).round(1),
+    })
+
+
+def _loader_caches() -> dict[str, TTLCache]:
+    return {name: obj for name, obj in globals().items() if name.startswith("load_") and isinstance(obj, TTLCache)}
+
+
+def invalidate_loaders(*names: str) -> None:
+    """Drop cached results for the named loaders (all loaders if none given), e.g. on refresh_button clicks."""
+    for name, cache in _loader_caches().items():
+        if not names or name in names:
+            if SHARED_CACHE is not None:
+                SHARED_CACHE.clear(name)
+            cache.invalidate_all()
+
+
+def loader_cache_stats() -> dict[str, dict]:
+    """Per-loader, per-key hit/stale-hit/miss/refresh counters and last refresh latency."""
+    return {name: cache.stats() for name, cache in _loader_caches().items()}
+
+
+def loader_memory_report() -> dict[str, dict]:
+    """Per-loader rows and bytes before/after compaction, per column, of the last load (data/compact.py)."""
+    return memory_reports()
@@ -0,0 +1,233 @@
+"""
+Remote (HTTP/JSON) dataset sources on asyncio: requests from every callback thread share one
+event loop running in a background thread, with a pool of keep-alive connections, a concurrency
+limit and a timeout per source (origin). Sync code calls run_sync / gather_sync, so loaders stay
+plain functions and a page whose cells load at the same time (components/render.py) waits for the
+slowest request instead of the sum. See docs/06-DATA-PATTERNS.md §1 (API) and §2.
+
+Loaders decorated with @dataset_source (data/sources.py) read from REMOTE_DATA_URL/<name without
+load_> (or a URL given to register_remote) when one is set. The endpoint returns JSON records
+([{column: value}, ...]) or pandas "split" JSON ({"columns": [...], "data": [[...], ...]}); the
+requested columns and filters are sent as query parameters, and applied again locally.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import ssl
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Sequence
+from urllib.parse import urlencode, urlsplit
+
+import pandas as pd
+
+from utils.config import REMOTE_DATA_URL, REMOTE_MAX_CONCURRENCY, REMOTE_TIMEOUT_SEC
+
+logger = logging.getLogger(__name__)
+
+# Loader name -> endpoint URL; see register_remote / remote_url
+REMOTE_URLS: dict[str, str] = {}
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class RemoteSourceError(RuntimeError):
+    """A remote source answered with an error status or a malformed response."""
+
+
+class HttpSource:
+    """Keep-alive HTTP/1.1 GET client for one origin (scheme, host, port), used on the shared loop.
+
+    At most max_concurrency requests are in flight at once; the others queue. Idle connections
+    (up to max_concurrency) are kept for reuse. Each request, including waiting for a
+    connection to answer, is limited to timeout seconds; a timed-out connection is closed.
+    """
+
+    def __init__(self, origin: str, max_concurrency: int = REMOTE_MAX_CONCURRENCY, timeout: float = REMOTE_TIMEOUT_SEC) -> None:
+        parts = urlsplit(origin)
+        if parts.scheme not in _DEFAULT_PORTS:
+            raise ValueError(f"Unsupported URL scheme: {origin!r}")
+        self.scheme, self.host = parts.scheme, parts.hostname or "localhost"
+        self.port = parts.port or _DEFAULT_PORTS[parts.scheme]
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.requests = 0
+        self.connections_opened = 0
+
+    def _drop_idle(self) -> None:
+        while self._idle:
+            self._idle.pop()[1].close()
+
+    async def _connect(self, fresh: bool = False) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        while self._idle and not fresh:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        self.connections_opened += 1
+        ssl_context = ssl.create_default_context() if self.scheme == "https" else None
+        return await asyncio.open_connection(self.host, self.port, ssl=ssl_context)
+
+    def _release(self, connection: tuple[asyncio.StreamReader, asyncio.StreamWriter]) -> None:
+        if len(self._idle) < self.max_concurrency:
+            self._idle.append(connection)
+        else:
+            connection[1].close()
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: dict[str, str]) -> tuple[bytes, bool]:
+        """Response body, and whether the connection can be reused afterwards."""
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return b"".join(chunks), True
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+        if "content-length" in headers:
+            return await reader.readexactly(int(headers["content-length"])), True
+        return await reader.read(), False
+
+    async def _request(self, target: str, fresh: bool = False) -> bytes:
+        connection = await self._connect(fresh)
+        reader, writer = connection
+        reusable = False
+        try:
+            host = self.host if self.port == _DEFAULT_PORTS[self.scheme] else f"{self.host}:{self.port}"
+            writer.write(
+                f"GET {target} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\nConnection: keep-alive\r\n\r\n".encode()
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionResetError("connection closed before the response")
+            status = int(status_line.split()[1])
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body, reusable = await self._read_body(reader, headers)
+            reusable = reusable and headers.get("connection", "").lower() != "close"
+            if status >= 400:
+                raise RemoteSourceError(f"GET {self.scheme}://{host}{target} returned {status}")
+            return body
+        finally:
+            if reusable:
+                self._release(connection)
+            else:
+                writer.close()
+
+    async def get(self, target: str) -> bytes:
+        """Body of GET target (path and query); retried once on a fresh connection if a pooled
+        keep-alive connection turns out to have been closed by the server. The other idle
+        connections are dropped then too, as they are likely just as stale."""
+        async with self._semaphore:
+            self.requests += 1
+            idle_before = len(self._idle)
+            try:
+                return await asyncio.wait_for(self._request(target), self.timeout)
+            except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                if not idle_before:
+                    raise
+                self._drop_idle()
+                return await asyncio.wait_for(self._request(target, fresh=True), self.timeout)
+
+    async def get_json(self, target: str) -> Any:
+        body = await self.get(target)
+        try:
+            return json.loads(body)
+        except ValueError as exc:
+            raise RemoteSourceError(f"{target}: response is not JSON") from exc
+
+    def stats(self) -> dict:
+        """Requests sent and connections opened (fewer connections than requests = keep-alive reuse)."""
+        return {"requests": self.requests, "connections_opened": self.connections_opened, "idle": len(self._idle)}
+
+
+# Background event loop shared by all sources, started on first use
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+_sources: dict[str, HttpSource] = {}
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="remote-sources", daemon=True).start()
+        return _loop
+
+
+def run_sync(awaitable: Awaitable, timeout: float | None = None) -> Any:
+    """Run a coroutine on the shared loop and wait for its result from sync code (a callback thread)."""
+    loop = _get_loop()
+    if threading.current_thread().name == "remote-sources":
+        raise RuntimeError("run_sync called from the remote-sources event loop; await the coroutine instead")
+    future: Future = asyncio.run_coroutine_threadsafe(awaitable, loop)
+    return future.result(timeout)
+
+
+def gather_sync(awaitables: dict[str, Awaitable], return_exceptions: bool = False) -> dict[str, Any]:
+    """Run several coroutines concurrently on the shared loop; results keyed like awaitables.
+
+    With return_exceptions, a failed or timed-out entry holds its exception instead of raising.
+    """
+
+    async def gather() -> list:
+        return await asyncio.gather(*awaitables.values(), return_exceptions=return_exceptions)
+
+    return dict(zip(awaitables, run_sync(gather())))
+
+
+def source_for(url: str) -> HttpSource:
+    """The shared HttpSource for a URL's origin (created with the REMOTE_* limits on first use)."""
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    with _loop_lock:
+        if origin not in _sources:
+            _sources[origin] = HttpSource(origin)
+        return _sources[origin]
+
+
+def source_stats() -> dict[str, dict]:
+    """HttpSource.stats() per origin."""
+    return {origin: source.stats() for origin, source in _sources.items()}
+
+
+def register_remote(loader_name: str, url: str) -> None:
+    """Point a loader (e.g. "load_sales_by_region") at a JSON endpoint."""
+    REMOTE_URLS[loader_name] = url
+
+
+def remote_url(loader_name: str) -> str | None:
+    """Registered URL for a loader, else REMOTE_DATA_URL/<name without load_>, else None."""
+    if loader_name in REMOTE_URLS:
+        return REMOTE_URLS[loader_name]
+    if not REMOTE_DATA_URL:
+        return None
+    return f"{REMOTE_DATA_URL.rstrip('/')}/{loader_name.removeprefix('load_')}"
+
+
+def _frame(payload: Any) -> pd.DataFrame:
+    if isinstance(payload, dict) and "columns" in payload and "data" in payload:
+        return pd.DataFrame(payload["data"], columns=payload["columns"])
+    if isinstance(payload, list):
+        return pd.DataFrame.from_records(payload)
+    raise RemoteSourceError("expected JSON records or {'columns', 'data'}")
+
+
+async def fetch_frame(url: str, columns: Sequence[str] | None = None, filters: Sequence | None = None) -> pd.DataFrame:
+    """DataFrame from a JSON endpoint; columns and filters go along as query parameters."""
+    parts = urlsplit(url)
+    params = [("columns", ",".join(columns or ())), ("filters", json.dumps(filters, default=str) if filters else "")]
+    params = [(key, value) for key, value in params if value]
+    query = "&".join(part for part in (parts.query, urlencode(params)) if part)
+    target = (parts.path or "/") + (f"?{query}" if query else "")
+    return _frame(await source_for(url).get_json(target))
@@ -0,0 +1,106 @@
+"""
+Point reduction for large series before plotting. See docs/04-PLOTLY-GUIDE.md §4 and
+docs/06-DATA-PATTERNS.md §3 (transform before plot).
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def _as_numeric_axis(values: pd.Series) -> np.ndarray:
+    """Float positions for an x column: datetimes as ns, numbers as-is, anything else by row order."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype="datetime64[ns]").astype("int64").astype("float64")
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype="float64")
+    return np.arange(len(values), dtype="float64")
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Row positions kept by Largest-Triangle-Three-Buckets, vectorized over all buckets.
+
+    First and last points are always kept. Each middle bucket keeps the point forming the
+    largest triangle with the previous and next bucket averages (the anchor-average variant,
+    which needs no per-bucket Python loop). x must be sorted; y must not contain NaN.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    n_buckets = n_out - 2
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    counts = np.bincount(bucket, minlength=n_buckets)
+    mid_x, mid_y = x[1 : n - 1], y[1 : n - 1]
+    avg_x = np.bincount(bucket, weights=mid_x, minlength=n_buckets) / counts
+    avg_y = np.bincount(bucket, weights=mid_y, minlength=n_buckets) / counts
+    # Anchors: previous bucket average (first point for bucket 0), next average (last point at the end)
+    prev_x = np.concatenate(([x[0]], avg_x[:-1]))[bucket]
+    prev_y = np.concatenate(([y[0]], avg_y[:-1]))[bucket]
+    next_x = np.concatenate((avg_x[1:], [x[-1]]))[bucket]
+    next_y = np.concatenate((avg_y[1:], [y[-1]]))[bucket]
+    area = np.abs((prev_x - next_x) * (mid_y - prev_y) - (prev_x - mid_x) * (next_y - prev_y))
+    best = np.maximum.reduceat(area, edges[:-1] - 1)
+    candidates = np.flatnonzero(area == best[bucket])
+    _, first = np.unique(bucket[candidates], return_index=True)
+    return np.concatenate(([0], candidates[first] + 1, [n - 1]))
+
+
+def downsample_series(df: pd.DataFrame, x: str, y: list[str], max_points: int) -> pd.DataFrame:
+    """Rows of df kept by LTTB, max_points // len(y) picks per series.
+
+    Wide-form charts plot every kept row once per series, so df is returned unchanged when
+    len(df) * len(y) fits in max_points. Otherwise the union of the series' LTTB picks is
+    returned in original order, so the series keep a shared x.
+    """
+    n_series = max(1, len(y))
+    per_series = max(3, max_points // n_series)
+    if len(df) <= per_series:
+        return df
+    x_pos = _as_numeric_axis(df[x])
+    keep = []
+    for column in y:
+        values = df[column].to_numpy(dtype="float64")
+        valid = np.flatnonzero(~np.isnan(values))
+        keep.append(valid[lttb_indices(x_pos[valid], values[valid], per_series)])
+    return df.iloc[np.unique(np.concatenate(keep))]
+
+
+def stratified_sample(df: pd.DataFrame, n: int, by: str | None = None, seed: int = 0) -> pd.DataFrame:
+    """Random sample of about n rows, drawn per `by` group in proportion to group size.
+
+    Every group keeps at least one row, so small segments stay visible. Original row order
+    is preserved. Deterministic for a given seed.
+    """
+    if len(df) <= n:
+        return df
+    rng = np.random.default_rng(seed)
+    if by is None:
+        return df.iloc[np.sort(rng.choice(len(df), size=n, replace=False))]
+    codes, _ = pd.factorize(df[by], use_na_sentinel=False)
+    sizes = np.bincount(codes)
+    quota = np.minimum(sizes, np.maximum(1, np.round(n * sizes / len(df)).astype(np.int64)))
+    order = np.lexsort((rng.random(len(df)), codes))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = np.arange(len(df)) - starts[codes[order]]
+    return df.iloc[np.sort(order[rank < quota[codes[order]]])]
+
+
+def capped_sample(df: pd.DataFrame, by: list[str], cap: int, seed: int = 0) -> pd.DataFrame:
+    """At most cap rows per `by` group, each a uniform random sample of its group.
+
+    Vectorized reservoir sampling: every row gets a random priority and each group keeps its
+    cap lowest priorities, which is the same distribution as a per-group reservoir of size cap.
+    Original row order is preserved.
+    """
+    grouped = df.groupby(by, sort=False, observed=True, dropna=False)
+    if grouped.size().max() <= cap:
+        return df
+    codes = grouped.ngroup().to_numpy()
+    rng = np.random.default_rng(seed)
+    # code + priority in [0, 1) sorts by group, then by priority within the group
+    order = np.argsort(codes + rng.random(len(df)), kind="stable")
+    sizes = np.bincount(codes)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = np.arange(len(df)) - starts[codes[order]]
+    return df.iloc[np.sort(order[rank < cap])]
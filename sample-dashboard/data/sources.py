@@ -0,0 +1,142 @@
+"""
+Columnar dataset sources for loaders: Parquet / Arrow IPC (Feather) files or directories read
+with column projection and row-filter pushdown (pyarrow.dataset), so only the plotted columns
+and matching row groups are read. See docs/06-DATA-PATTERNS.md §1 (File) and §3.
+
+Loaders decorated with @dataset_source read from the registered path when there is one, else
+from a SQL table (data/sql.py) or a remote JSON endpoint (data/remote.py) when one is configured,
+and otherwise fall back to their own body (in-memory sample data), with the same projection/filter
+semantics applied in pandas. An aggregate= spec runs in the database for SQL tables and in pandas
+(data/sql.aggregate_frame) for every other source. Row-level results are compacted (data/compact.py)
+when LOADER_COMPACT is set.
+"""
+from __future__ import annotations
+
+import operator
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import pandas as pd
+
+from data.compact import compact_frame
+from data.remote import fetch_frame, remote_url, run_sync
+from data.sql import aggregate_columns, aggregate_frame, read_sql, sql_table
+from utils.config import DATASET_DIR, LOADER_COMPACT
+
+try:
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency; only needed when a dataset path is registered
+    ds = pq = None
+
+# Row filter: (column, op, value) triples ANDed together, op one of
+# "==", "!=", "<", "<=", ">", ">=", "in", "not in" (pyarrow / pandas.read_parquet style)
+Filters = Sequence[tuple[str, str, Any]]
+
+_SUFFIX_FORMATS = {".parquet": "parquet", ".pq": "parquet", ".arrow": "ipc", ".feather": "ipc", ".ipc": "ipc"}
+
+_OPS = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Loader name -> dataset path (file or directory); see register_dataset / dataset_path
+DATASET_PATHS: dict[str, Path] = {}
+
+
+def register_dataset(loader_name: str, path: str | Path) -> None:
+    """Point a loader (e.g. "load_sales_by_region") at a Parquet/Arrow file or directory."""
+    DATASET_PATHS[loader_name] = Path(path)
+
+
+def dataset_path(loader_name: str) -> Path | None:
+    """Registered path for a loader, else DATASET_DIR/<name without load_>{.parquet,.arrow,.feather,/}."""
+    if loader_name in DATASET_PATHS:
+        return DATASET_PATHS[loader_name]
+    if not DATASET_DIR:
+        return None
+    stem = Path(DATASET_DIR) / loader_name.removeprefix("load_")
+    for candidate in (stem.with_suffix(".parquet"), stem.with_suffix(".arrow"), stem.with_suffix(".feather"), stem):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _format_for(path: Path) -> str:
+    if path.is_dir():
+        first = next((p for p in sorted(path.rglob("*")) if p.suffix in _SUFFIX_FORMATS), None)
+        return _SUFFIX_FORMATS[first.suffix] if first is not None else "parquet"
+    return _SUFFIX_FORMATS.get(path.suffix, "parquet")
+
+
+def read_dataset(path: str | Path, columns: Sequence[str] | None = None, filters: Filters | None = None) -> pd.DataFrame:
+    """Read a Parquet/Arrow dataset, pushing the column projection and row filters into the scan."""
+    if ds is None:
+        raise ImportError("Reading Parquet/Arrow datasets requires pyarrow (pip install pyarrow)")
+    path = Path(path)
+    dataset = ds.dataset(str(path), format=_format_for(path), partitioning="hive")
+    expression = pq.filters_to_expression([list(filters)]) if filters else None
+    table = dataset.to_table(columns=list(columns) if columns else None, filter=expression)
+    return table.to_pandas(split_blocks=True)
+
+
+def select(df: pd.DataFrame, columns: Sequence[str] | None = None, filters: Filters | None = None) -> pd.DataFrame:
+    """Same projection/filter semantics as read_dataset, applied to an in-memory DataFrame."""
+    if filters:
+        mask = pd.Series(True, index=df.index)
+        for column, op, value in filters:
+            if op == "in":
+                mask &= df[column].isin(value)
+            elif op == "not in":
+                mask &= ~df[column].isin(value)
+            else:
+                mask &= _OPS[op](df[column], value)
+        df = df[mask]
+    if columns:
+        df = df[list(columns)]
+    return df
+
+
+def dataset_source(loader: Callable[[], pd.DataFrame]) -> Callable[..., pd.DataFrame]:
+    """Give a loader columns=/filters=/aggregate= parameters backed by its registered dataset
+    path, SQL table or remote URL.
+
+    Without any of them the loader body runs and select() applies the same projection and
+    filters. aggregate (a data/sql.py spec) replaces columns: the result holds only the
+    aggregated rows. Pass hashable values (tuples) so cache layers above can key on them.
+    """
+
+    @wraps(loader)
+    def wrapper(
+        columns: tuple[str, ...] | None = None,
+        filters: tuple[tuple[str, str, Any], ...] | None = None,
+        aggregate: tuple | None = None,
+    ) -> pd.DataFrame:
+        path = dataset_path(loader.__name__)
+        table = sql_table(loader.__name__) if path is None else None
+        if table is not None:
+            df = read_sql(*table, columns=columns, filters=filters, aggregate=aggregate)
+            return compact_frame(df, name=loader.__name__) if LOADER_COMPACT and aggregate is None else df
+        if aggregate is not None:
+            columns = aggregate_columns(aggregate)
+        if path is not None:
+            df = read_dataset(path, columns, filters)
+        else:
+            url = remote_url(loader.__name__)
+            if url is not None:
+                df = select(run_sync(fetch_frame(url, columns, filters)), columns, filters).reset_index(drop=True)
+            else:
+                df = loader()
+                if columns or filters:
+                    df = select(df, columns, filters).reset_index(drop=True)
+        if aggregate is not None:
+            return aggregate_frame(df, aggregate)
+        return compact_frame(df, name=loader.__name__) if LOADER_COMPACT else df
+
+    return wrapper
@@ -0,0 +1,325 @@
+"""
+SQL database sources for loaders: tables in a local SQLite file, or DuckDB when it is installed,
+queried with the column projection, row filters and aggregation pushed into the SQL, so only
+the plotted columns, or only the aggregated rows, come back. See docs/06-DATA-PATTERNS.md §1.1 and §3.
+
+Aggregation specs are hashable tuples (so loader caches can key on them):
+  ("group", by, ((column, func), ...)) — one row per distinct by-tuple, in first-seen order as in
+      pandas groupby(sort=False), with each measure named after its column; func is one of
+      "sum", "count" (non-null values), "min", "max", "mean".
+  ("bins", x, nbins, color) — counts of x in nbins equal-width bins over its range, split by
+      color (or None): color, bin_left, bin_right, count; empty bins are kept, as in
+      data/aggregate.histogram_bins.
+aggregate_frame computes the same result in pandas, for sources that cannot run SQL.
+
+Each thread gets its own connection per database, opened read-only on first use and reused for
+every later query (connections are not shared across processes). Compiled SQL text is cached per
+query shape, with filter values bound as parameters, so repeated queries reuse SQLite's
+prepared-statement cache (cached_statements).
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import LRUCache
+from utils.config import SQL_DATABASE, SQL_QUERY_CACHE_SIZE
+
+try:
+    import duckdb
+except ImportError:  # optional dependency; only needed for .duckdb databases
+    duckdb = None
+
+_DUCKDB_SUFFIXES = (".duckdb", ".ddb")
+
+_SQL_OPS = {"==": "=", "=": "=", "!=": "<>", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+_SQL_FUNCS = {"sum": "SUM", "count": "COUNT", "min": "MIN", "max": "MAX", "mean": "AVG"}
+
+# Engine-specific expressions: rounding a non-negative float down, and the finite-value test
+_DIALECTS = {
+    "sqlite": {"floor": "CAST({} AS INTEGER)", "finite": "{} IS NOT NULL"},
+    "duckdb": {"floor": "CAST(FLOOR({}) AS BIGINT)", "finite": "isfinite({})"},
+}
+
+# Scan position of each row, for first-seen group order; unlike rowid it exists on views and DuckDB
+_ROW_ORDER_ALIAS = "_row_order"
+_ROW_ORDER = f"ROW_NUMBER() OVER () AS {_ROW_ORDER_ALIAS}"
+
+# Loader name -> (database path, table); see register_sql / sql_table
+SQL_TABLES: dict[str, tuple[Path, str]] = {}
+
+# Compiled SQL text keyed by (engine, table, columns, filter shape, aggregate)
+SQL_QUERY_CACHE = LRUCache(maxsize=SQL_QUERY_CACHE_SIZE)
+
+
+class SqlDatabase:
+    """A SQLite or DuckDB database file opened read-only, with one pooled connection per thread."""
+
+    def __init__(self, path: str | Path, engine: str | None = None) -> None:
+        self.path = Path(path)
+        self.engine = engine or ("duckdb" if self.path.suffix in _DUCKDB_SUFFIXES else "sqlite")
+        if self.engine not in _DIALECTS:
+            raise ValueError(f"Unsupported SQL engine: {self.engine!r}")
+        if self.engine == "duckdb" and duckdb is None:
+            raise ImportError("Reading DuckDB databases requires duckdb (pip install duckdb)")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._duckdb_root: tuple[int, Any] | None = None
+        self._tables: frozenset[str] | None = None
+        self.connections_opened = 0
+        self.queries = 0
+
+    def _connect(self) -> Any:
+        with self._lock:
+            self.connections_opened += 1
+            if self.engine == "sqlite":
+                return sqlite3.connect(
+                    f"{self.path.resolve().as_uri()}?mode=ro", uri=True, cached_statements=SQL_QUERY_CACHE_SIZE
+                )
+            # One DuckDB database handle per process; each thread queries through its own cursor
+            if self._duckdb_root is None or self._duckdb_root[0] != os.getpid():
+                self._duckdb_root = (os.getpid(), duckdb.connect(str(self.path), read_only=True))
+            return self._duckdb_root[1].cursor()
+
+    def connection(self) -> Any:
+        """This thread's connection, opened on first use (and again in a forked worker)."""
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.connection, local.pid = self._connect(), os.getpid()
+        return local.connection
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+        """Run one SELECT and return its rows as a DataFrame."""
+        self.queries += 1
+        connection = self.connection()
+        if self.engine == "duckdb":
+            return connection.execute(sql, list(params)).df()
+        cursor = connection.execute(sql, list(params))
+        try:
+            columns = [description[0] for description in cursor.description]
+            return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+        finally:
+            cursor.close()
+
+    def tables(self) -> frozenset[str]:
+        """Names of the database's tables and views, read once (tables added later are not seen)."""
+        if self._tables is None:
+            if self.engine == "duckdb":
+                sql = "SELECT table_name FROM information_schema.tables"
+            else:
+                sql = "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')"
+            self._tables = frozenset(row[0] for row in self.connection().execute(sql).fetchall())
+        return self._tables
+
+    def stats(self) -> dict:
+        """Queries run and connections opened (one per thread that has queried)."""
+        return {"engine": self.engine, "queries": self.queries, "connections_opened": self.connections_opened}
+
+
+_databases: dict[Path, SqlDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def database(path: str | Path) -> SqlDatabase:
+    """The shared SqlDatabase for a file (engine from its suffix: .duckdb/.ddb, else SQLite)."""
+    path = Path(path)
+    with _databases_lock:
+        if path not in _databases:
+            _databases[path] = SqlDatabase(path)
+        return _databases[path]
+
+
+def sql_stats() -> dict:
+    """SqlDatabase.stats() per database file, and the compiled-query cache counters."""
+    return {
+        "databases": {str(path): db.stats() for path, db in _databases.items()},
+        "query_cache": SQL_QUERY_CACHE.stats(),
+    }
+
+
+def register_sql(loader_name: str, path: str | Path, table: str | None = None) -> None:
+    """Point a loader (e.g. "load_sales_by_region") at a table (default: name without load_)."""
+    SQL_TABLES[loader_name] = (Path(path), table or loader_name.removeprefix("load_"))
+
+
+def sql_table(loader_name: str) -> tuple[Path, str] | None:
+    """Registered (database, table) for a loader, else (SQL_DATABASE, name without load_) when
+    SQL_DATABASE has that table, else None (the loader falls back to its other sources)."""
+    if loader_name in SQL_TABLES:
+        return SQL_TABLES[loader_name]
+    if not SQL_DATABASE:
+        return None
+    table = loader_name.removeprefix("load_")
+    if table not in database(SQL_DATABASE).tables():
+        return None
+    return Path(SQL_DATABASE), table
+
+
+def _ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _param(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value
+
+
+def _filter_shape(filters: Sequence[tuple[str, str, Any]] | None) -> tuple:
+    """The part of filters that changes the SQL text: columns, ops and the length of "in" lists."""
+    return tuple(
+        (column, op, len(value) if op in ("in", "not in") else None) for column, op, value in filters or ()
+    )
+
+
+def _filter_params(filters: Sequence[tuple[str, str, Any]] | None) -> list:
+    params: list = []
+    for _, op, value in filters or ():
+        if op in ("in", "not in"):
+            params.extend(_param(item) for item in value)
+        else:
+            params.append(_param(value))
+    return params
+
+
+def _where(shape: tuple, extra: Sequence[str] = ()) -> str:
+    clauses = list(extra)
+    for column, op, size in shape:
+        if op in ("in", "not in"):
+            placeholders = ", ".join("?" * size)
+            if not size:
+                clauses.append("1 = 0" if op == "in" else "1 = 1")
+                continue
+            clauses.append(f"{_ident(column)} {op.upper()} ({placeholders})")
+        elif op in _SQL_OPS:
+            clauses.append(f"{_ident(column)} {_SQL_OPS[op]} ?")
+        else:
+            raise ValueError(f"Unsupported filter op: {op!r}")
+    return f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+def _compile(engine: str, table: str, columns: tuple | None, shape: tuple, aggregate: tuple | None) -> str:
+    """SQL text for a select / aggregate query; filter values are ? parameters (see _filter_params)."""
+    source = _ident(table)
+    if aggregate is None:
+        projection = ", ".join(_ident(column) for column in columns) if columns else "*"
+        return f"SELECT {projection} FROM {source}{_where(shape)}"
+    kind = aggregate[0]
+    if kind == "group":
+        _, by, measures = aggregate
+        for _, func in measures:
+            if func not in _SQL_FUNCS:
+                raise ValueError(f"Unsupported aggregate function: {func!r}")
+        keys = [_ident(column) for column in by]
+        selected = keys + [f"{_SQL_FUNCS[func]}({_ident(column)}) AS {_ident(column)}" for column, func in measures]
+        if not keys:
+            return f"SELECT {', '.join(selected)} FROM {source}{_where(shape)}"
+        read = ", ".join(_ident(column) for column in aggregate_columns(aggregate))
+        return (
+            f"SELECT {', '.join(selected)} FROM (SELECT {read}, {_ROW_ORDER} FROM {source}{_where(shape)}) "
+            f"GROUP BY {', '.join(keys)} ORDER BY MIN({_ROW_ORDER_ALIAS})"
+        )
+    if kind == "bins":
+        _, x, _, color = aggregate
+        dialect = _DIALECTS[engine]
+        value = f"CAST({_ident(x)} AS DOUBLE)"
+        key = [_ident(color)] if color is not None else []
+        bin_expr = dialect["floor"].format("(v - lo) * ? / (hi - lo)")
+        return (
+            f"WITH rows AS (SELECT {', '.join(key + [f'{value} AS v', _ROW_ORDER])} FROM {source}"
+            f"{_where(shape, [dialect['finite'].format(value)])}), "
+            "span AS (SELECT MIN(v) AS lo, CASE WHEN MAX(v) > MIN(v) THEN MAX(v) ELSE MIN(v) + 1 END AS hi FROM rows) "
+            f"SELECT {', '.join(key + [f'{bin_expr} AS bin', 'COUNT(*) AS count', 'MIN(lo) AS lo', 'MIN(hi) AS hi'])} "
+            f"FROM rows, span GROUP BY {', '.join(key + ['bin'])} ORDER BY MIN({_ROW_ORDER_ALIAS})"
+        )
+    raise ValueError(f"Unsupported aggregate: {aggregate!r}")
+
+
+def _bin_grid(raw: pd.DataFrame, nbins: int, color: str | None) -> pd.DataFrame:
+    """Full bin grid (empty bins included) from per-(color, bin) counts with the range in lo/hi."""
+    columns = ([color] if color is not None else []) + ["bin_left", "bin_right", "count"]
+    if raw.empty:
+        return pd.DataFrame({column: [] for column in columns})
+    edges = np.linspace(float(raw["lo"].iloc[0]), float(raw["hi"].iloc[0]), nbins + 1)
+    # The maximum lands on the right edge, which belongs to the last bin (as in np.histogram)
+    bins = np.clip(raw["bin"].to_numpy(dtype="int64"), 0, nbins - 1)
+    counts = raw["count"].to_numpy(dtype="int64")
+    if color is None:
+        return pd.DataFrame(
+            {"bin_left": edges[:-1], "bin_right": edges[1:], "count": np.bincount(bins, weights=counts, minlength=nbins).astype("int64")}
+        )
+    codes, groups = pd.factorize(raw[color], use_na_sentinel=False)
+    grid = np.bincount(codes * nbins + bins, weights=counts, minlength=len(groups) * nbins).astype("int64")
+    return pd.DataFrame(
+        {
+            color: np.repeat(groups, nbins),
+            "bin_left": np.tile(edges[:-1], len(groups)),
+            "bin_right": np.tile(edges[1:], len(groups)),
+            "count": grid,
+        }
+    )
+
+
+def aggregate_columns(aggregate: tuple) -> tuple[str, ...]:
+    """Columns an aggregation spec reads (the projection for sources that aggregate in pandas)."""
+    if aggregate[0] == "group":
+        return tuple(dict.fromkeys([*aggregate[1], *(column for column, _ in aggregate[2])]))
+    return (aggregate[1],) if aggregate[3] is None else (aggregate[1], aggregate[3])
+
+
+def aggregate_frame(df: pd.DataFrame, aggregate: tuple) -> pd.DataFrame:
+    """An aggregation spec computed in pandas (same result as the SQL pushdown)."""
+    kind = aggregate[0]
+    if kind == "group":
+        _, by, measures = aggregate
+        named = {column: (column, func) for column, func in measures}
+        if not by:
+            return pd.DataFrame({column: [df[column].agg(func)] for column, (_, func) in named.items()})
+        return df.groupby(list(by), sort=False, dropna=False, observed=True).agg(**named).reset_index()
+    if kind == "bins":
+        _, x, nbins, color = aggregate
+        values = df[x].to_numpy(dtype="float64")
+        finite = np.isfinite(values)
+        if not finite.any():
+            return _bin_grid(pd.DataFrame(), nbins, color)
+        lo, hi = values[finite].min(), values[finite].max()
+        if hi <= lo:
+            hi = lo + 1.0
+        raw = pd.DataFrame({"bin": np.floor((values[finite] - lo) * nbins / (hi - lo)).astype("int64"), "count": 1})
+        if color is not None:
+            raw.insert(0, color, df[color].to_numpy()[finite])
+        raw["lo"], raw["hi"] = lo, hi
+        return _bin_grid(raw, nbins, color)
+    raise ValueError(f"Unsupported aggregate: {aggregate!r}")
+
+
+def read_sql(
+    path: str | Path,
+    table: str,
+    columns: Sequence[str] | None = None,
+    filters: Sequence[tuple[str, str, Any]] | None = None,
+    aggregate: tuple | None = None,
+) -> pd.DataFrame:
+    """Rows of a table with the projection, filters and aggregation (if any) run in the database."""
+    db = database(path)
+    columns = tuple(columns) if columns else None
+    shape = _filter_shape(filters)
+    key = (db.engine, table, columns, shape, aggregate)
+    sql = SQL_QUERY_CACHE.get(key)
+    if sql is None:
+        sql = _compile(db.engine, table, columns, shape, aggregate)
+        SQL_QUERY_CACHE.set(key, sql)
+    params = _filter_params(filters)
+    if aggregate is not None and aggregate[0] == "bins":
+        # The bin count is the query's last parameter
+        return _bin_grid(db.query(sql, [*params, aggregate[2]]), aggregate[2], aggregate[3])
+    return db.query(sql, params)
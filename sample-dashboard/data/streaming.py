@@ -0,0 +1,50 @@
+"""
+Incremental loads for streaming charts: read only the rows newer than a watermark (the last key
+value the browser already has), so an auto-refresh tick moves O(new rows) instead of the whole
+series. Pair with components/charts.line_extend, which turns the rows into a dcc.Graph
+extendData update. See docs/06-DATA-PATTERNS.md §5.
+
+Contract: an incremental loader is a @dataset_source loader (data/sources.py) with an ordered
+key column (timestamp, sequence number, sortable time string) and no TTL cache, called as
+loader(columns=..., filters=((key, ">", watermark),)). The filter is pushed into the dataset scan
+when the loader is backed by Parquet/Arrow files; a SQL or API loader should push it to the source.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def json_scalar(value: Any) -> Any:
+    """A key value as a plain JSON-serializable scalar (watermarks are kept in a dcc.Store)."""
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def load_since(
+    loader: Callable[..., pd.DataFrame],
+    key: str,
+    watermark: Any = None,
+    columns: Sequence[str] | None = None,
+    max_rows: int | None = None,
+) -> tuple[pd.DataFrame, Any]:
+    """Rows of loader with key > watermark (all rows when watermark is None), sorted by key, and
+    the new watermark (the last key returned, or the old one when nothing is new).
+
+    max_rows keeps only the newest rows, e.g. a chart's rolling window on the first load.
+    """
+    filters = ((key, ">", watermark),) if watermark is not None else None
+    df = loader(columns=tuple(columns) if columns else None, filters=filters)
+    if not df[key].is_monotonic_increasing:
+        df = df.sort_values(key, kind="stable")
+    if max_rows is not None and len(df) > max_rows:
+        df = df.iloc[-max_rows:]
+    df = df.reset_index(drop=True)
+    if df.empty:
+        return df, watermark
+    return df, json_scalar(df[key].iloc[-1])
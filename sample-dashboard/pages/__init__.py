@@ -1 +1,107 @@
-# Page modules: charts.
+"""
+Page manifest. Page modules (and the builders, loaders, pandas and plotly.express they
+pull in) are imported on the first route hit via load_page, not when app.py is imported.
+"""
+from __future__ import annotations
+
+from types import ModuleType
+
+from utils.metrics import phase
+from utils.startup import import_timed
+
+# Page name -> module, routes and graph ids (plus the graphs built as background
+# jobs, the filters and the graphs they drive, for filtered pages, or the streamed
+# graph's ids, for streaming pages). Ids are listed here so callbacks targeting them
+# can be registered at startup without importing the page; load_page checks them.
+PAGES = {
+    "charts": {
+        "module": "pages.charts",
+        "paths": (None, "", "/", "/charts"),
+        "graph_ids": (
+            "charts-bar-region",
+            "charts-line-revenue",
+            "charts-scatter-units",
+            "charts-pie-category",
+        ),
+    },
+    "insights": {
+        "module": "pages.insights",
+        "paths": ("/insights",),
+        "graph_ids": (
+            "insights-box-team",
+            "insights-strip-team",
+            "insights-hist-response",
+            "insights-heatmap-revenue",
+        ),
+        # Graphs built by background jobs when BACKGROUND_JOBS_DIR is set
+        # (utils/jobs.py)
+        "background_graph_ids": ("insights-hist-response", "insights-heatmap-revenue"),
+    },
+    "explore": {
+        "module": "pages.explore",
+        "paths": ("/explore",),
+        "graph_ids": (),
+        # Dropdown id -> cube dimension, and the graphs a filter callback refills
+        # from them
+        "filters": {
+            "explore-dropdown-region": "region",
+            "explore-dropdown-segment": "segment",
+        },
+        "filter_graph_ids": ("explore-line-revenue", "explore-bar-segment"),
+    },
+    "live": {
+        "module": "pages.live",
+        "paths": ("/live",),
+        "graph_ids": (),
+        # Streamed graph, the Interval driving it and the Store with its watermark
+        "stream": {
+            "graph_id": "live-line-metrics",
+            "interval_id": "live-interval",
+            "store_id": "live-stream-state",
+        },
+    },
+    "config": {
+        "module": "pages.config",
+        "paths": ("/config",),
+        "graph_ids": (),
+    },
+}
+
+
+def page_for_path(pathname: str | None) -> str | None:
+    """Page name for a URL pathname, or None if no page serves it."""
+    for name, page in PAGES.items():
+        if pathname in page["paths"]:
+            return name
+    return None
+
+
+def load_page(name: str) -> ModuleType:
+    """Import a page module (timed, once) and check its GRAPHS against the manifest."""
+    page = PAGES[name]
+    with phase("import"):
+        module = import_timed(page["module"])
+    graph_ids = tuple(spec["id"] for spec in getattr(module, "GRAPHS", ()))
+    if graph_ids != page["graph_ids"]:
+        raise RuntimeError(
+            f"{page['module']}.GRAPHS ids {graph_ids} do not match "
+            f"PAGES[{name!r}]['graph_ids']"
+        )
+    background_ids = tuple(
+        spec["id"] for spec in getattr(module, "GRAPHS", ()) if spec.get("background")
+    )
+    if background_ids != page.get("background_graph_ids", ()):
+        raise RuntimeError(
+            f"{page['module']}.GRAPHS background cells do not match "
+            f"PAGES[{name!r}]['background_graph_ids']"
+        )
+    filters = (module.FILTERS, module.FILTER_GRAPH_IDS) if "filters" in page else None
+    if filters is not None and filters != (page["filters"], page["filter_graph_ids"]):
+        raise RuntimeError(
+            f"{page['module']}.FILTERS / FILTER_GRAPH_IDS do not match PAGES[{name!r}]"
+        )
+    if "stream" in page and module.STREAM != page["stream"]:
+        raise RuntimeError(
+            f"{page['module']}.STREAM does not match PAGES[{name!r}]['stream']"
+        )
+    return module
@@ -0,0 +1,70 @@
+"""
+Explore page: region and segment dropdowns filtering a monthly revenue line and a revenue-by-
+segment bar. Both are answered from the "sales" aggregate cube (data/cubes.py), and the dropdown
+options come from its dimension indexes. The page renders with the unfiltered figures;
+register_filter_callback in app.py refills the graphs when a dropdown changes.
+"""
+from __future__ import annotations
+
+import dash_bootstrap_components as dbc
+import plotly.graph_objects as go
+from dash import dcc, html
+
+from components.charts import bar_chart, line_chart
+from components.filters import dropdown
+from data.cubes import ALL, get_cube
+from utils.encoding import wire_figure
+
+# Graphs filled by the filter callback, in display order (listed in pages.PAGES too)
+FILTER_GRAPH_IDS = ("explore-line-revenue", "explore-bar-segment")
+
+# Dropdown id -> cube dimension it filters; the callback passes values to build_figures by dimension
+FILTERS = {"explore-dropdown-region": "region", "explore-dropdown-segment": "segment"}
+
+
+def build_figures(
+    theme: str = "light", config: dict | None = None, region: str | None = ALL, segment: str | None = ALL
+) -> dict[str, go.Figure]:
+    """Figures for the current filter values, keyed by graph id; O(cube cells) per call, not O(rows)."""
+    cube = get_cube("sales")
+    filters = {"region": region, "segment": segment}
+    monthly = cube.query(filters, group_by=("month",))
+    by_segment = cube.query(filters, group_by=("segment",))
+    return {
+        "explore-line-revenue": line_chart(monthly, x="month", y="revenue", title="Monthly revenue", theme=theme, config=config),
+        "explore-bar-segment": bar_chart(
+            by_segment, x="segment", y="revenue", title="Revenue by segment", color="segment", theme=theme, config=config
+        ),
+    }
+
+
+def layout(theme: str = "light", config: dict | None = None) -> html.Div:
+    """Explore page: filter row, then the two graphs for the unfiltered cube."""
+    config = config or {}
+    figures = build_figures(theme, config)
+    graph_config = {"displayModeBar": config.get("show_modebar", True)}
+    cube = get_cube("sales")
+    filters = dbc.Row(
+        [
+            dbc.Col(dropdown(cube.options("region", "All regions"), ALL, "explore-dropdown-region", label="Region"), md=6),
+            dbc.Col(dropdown(cube.options("segment", "All segments"), ALL, "explore-dropdown-segment", label="Segment"), md=6),
+        ],
+        className="mb-3",
+    )
+    graphs = dbc.Row(
+        [
+            dbc.Col(
+                dcc.Loading(dcc.Graph(id=graph_id, figure=wire_figure(figures[graph_id]), config=graph_config), type="circle"),
+                md=6,
+                className="mb-3",
+            )
+            for graph_id in FILTER_GRAPH_IDS
+        ]
+    )
+    return html.Div(
+        [
+            html.H1("Explore", className="mb-3"),
+            filters,
+            graphs,
+        ]
+    )
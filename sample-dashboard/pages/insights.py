@@ -3,91 +3,73 @@ Insights page: 2×2 grid of different chart types (box, strip, histogram, heatma
 """
 from __future__ import annotations
 
-import dash_bootstrap_components as dbc
-from dash import dcc, html
+import plotly.graph_objects as go
+from dash import html
 
 from components.charts import box_chart, strip_chart, histogram_chart, heatmap_chart
+from components.layout import make_graph_grid, make_lazy_graph_grid
+from components.render import build_page_figures
 from data.loaders import (
     load_box_data,
     load_histogram_data,
     load_heatmap_data,
 )
+from utils.config import GRAPH_LOADING
+
+# Grid cells in display order: graph id, loader, builder and builder kwargs
+GRAPHS = (
+    {
+        "id": "insights-box-team",
+        "loader": load_box_data,
+        "builder": box_chart,
+        "kwargs": dict(x="team", y="score", title="Score distribution by team", color="team"),
+    },
+    {
+        "id": "insights-strip-team",
+        "loader": load_box_data,
+        "builder": strip_chart,
+        "kwargs": dict(x="team", y="score", title="Scores by team (strip plot)", color="team"),
+    },
+    {
+        "id": "insights-hist-response",
+        "loader": load_histogram_data,
+        "builder": histogram_chart,
+        "kwargs": dict(x="response_ms", title="Response time distribution", nbins=24),
+        # Scans every row; built by a background job when BACKGROUND_JOBS_DIR is set
+        "background": True,
+    },
+    {
+        "id": "insights-heatmap-revenue",
+        "loader": load_heatmap_data,
+        "builder": heatmap_chart,
+        "kwargs": dict(x="quarter", y="region", z="revenue", title="Revenue by quarter and region"),
+        # Pivot is CPU-bound; builds in a worker process when RENDER_PROCESS_WORKERS > 0
+        "executor": "process",
+        "background": True,
+    },
+)
+
+
+def build_figures(theme: str = "light", config: dict | None = None) -> dict[str, go.Figure]:
+    """Build every figure on the page concurrently, keyed by graph id; loaders read only the plotted columns."""
+    return build_page_figures(GRAPHS, theme, config)
 
 
 def layout(theme: str = "light", config: dict | None = None) -> html.Div:
     """Insights page: 2×2 layout of box, strip, histogram, heatmap. config from config-store controls chart behavior."""
     config = config or {}
     graph_config = {"displayModeBar": config.get("show_modebar", True)}
-    df_box = load_box_data()
-    df_hist = load_histogram_data()
-    df_heat = load_heatmap_data()
-
-    fig_box = box_chart(
-        df_box,
-        x="team",
-        y="score",
-        title="Score distribution by team",
-        color="team",
-        theme=theme,
-        config=config,
-    )
-    fig_strip = strip_chart(
-        df_box,
-        x="team",
-        y="score",
-        title="Scores by team (strip plot)",
-        color="team",
-        theme=theme,
-        config=config,
-    )
-    fig_hist = histogram_chart(
-        df_hist,
-        x="response_ms",
-        title="Response time distribution",
-        nbins=24,
-        theme=theme,
-        config=config,
-    )
-    fig_heat = heatmap_chart(
-        df_heat,
-        x="quarter",
-        y="region",
-        z="revenue",
-        title="Revenue by quarter and region",
-        theme=theme,
-        config=config,
-    )
-
+    if GRAPH_LOADING == "lazy":
+        grid = make_lazy_graph_grid(
+            [spec["id"] for spec in GRAPHS],
+            graph_config,
+            background_ids=[spec["id"] for spec in GRAPHS if spec.get("background")],
+        )
+    else:
+        grid = make_graph_grid(build_figures(theme, config), graph_config)
     return html.Div(
         [
             html.H1("Insights", className="mb-3"),
-            dbc.Row(
-                [
-                    dbc.Col(
-                        dcc.Graph(id="insights-box-team", figure=fig_box, config=graph_config),
-                        md=6,
-                        className="mb-3",
-                    ),
-                    dbc.Col(
-                        dcc.Graph(id="insights-strip-team", figure=fig_strip, config=graph_config),
-                        md=6,
-                        className="mb-3",
-                    ),
-                ],
-            ),
-            dbc.Row(
-                [
-                    dbc.Col(
-                        dcc.Graph(id="insights-hist-response", figure=fig_hist, config=graph_config),
-                        md=6,
-                        className="mb-3",
-                    ),
-                    dbc.Col(
-                        dcc.Graph(id="insights-heatmap-revenue", figure=fig_heat, config=graph_config),
-                        md=6,
-                        className="mb-3",
-                    ),
-                ],
-            ),
+            *grid,
         ]
     )
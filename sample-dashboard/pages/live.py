@@ -0,0 +1,66 @@
+"""
+Live page: a streaming line chart of ops metrics. The first render carries the last
+INITIAL_ROWS rows; every DATA_REFRESH_INTERVAL_SEC the stream callback in app.py
+(register_stream_callback) loads only rows newer than the graph's watermark and appends them
+with extendData, in a rolling window of STREAM_MAX_POINTS. Theme/config changes patch the
+layout from style_figure, without loading rows. The only per-session state is the
+watermark, kept in the browser (the stream Store). See docs/06-DATA-PATTERNS.md §5.
+"""
+from __future__ import annotations
+
+import pandas as pd
+import plotly.graph_objects as go
+from dash import dcc, html
+
+from components.charts import line_chart, line_extend
+from data.loaders import load_live_metrics
+from data.streaming import load_since
+from utils.config import CHART_POINT_BUDGET, DATA_REFRESH_INTERVAL_SEC, STREAM_MAX_POINTS
+from utils.encoding import wire_figure
+
+# Streamed graph, its interval and the Store holding its watermark (listed in pages.PAGES too)
+STREAM = {"graph_id": "live-line-metrics", "interval_id": "live-interval", "store_id": "live-stream-state"}
+
+X, Y = "time", ["requests", "errors"]
+
+# Rows in the first render: the newest CHART_POINT_BUDGET points; ticks then grow the window in
+# the browser up to STREAM_MAX_POINTS
+INITIAL_ROWS = max(1, min(STREAM_MAX_POINTS, CHART_POINT_BUDGET // len(Y)))
+
+TITLE = "Requests and errors (live)"
+
+
+def build_figure(theme: str = "light", config: dict | None = None) -> tuple[go.Figure, str | None]:
+    """The chart over the newest INITIAL_ROWS rows, and their watermark (last time shown)."""
+    df, watermark = load_since(load_live_metrics, X, columns=[X, *Y], max_rows=INITIAL_ROWS)
+    fig = line_chart(df, x=X, y=Y, title=TITLE, theme=theme, config=config, max_points=None)
+    return fig, watermark
+
+
+def style_figure(theme: str = "light", config: dict | None = None) -> go.Figure:
+    """The chart on no rows, for components.charts.figure_patch on theme/config changes: it has
+    the same theme- and config-dependent properties without loading the stream (not cached).
+    Pass the rendered graph's trace types to figure_patch (it may use scattergl, this scatter)."""
+    empty = pd.DataFrame({X: pd.Series([], dtype=str), **{y: pd.Series([], dtype="float64") for y in Y}})
+    return line_chart.uncached(empty, x=X, y=Y, title=TITLE, theme=theme, config=config, max_points=None)
+
+
+def stream_update(watermark: str | None) -> tuple[tuple | None, str | None]:
+    """extendData for the rows after watermark (None when nothing is new), and the new watermark."""
+    rows, watermark = load_since(load_live_metrics, X, watermark, columns=[X, *Y], max_rows=STREAM_MAX_POINTS)
+    return line_extend(rows, X, Y, max_points=STREAM_MAX_POINTS), watermark
+
+
+def layout(theme: str = "light", config: dict | None = None) -> html.Div:
+    """Live page: the streamed graph, its interval and its watermark Store."""
+    config = config or {}
+    fig, watermark = build_figure(theme, config)
+    return html.Div(
+        [
+            html.H1("Live", className="mb-3"),
+            dcc.Graph(id=STREAM["graph_id"], figure=wire_figure(fig), config={"displayModeBar": config.get("show_modebar", True)}),
+            dcc.Interval(id=STREAM["interval_id"], interval=int(DATA_REFRESH_INTERVAL_SEC * 1000), n_intervals=0),
+            # trace_types: the rendered trace types, for theme/config patches built from style_figure
+            dcc.Store(id=STREAM["store_id"], data={"watermark": watermark, "trace_types": sorted({t.type for t in fig.data})}),
+        ]
+    )
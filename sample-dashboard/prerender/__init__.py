@@ -0,0 +1,4 @@
+"""
+Build-time pre-rendering of page figures into the figure store (utils/figure_store.py). Run from
+sample-dashboard/: python -m prerender --help. See README.md (Pre-rendered figures).
+"""
@@ -0,0 +1,47 @@
+"""
+Command line entry point: python -m prerender [--dir DIR] [--pages ...] [--themes ...] [--force].
+
+Examples (from sample-dashboard/):
+  python -m prerender --dir build/figures                # build what changed since the last run
+  python -m prerender --dir build/figures --force        # rebuild everything
+  PRERENDER_DIR=build/figures python app.py              # serve the stored figures
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from pages import PAGES
+from prerender.build import chart_configs, figure_configs, prerender
+from utils.config import PRERENDER_DIR
+from utils.figure_store import FigureStore
+from utils.theme import THEMES
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m prerender", description=__doc__.splitlines()[1])
+    parser.add_argument("--dir", type=Path, default=PRERENDER_DIR, help="store directory (default PRERENDER_DIR)")
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), help="pages to pre-render (default all)")
+    parser.add_argument("--themes", nargs="+", choices=list(THEMES), default=list(THEMES))
+    parser.add_argument("--force", action="store_true", help="rebuild graphs whose data has not changed")
+    args = parser.parse_args(argv)
+    if args.dir is None:
+        parser.error("--dir is required when PRERENDER_DIR is not set")
+
+    started = time.perf_counter()
+    print(
+        f"{len(list(chart_configs()))} chart configs -> {len(figure_configs())} distinct figures per theme; "
+        f"themes: {', '.join(args.themes)}"
+    )
+    results = prerender(FigureStore(args.dir), tuple(args.pages or ()), tuple(args.themes), force=args.force)
+    for result in results:
+        print(f"{result['status']:<9} {result['page']:<10} {result['id']:<28} {result['version']}  {result['figures']} figures")
+    built = sum(result["status"] == "built" for result in results)
+    print(f"{built} of {len(results)} graph(s) rebuilt into {args.dir} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Pre-render builder: walks the page manifest (pages.PAGES) and writes every graph's theme ×
+chart-config variants to a FigureStore, skipping graphs whose data and render inputs are unchanged.
+"""
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import logging
+from typing import Iterator
+
+import pandas as pd
+import plotly
+import plotly.io as pio
+
+from components.charts import graph_data
+from pages import PAGES, load_page
+from utils.config import DEFAULT_CHART_CONFIG, normalize_chart_config
+from utils.encoding import JSON_ENGINE
+from utils.figure_store import FigureStore, variant_name
+from utils.templates import templates_version
+from utils.theme import THEMES
+
+logger = logging.getLogger(__name__)
+
+
+def chart_configs() -> Iterator[dict]:
+    """Every combination of the DEFAULT_CHART_CONFIG toggles (32 with five toggles)."""
+    keys = tuple(DEFAULT_CHART_CONFIG)
+    for values in itertools.product((True, False), repeat=len(keys)):
+        yield dict(zip(keys, values))
+
+
+def figure_configs() -> list[dict]:
+    """One config per distinct figure: chart_configs() minus those differing only in toggles that
+    do not change the figure (show_modebar)."""
+    distinct = {}
+    for config in chart_configs():
+        distinct.setdefault(normalize_chart_config(config), config)
+    return list(distinct.values())
+
+
+def data_version(df: pd.DataFrame) -> str:
+    """Content hash of a loader result; stable across processes, unlike loader version stamps."""
+    digest = hashlib.sha1(repr((tuple(df.columns), tuple(map(str, df.dtypes)))).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def render_fingerprint(spec: dict) -> str:
+    """Hash of what a graph's figures depend on besides its data: builder, arguments, plotly and
+    the project templates. Changing any of them rebuilds the graph."""
+    inputs = [spec["builder"].__name__, sorted(spec["kwargs"].items()), plotly.__version__, templates_version()]
+    return hashlib.sha1(json.dumps(inputs, default=str).encode()).hexdigest()[:16]
+
+
+def prerender(
+    store: FigureStore,
+    pages: tuple[str, ...] | None = None,
+    themes: tuple[str, ...] = THEMES,
+    force: bool = False,
+) -> list[dict]:
+    """Pre-render every graph of the given pages (default all) for themes × figure_configs().
+
+    A graph is rebuilt only when its data version or render fingerprint differs from the
+    published one (or force is set); rebuilt graphs are published together at the end.
+    Returns one result per graph: id, page, version, status ("built" / "unchanged") and figure count.
+    """
+    configs = figure_configs()
+    current = store.manifest().get("graphs", {})
+    results, published = [], {}
+    for name in pages or tuple(PAGES):
+        for spec in getattr(load_page(name), "GRAPHS", ()):
+            df, kwargs = graph_data(spec)
+            data = data_version(df)
+            fingerprint = render_fingerprint(spec)
+            version = hashlib.sha1(f"{data}:{fingerprint}:{','.join(themes)}".encode()).hexdigest()[:12]
+            result = {"id": spec["id"], "page": name, "version": version, "figures": len(themes) * len(configs)}
+            if not force and current.get(spec["id"], {}).get("version") == version:
+                results.append({**result, "status": "unchanged"})
+                continue
+            for theme, config in itertools.product(themes, configs):
+                # .uncached: the builder's figure cache is keyed on per-process data stamps, and
+                # every variant is built exactly once here anyway
+                fig = spec["builder"].uncached(df, theme=theme, config=config, **kwargs)
+                store.write_figure(spec["id"], version, theme, config, pio.json.to_json_plotly(fig, engine=JSON_ENGINE))
+            published[spec["id"]] = {
+                "page": name,
+                "version": version,
+                "data_version": data,
+                "fingerprint": fingerprint,
+                "variants": sorted(variant_name(theme, config) for theme, config in itertools.product(themes, configs)),
+            }
+            logger.info("Pre-rendered %s (%s figures)", spec["id"], result["figures"])
+            results.append({**result, "status": "built"})
+    if published:
+        store.publish(published)
+    return results
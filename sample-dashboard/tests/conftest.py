@@ -0,0 +1,10 @@
+"""
+Tests run from sample-dashboard/ (python -m pytest tests) and import modules the way the app
+does (components.*, data.*, utils.*), so the app directory goes on sys.path first.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
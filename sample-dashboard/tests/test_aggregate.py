@@ -0,0 +1,88 @@
+"""Regression checks for data/aggregate.py."""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.charts import box_chart, histogram_chart
+from data.aggregate import box_stats, histogram_bins, pivot_matrix
+
+EMPTY = pd.DataFrame({"v": pd.Series([], dtype="float64"), "c": pd.Series([], dtype=object)})
+ALL_NAN = pd.DataFrame({"v": [np.nan] * 5, "c": list("abcab")})
+
+
+@pytest.mark.parametrize("df", [EMPTY, ALL_NAN], ids=["empty", "all-nan"])
+@pytest.mark.parametrize("kwargs", [{}, {"color": "c"}, {"nbins": 10}, {"clip_quantiles": (0.01, 0.99)}])
+def test_histogram_bins_without_finite_values(df, kwargs):
+    bins = histogram_bins(df, "v", **kwargs)
+    assert bins.empty
+    assert {"bin_left", "bin_right", "bin_center", "count"} <= set(bins.columns)
+    assert bins.attrs["clipped"] == 0
+
+
+@pytest.mark.parametrize("df", [EMPTY, ALL_NAN], ids=["empty", "all-nan"])
+def test_histogram_chart_without_finite_values(df):
+    fig = histogram_chart.uncached(df, x="v", title="Empty")
+    assert fig.layout.meta["bins"]["clipped"] == 0
+    assert all(len(trace.x if trace.x is not None else ()) == 0 for trace in fig.data)
+
+
+@pytest.mark.parametrize("df", [EMPTY, ALL_NAN], ids=["empty", "all-nan"])
+@pytest.mark.parametrize("color", [None, "c"])
+def test_box_stats_without_values(df, color):
+    stats = box_stats(df, "c", "v", color=color)
+    assert stats.empty
+    assert {"c", "q1", "median", "q3", "lowerfence", "upperfence", "mean", "n", "outliers"} <= set(stats.columns)
+
+
+@pytest.mark.parametrize("df", [EMPTY, ALL_NAN], ids=["empty", "all-nan"])
+def test_box_chart_without_values_draws_no_boxes(df):
+    fig = box_chart.uncached(df, x="c", y="v", title="Empty")
+    assert all(len(trace.x if trace.x is not None else ()) == 0 for trace in fig.data)
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 8, 25])
+def test_box_stats_quartiles_follow_plotly_linear_method(n):
+    rng = np.random.default_rng(n)
+    values = np.sort(rng.normal(70, 12, n))
+    stats = box_stats(pd.DataFrame({"g": ["a"] * n, "v": rng.permutation(values)}), "g", "v").iloc[0]
+
+    def interp(q):
+        # plotly.js Lib.interp
+        pos = min(max(q * n - 0.5, 0), n - 1)
+        lo, hi = math.floor(pos), math.ceil(pos)
+        return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+    assert stats["q1"] == pytest.approx(interp(0.25))
+    assert stats["median"] == pytest.approx(np.median(values))
+    assert stats["q3"] == pytest.approx(interp(0.75))
+    assert stats["n"] == n
+
+
+def test_box_stats_fences_and_outliers():
+    values = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 100.0, -50.0]
+    stats = box_stats(pd.DataFrame({"g": ["a"] * len(values), "v": values}), "g", "v").iloc[0]
+    assert (stats["lowerfence"], stats["upperfence"]) == (1.0, 7.0)
+    assert stats["outliers"] == [-50.0, 100.0]
+
+
+def test_box_stats_groups_in_first_seen_order():
+    df = pd.DataFrame({"g": ["b", "a", "b", "a", "c"], "v": [1.0, 2.0, 3.0, 4.0, np.nan]})
+    stats = box_stats(df, "g", "v")
+    assert stats["g"].tolist() == ["b", "a"]
+    assert stats["n"].tolist() == [2, 2]
+
+
+def test_pivot_matrix_drops_unused_categories():
+    df = pd.DataFrame({
+        "team": pd.Categorical(["a", "b", "a"], categories=["a", "b", "c"]),
+        "month": pd.Categorical(["Jan", "Feb", "Feb"], categories=["Jan", "Feb", "Mar"]),
+        "revenue": [1.0, 2.0, np.nan],
+    })
+    matrix = pivot_matrix(df, x="month", y="team", z="revenue")
+    assert matrix.index.tolist() == ["a", "b"]
+    assert matrix.columns.tolist() == ["Jan", "Feb"]
+    assert matrix.loc["a", "Jan"] == 1.0 and matrix.loc["b", "Feb"] == 2.0
@@ -0,0 +1,133 @@
+"""utils/cache.py: TTLCache expiry, single-flight loads, stale-while-revalidate and invalidation."""
+from __future__ import annotations
+
+import threading
+import time
+
+from utils.cache import TTLCache
+
+
+class Source:
+    """Counts calls; calls block until released when gated."""
+
+    def __init__(self, gated: bool = False) -> None:
+        self.calls = 0
+        self.gates: list[threading.Event] = []
+        self.gated = gated
+        self.lock = threading.Lock()
+
+    def __call__(self, key: str = "k") -> str:
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+            gate = threading.Event()
+            self.gates.append(gate)
+        if self.gated:
+            gate.wait(5)
+        return f"{key}:{call}"
+
+    def wait_for_calls(self, n: int) -> None:
+        deadline = time.monotonic() + 1
+        while self.calls < n and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+
+def _start(fn, *args) -> tuple[threading.Thread, list]:
+    result: list = []
+    thread = threading.Thread(target=lambda: result.append(fn(*args)))
+    thread.start()
+    return thread, result
+
+
+def test_fresh_entries_are_served_from_cache():
+    source = Source()
+    cache = TTLCache(source, ttl=60)
+    assert cache("a") == cache("a") == "a:1"
+    assert source.calls == 1
+    assert cache.stats()["('a',)"]["hits"] == 1
+
+
+def test_concurrent_misses_share_one_load():
+    source = Source(gated=True)
+    cache = TTLCache(source, ttl=60)
+    started = [_start(cache, "a") for _ in range(8)]
+    source.wait_for_calls(1)
+    time.sleep(0.05)
+    source.gates[0].set()
+    for thread, _ in started:
+        thread.join(5)
+    assert source.calls == 1
+    assert {result[0] for _, result in started} == {"a:1"}
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    source = Source()
+    cache = TTLCache(source, ttl=0.01)
+    assert cache("a") == "a:1"
+    time.sleep(0.02)
+    source.gated = True
+    assert cache("a") == "a:1"
+    assert cache("a") == "a:1"
+    source.wait_for_calls(2)
+    source.gates[1].set()
+    deadline = time.monotonic() + 5
+    while cache("a") == "a:1" and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert cache("a") == "a:2"
+    assert source.calls == 2
+
+
+def test_stale_ttl_limits_stale_serving():
+    source = Source()
+    cache = TTLCache(source, ttl=0.01, stale_ttl=0.02)
+    cache("a")
+    time.sleep(0.03)
+    assert cache("a") == "a:2"
+
+
+def test_invalidate_forces_a_reload():
+    source = Source()
+    cache = TTLCache(source, ttl=60)
+    cache("a")
+    cache("b")
+    cache.invalidate("a")
+    assert cache("a") == "a:3"
+    assert cache("b") == "b:2"
+    cache.invalidate_all()
+    assert cache("b") == "b:4"
+
+
+def test_load_from_before_invalidate_keeps_single_flight_for_the_new_one():
+    source = Source(gated=True)
+    cache = TTLCache(source, ttl=60)
+    old, old_result = _start(cache, "a")
+    source.wait_for_calls(1)
+    cache.invalidate("a")
+    new, new_result = _start(cache, "a")
+    # The new caller does not wait for the old load, whose result will be discarded
+    source.wait_for_calls(2)
+    assert source.calls == 2
+    # The old load finishing must not clear the new load's in-flight marker
+    source.gates[0].set()
+    old.join(5)
+    waiter, waiter_result = _start(cache, "a")
+    time.sleep(0.05)
+    assert source.calls == 2
+    for gate in source.gates:
+        gate.set()
+    new.join(5)
+    waiter.join(5)
+    assert old_result == ["a:1"]
+    assert new_result == waiter_result == ["a:2"]
+    # The pre-invalidate result was not stored
+    assert cache("a") == "a:2"
+
+
+def test_size_and_stats_are_bounded():
+    source = Source()
+    cache = TTLCache(source, ttl=60, maxsize=2)
+    for i in range(100):
+        cache(str(i))
+    assert len(cache._entries) == 2
+    assert len(cache.stats()) <= 4
+    assert {"('98',)", "('99',)"} <= set(cache.stats())
@@ -0,0 +1,114 @@
+"""data/remote.py against a stub HTTP/1.1 server on localhost."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from data.remote import HttpSource, fetch_frame, gather_sync, run_sync
+
+# Seconds the stub takes to answer /slow
+DELAY = 0.2
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Keep-alive JSON endpoints: /slow answers after DELAY, /stale answers but closes the
+    connection without a response on its next request (as a server dropping an idle keep-alive
+    connection), anything else answers at once."""
+
+    protocol_version = "HTTP/1.1"
+    stale = False
+
+    def do_GET(self):
+        if self.stale:
+            self.close_connection = True
+            return
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            parts = urlsplit(self.path)
+            if parts.path == "/slow":
+                time.sleep(DELAY)
+            columns = parse_qs(parts.query).get("columns", ["value"])[0].split(",")
+            body = json.dumps({"columns": columns, "data": [[1] * len(columns), [2] * len(columns)]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            self.stale = parts.path == "/stale"
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock, server.in_flight, server.max_in_flight = threading.Lock(), 0, 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_frame_sends_columns(stub):
+    _, url = stub
+    df = run_sync(fetch_frame(f"{url}/data", columns=["region", "sales"]))
+    assert list(df.columns) == ["region", "sales"]
+    assert len(df) == 2
+
+
+def test_concurrent_fetches_wait_for_the_slowest(stub):
+    _, url = stub
+    started = time.perf_counter()
+    frames = gather_sync({name: fetch_frame(f"{url}/slow?n={name}") for name in "abcd"})
+    elapsed = time.perf_counter() - started
+    assert sorted(frames) == ["a", "b", "c", "d"]
+    assert elapsed < 3 * DELAY
+
+
+def test_keep_alive_reuses_one_connection(stub):
+    _, url = stub
+    source = HttpSource(url)
+    for _ in range(5):
+        run_sync(source.get_json("/data"))
+    assert source.stats() == {"requests": 5, "connections_opened": 1, "idle": 1}
+
+
+def test_concurrency_limit(stub):
+    server, url = stub
+    source = HttpSource(url, max_concurrency=2)
+    started = time.perf_counter()
+    gather_sync({str(i): source.get_json("/slow") for i in range(4)})
+    elapsed = time.perf_counter() - started
+    assert server.max_in_flight == 2
+    assert elapsed >= 2 * DELAY
+    assert source.stats()["connections_opened"] == 2
+
+
+def test_timeout(stub):
+    _, url = stub
+    source = HttpSource(url, timeout=DELAY / 4)
+    with pytest.raises(TimeoutError):
+        run_sync(source.get_json("/slow"))
+
+
+def test_retry_skips_stale_pooled_connections(stub):
+    _, url = stub
+    source = HttpSource(url)
+    # Two pooled connections that the server drops on their next request
+    gather_sync({str(i): source.get_json("/stale") for i in range(2)})
+    assert source.stats()["idle"] == 2
+    assert len(run_sync(source.get_json("/data"))["data"]) == 2
+    assert source.stats()["connections_opened"] == 3
@@ -0,0 +1,49 @@
+"""data/sampling.py: LTTB downsampling budgets."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.sampling import downsample_series, lttb_indices
+
+N = 10_000
+rng = np.random.default_rng(0)
+WIDE = pd.DataFrame({
+    "t": pd.date_range("2024-01-01", periods=N, freq="min"),
+    "a": rng.normal(size=N).cumsum(),
+    "b": rng.normal(size=N).cumsum(),
+    "c": rng.normal(size=N).cumsum(),
+})
+
+
+def test_lttb_keeps_endpoints_and_budget():
+    x = np.arange(N, dtype="float64")
+    kept = lttb_indices(x, WIDE["a"].to_numpy(), 500)
+    assert len(kept) == 500
+    assert kept[0] == 0 and kept[-1] == N - 1
+    assert np.all(np.diff(kept) > 0)
+
+
+@pytest.mark.parametrize("y", [["a"], ["a", "b"], ["a", "b", "c"]])
+def test_each_series_gets_its_share_of_the_budget(y):
+    max_points = 1200
+    out = downsample_series(WIDE, "t", y, max_points)
+    per_series = max_points // len(y)
+    # Every series keeps its own LTTB picks; the returned rows are their union
+    assert per_series <= len(out) <= per_series * len(y)
+    assert out.index.is_monotonic_increasing
+    assert out.index[0] == 0 and out.index[-1] == N - 1
+
+
+def test_small_frames_are_returned_unchanged():
+    small = WIDE.head(300)
+    assert downsample_series(small, "t", ["a", "b"], 600) is small
+
+
+def test_nan_values_are_skipped():
+    df = WIDE[["t", "a"]].copy()
+    df.loc[::7, "a"] = np.nan
+    out = downsample_series(df, "t", ["a"], 400)
+    assert len(out) == 400
+    assert out["a"].notna().all()
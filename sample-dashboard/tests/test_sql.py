@@ -0,0 +1,72 @@
+"""data/sql.py: compiled SQL, and pushdown results against the pandas aggregate_frame."""
+from __future__ import annotations
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.sql import _compile, _filter_params, _filter_shape, aggregate_frame, read_sql, sql_stats
+
+ROWS = pd.DataFrame({
+    "region": ["North", "South", "East", "North", "West", "South", "East"],
+    "segment": ["A", "B", "A", "B", "A", "B", "B"],
+    "sales": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0],
+    "response_ms": [10.0, 50.0, 90.0, 20.0, 70.0, np.nan, 35.0],
+})
+
+AGGREGATES = [
+    ("group", ("region",), (("sales", "sum"),)),
+    ("group", ("region", "segment"), (("sales", "sum"), ("response_ms", "count"))),
+    ("group", ("segment",), (("sales", "mean"), ("response_ms", "max"))),
+    ("group", (), (("sales", "sum"),)),
+    ("bins", "response_ms", 4, None),
+    ("bins", "response_ms", 3, "segment"),
+]
+
+
+@pytest.fixture(scope="module")
+def db(tmp_path_factory):
+    path = tmp_path_factory.mktemp("sql") / "sample.sqlite"
+    with sqlite3.connect(path) as con:
+        ROWS.to_sql("sales", con, index=False)
+        con.execute("CREATE VIEW big_sales AS SELECT * FROM sales WHERE sales > 2")
+    return path
+
+
+@pytest.mark.parametrize("aggregate", AGGREGATES, ids=lambda a: f"{a[0]}-{a[1]}")
+def test_compiled_sql_has_no_rowid(aggregate):
+    for engine in ("sqlite", "duckdb"):
+        assert "rowid" not in _compile(engine, "sales", None, (), aggregate).lower()
+
+
+def test_filter_values_are_parameters():
+    filters = (("region", "in", ("North", "South")), ("sales", ">", 1))
+    sql = _compile("sqlite", "sales", ("region", "sales"), _filter_shape(filters), None)
+    assert "North" not in sql and sql.count("?") == 3
+    assert _filter_params(filters) == ["North", "South", 1]
+    # Same shape, other values: same SQL text (reused prepared statement)
+    other = (("region", "in", ("East", "West")), ("sales", ">", 5))
+    assert _compile("sqlite", "sales", ("region", "sales"), _filter_shape(other), None) == sql
+
+
+@pytest.mark.parametrize("table", ["sales", "big_sales"])
+@pytest.mark.parametrize("aggregate", AGGREGATES, ids=lambda a: f"{a[0]}-{a[1]}")
+def test_pushdown_matches_pandas(db, table, aggregate):
+    rows = ROWS if table == "sales" else ROWS[ROWS["sales"] > 2].reset_index(drop=True)
+    expected = aggregate_frame(rows, aggregate)
+    result = read_sql(db, table, aggregate=aggregate)
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected, check_dtype=False)
+
+
+def test_groups_keep_first_seen_order(db):
+    result = read_sql(db, "sales", filters=(("segment", "==", "B"),), aggregate=AGGREGATES[0])
+    assert result["region"].tolist() == ["South", "North", "East"]
+
+
+def test_projection_and_filters(db):
+    result = read_sql(db, "sales", columns=("region", "sales"), filters=(("sales", ">=", 5),))
+    assert list(result.columns) == ["region", "sales"]
+    assert result["sales"].tolist() == [5.0, 6.0, 7.0]
+    assert sql_stats()["databases"][str(db)]["connections_opened"] >= 1
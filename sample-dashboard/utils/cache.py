@@ -0,0 +1,244 @@
+"""
+In-process cache helpers. See docs/06-DATA-PATTERNS.md §4 for keys and invalidation.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable
+
+from utils.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Shared by all TTLCache instances for stale-while-revalidate refreshes
+_REFRESH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU mapping with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = max(1, maxsize)
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key (marking it recently used) or default."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries past maxsize."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Counters and size, e.g. for logging or a debug endpoint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+
+def _make_key(args: tuple, kwargs: dict) -> Hashable:
+    return args + tuple(sorted(kwargs.items())) if kwargs else args
+
+
+class TTLCache:
+    """Per-function cache with TTL, bounded size, stale-while-revalidate and single-flight loads.
+
+    - Fresh entry (age <= ttl): returned directly.
+    - Stale entry (ttl < age <= stale_ttl, or any age when stale_ttl is None): the old value is
+      returned immediately and one background refresh is started for the key.
+    - Missing entry: the first caller loads it; concurrent callers for the same key wait for
+      that load instead of hitting the source again.
+    A failed background refresh keeps serving the stale value (the error is logged and counted).
+    Loads that started before an invalidate() do not repopulate the cache.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        ttl: float,
+        maxsize: int = 32,
+        stale_ttl: float | None = None,
+    ) -> None:
+        self.func = func
+        self.ttl = ttl
+        self.maxsize = max(1, maxsize)
+        self.stale_ttl = stale_ttl
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._inflight: dict[Hashable, Future] = {}
+        self._stats: dict[Hashable, dict] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _key_stats(self, key: Hashable) -> dict:
+        stats = self._stats.get(key)
+        if stats is None:
+            # Bounded like the entries: drop the oldest stats of keys that are neither cached nor loading
+            if len(self._stats) >= 2 * self.maxsize:
+                stale = next((k for k in self._stats if k not in self._entries and k not in self._inflight), None)
+                if stale is not None:
+                    del self._stats[stale]
+            stats = self._stats[key] = {
+                "hits": 0,
+                "stale_hits": 0,
+                "misses": 0,
+                "refreshes": 0,
+                "errors": 0,
+                "last_refresh_ms": None,
+            }
+        return stats
+
+    def _load(self, key: Hashable, args: tuple, kwargs: dict, future: Future) -> Any:
+        """Run the wrapped function and store its result; always clears the in-flight marker if it
+        is still this load's future (after an invalidate() a newer load may have replaced it)."""
+        started = time.perf_counter()
+        generation = self._generation
+        try:
+            value = self.func(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._key_stats(key)["errors"] += 1
+            raise
+        else:
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[key] = (value, time.monotonic())
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        evicted, _ = self._entries.popitem(last=False)
+                        self._stats.pop(evicted, None)
+                stats = self._key_stats(key)
+                stats["refreshes"] += 1
+                stats["last_refresh_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            return value
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    def _refresh_in_background(self, key: Hashable, args: tuple, kwargs: dict, future: Future) -> None:
+        try:
+            self._load(key, args, kwargs, future)
+        except Exception:
+            logger.exception("Background refresh of %s%r failed; serving stale value", self.func.__name__, key)
+        finally:
+            # Callers waiting on a refresh read the entry afterwards
+            future.set_result(None)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        key = _make_key(args, kwargs)
+        with self._lock:
+            stats = self._key_stats(key)
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, loaded_at = entry
+                self._entries.move_to_end(key)
+                age = time.monotonic() - loaded_at
+                if age <= self.ttl:
+                    stats["hits"] += 1
+                    record_cache("loader", hit=True)
+                    return value
+                if self.stale_ttl is None or age <= self.stale_ttl:
+                    stats["stale_hits"] += 1
+                    record_cache("loader", hit=True)
+                    if key not in self._inflight:
+                        refresh = self._inflight[key] = Future()
+                        _REFRESH_POOL.submit(self._refresh_in_background, key, args, kwargs, refresh)
+                    return value
+            stats["misses"] += 1
+            record_cache("loader", hit=False)
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            future.result()
+            # The load we waited on may have been a background refresh (returns None); read the entry
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                return entry[0]
+            return self(*args, **kwargs)
+        try:
+            value = self._load(key, args, kwargs, future)
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        future.set_result(value)
+        return value
+
+    def invalidate(self, *args, **kwargs) -> None:
+        """Drop the entry for these arguments; the next call reloads it.
+
+        A load already running is forgotten too: its result is not stored, so later callers start
+        a new load instead of waiting for it.
+        """
+        key = _make_key(args, kwargs)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+            self._generation += 1
+
+    def invalidate_all(self) -> None:
+        """Drop every entry (e.g. on a refresh button click)."""
+        with self._lock:
+            self._entries.clear()
+            self._inflight.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        """Per-key hit/stale-hit/miss/refresh counts and last refresh latency."""
+        with self._lock:
+            return {repr(key): dict(stats) for key, stats in self._stats.items()}
+
+
+def ttl_cache(ttl: float, maxsize: int = 32, stale_ttl: float | None = None) -> Callable[[Callable], TTLCache]:
+    """Decorator form of TTLCache; the wrapped function keeps its name and docstring."""
+
+    def decorator(func: Callable) -> TTLCache:
+        cache = TTLCache(func, ttl=ttl, maxsize=maxsize, stale_ttl=stale_ttl)
+        functools.update_wrapper(cache, func)
+        return cache
+
+    return decorator
@@ -1,6 +1,10 @@
 """
 Default chart behavior config for the sample dashboard. Used by Config page and chart builders.
+Runtime settings are read from env here, in one place (docs/06-DATA-PATTERNS.md §1.2).
 """
+from __future__ import annotations
+
+import os
 
 # Keys and defaults for chart behavior toggles
 DEFAULT_CHART_CONFIG = {
@@ -10,3 +14,112 @@ DEFAULT_CHART_CONFIG = {
     "show_grid": True,
     "show_modebar": True,
 }
+
+# Toggles that change the figure itself; show_modebar only affects dcc.Graph config
+FIGURE_CONFIG_KEYS = ("show_legend", "show_titles", "show_data_labels", "show_grid")
+
+# How theme/config changes reach rendered graphs: "rerender" (rebuild page-content, default),
+# "patch" (send only the changed figure properties to the existing graphs via Dash Patch) or
+# "clientside" (re-style graphs in the browser, assets/clientside_theme.js)
+CHART_UPDATE_MODE = os.getenv("CHART_UPDATE_MODE", "rerender")
+
+# How figures are written into callback responses: "plotly" (plotly.py's encoder) or "compact"
+# (numeric trace arrays as narrowed base64 typed arrays, utils/encoding.py)
+FIGURE_ENCODING = os.getenv("FIGURE_ENCODING", "plotly")
+
+# How page graphs are filled: "lazy" (the page renders empty graphs; each graph has its own
+# callback, fired once it scrolls into view, assets/lazy_graphs.js) or "eager" (every figure is
+# built into the page-content response, default)
+GRAPH_LOADING = os.getenv("GRAPH_LOADING", "eager")
+
+# How a figure's template reaches the browser: "inline" (in every figure's layout) or
+# "reference" (only its name, in layout.meta.template; the browser loads the registered
+# templates once from /_dashboard/chart-templates.js, utils/templates.py)
+FIGURE_TEMPLATE = os.getenv("FIGURE_TEMPLATE", "inline")
+
+# How chart builders construct figures: "express" (plotly.express, then apply_theme) or "fast"
+# (px-equivalent traces assembled from NumPy columns and themed in one unvalidated
+# construction, components/fast_traces.py; falls back to px for calls it does not cover)
+FIGURE_BUILD = os.getenv("FIGURE_BUILD", "express")
+
+# Page-render scheduler (components/render.py): threads building a page's grid cells
+# concurrently (1 = serial), processes for cells marked "executor": "process" (0 = use threads)
+# and the per-cell timeout before a placeholder figure is shown
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "4"))
+RENDER_PROCESS_WORKERS = int(os.getenv("RENDER_PROCESS_WORKERS", "0"))
+CELL_TIMEOUT_SEC = float(os.getenv("CELL_TIMEOUT_SEC", "10"))
+
+# Directory of pre-rendered figures written by `python -m prerender` (utils/figure_store.py);
+# page graphs found there are served from disk instead of being built. Unset = always build
+PRERENDER_DIR = os.getenv("PRERENDER_DIR") or None
+
+# Background jobs (utils/jobs.py): with BACKGROUND_JOBS_DIR set, graphs marked "background" are built
+# by Dash background callbacks on a diskcache there, at most BACKGROUND_WORKERS at a time across
+# web workers; identical requests share a job and its result for BACKGROUND_RESULT_TTL_SEC
+BACKGROUND_JOBS_DIR = os.getenv("BACKGROUND_JOBS_DIR") or None
+BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", "2"))
+BACKGROUND_RESULT_TTL_SEC = float(os.getenv("BACKGROUND_RESULT_TTL_SEC", "300"))
+
+# Streaming charts (pages/live.py): seconds between auto-refresh ticks, each appending only rows
+# newer than the graph's watermark (data/streaming.py), and the points kept per trace in the browser
+DATA_REFRESH_INTERVAL_SEC = float(os.getenv("DATA_REFRESH_INTERVAL_SEC", "10"))
+STREAM_MAX_POINTS = int(os.getenv("STREAM_MAX_POINTS", "8640"))
+
+# Max aggregates (histogram bins, box stats, pivots) kept by data/aggregate.py
+AGGREGATE_CACHE_SIZE = int(os.getenv("AGGREGATE_CACHE_SIZE", "128"))
+
+# Points per line/scatter chart before downsampling / WebGL kicks in (docs/04-PLOTLY-GUIDE.md §4)
+CHART_POINT_BUDGET = int(os.getenv("CHART_POINT_BUDGET", "10000"))
+
+# Cell budget for heatmap matrices; larger pivots are coarsened (data/aggregate.pivot_matrix)
+HEATMAP_MAX_CELLS = int(os.getenv("HEATMAP_MAX_CELLS", "10000"))
+
+# Loader cache (data/loaders.py): entries older than LOADER_TTL_SEC are served stale while one
+# background refresh runs; past LOADER_STALE_TTL_SEC (unset = no limit) callers wait for a reload
+LOADER_TTL_SEC = float(os.getenv("LOADER_TTL_SEC", "300"))
+LOADER_STALE_TTL_SEC = float(os.getenv("LOADER_STALE_TTL_SEC")) if os.getenv("LOADER_STALE_TTL_SEC") else None
+
+# Loader frame compaction (data/compact.py, opt-in): with LOADER_COMPACT every loader result is stored with
+# categoricals for string columns whose distinct values are at most LOADER_CATEGORY_MAX_RATIO of
+# the rows, Arrow-backed strings for the rest and lossless numeric downcasts
+LOADER_COMPACT = os.getenv("LOADER_COMPACT", "false").lower() in ("1", "true", "yes")
+LOADER_CATEGORY_MAX_RATIO = float(os.getenv("LOADER_CATEGORY_MAX_RATIO", "0.5"))
+
+# Directory for the cross-worker Arrow loader cache (utils/shared_cache.py); unset = per-process only
+LOADER_CACHE_DIR = os.getenv("LOADER_CACHE_DIR") or None
+
+# Directory of Parquet/Arrow datasets for loaders (data/sources.py): <dir>/sales_by_region.parquet
+# backs load_sales_by_region, etc.; unset = in-memory sample data
+DATASET_DIR = os.getenv("DATASET_DIR") or None
+
+# SQLite (or DuckDB: .duckdb) database file for loaders (data/sql.py): table sales_by_region backs
+# load_sales_by_region, etc., with projection, filters and chart aggregations run as SQL; unset = off.
+# SQL_QUERY_CACHE_SIZE bounds the compiled queries and each connection's prepared statements
+SQL_DATABASE = os.getenv("SQL_DATABASE") or None
+SQL_QUERY_CACHE_SIZE = int(os.getenv("SQL_QUERY_CACHE_SIZE", "128"))
+
+# Base URL of JSON endpoints for loaders (data/remote.py): <url>/sales_by_region backs
+# load_sales_by_region, etc.; unset = in-memory sample data. Requests share keep-alive connections,
+# at most REMOTE_MAX_CONCURRENCY in flight per origin, each limited to REMOTE_TIMEOUT_SEC
+REMOTE_DATA_URL = os.getenv("REMOTE_DATA_URL") or None
+REMOTE_MAX_CONCURRENCY = int(os.getenv("REMOTE_MAX_CONCURRENCY", "4"))
+REMOTE_TIMEOUT_SEC = float(os.getenv("REMOTE_TIMEOUT_SEC", "5"))
+
+# Callback instrumentation (utils/metrics.py, opt-in): Server-Timing headers and /metrics;
+# /metrics answers only loopback clients unless METRICS_ALLOW_REMOTE is set
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+METRICS_ALLOW_REMOTE = os.getenv("METRICS_ALLOW_REMOTE", "false").lower() in ("1", "true", "yes")
+
+# Startup (app.py): STARTUP_WARMUP imports the pages and builds their default figures in a
+# background thread after boot; STARTUP_REPORT prints import times and startup milestones
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "false").lower() in ("1", "true", "yes")
+STARTUP_REPORT = os.getenv("STARTUP_REPORT", "false").lower() in ("1", "true", "yes")
+
+# Max figures kept by the chart builder cache (components/charts.py)
+FIGURE_CACHE_SIZE = int(os.getenv("FIGURE_CACHE_SIZE", "256"))
+
+
+def normalize_chart_config(config: dict | None) -> tuple[tuple[str, bool], ...]:
+    """Return the figure-affecting toggles as a hashable, default-filled tuple."""
+    cfg = config or {}
+    return tuple((key, bool(cfg.get(key, DEFAULT_CHART_CONFIG[key]))) for key in FIGURE_CONFIG_KEYS)
@@ -0,0 +1,172 @@
+"""
+Compact figure encoding for callback responses: numeric trace arrays become plotly.js typed
+arrays ({dtype, bdata[, shape]}, base64), narrowed to the smallest integer type or float32 when
+that loses no visible precision, and the rest goes through the fastest available JSON engine.
+plotly.py already base64-encodes NumPy arrays, but always as float64 and never plain lists.
+Opt in with FIGURE_ENCODING=compact; FIGURE_TEMPLATE=reference also leaves registered templates
+out of the figure (utils/templates.py). See docs/04-PLOTLY-GUIDE.md §4.
+"""
+from __future__ import annotations
+
+import base64
+import importlib.util
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from utils.config import FIGURE_ENCODING, FIGURE_TEMPLATE
+from utils.metrics import phase
+
+# plotly.io's orjson engine is several times faster than the stdlib encoder
+JSON_ENGINE = "orjson" if importlib.util.find_spec("orjson") else "json"
+
+# Arrays shorter than this stay plain JSON lists (no size win, easier to read)
+MIN_TYPED_LENGTH = 8
+
+# float64 -> float32 is used when the largest rounding error is within this fraction of the
+# array's value range (far below one pixel at any zoom a chart is used at)
+FLOAT32_TOLERANCE = 1e-6
+
+# Typed array dtypes plotly.js understands, narrowest first (no 64-bit integers)
+_INT_TYPES = (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32)
+
+
+def _narrow_ints(values: np.ndarray) -> np.ndarray:
+    """Integer values in the narrowest plotly.js integer type that holds them (float64 past 32 bits)."""
+    if len(values) == 0:
+        return values.astype(np.int8)
+    low, high = values.min(), values.max()
+    for int_type in _INT_TYPES:
+        info = np.iinfo(int_type)
+        if info.min <= low and high <= info.max:
+            return values.astype(int_type)
+    return values.astype(np.float64)
+
+
+def _narrow(values: np.ndarray) -> np.ndarray | None:
+    """values as the narrowest exact integer type, float32 or float64; None if not numeric."""
+    kind = values.dtype.kind
+    if kind == "b":
+        return values.astype(np.uint8)
+    if kind in "iu":
+        return _narrow_ints(values)
+    if kind != "f":
+        return None
+    finite_mask = np.isfinite(values)
+    finite = values[finite_mask]
+    if finite.size == 0:
+        return values.astype(np.float32)
+    magnitude = np.abs(finite).max()
+    if finite.size == values.size and magnitude < 2**31 and np.array_equal(finite, np.round(finite)):
+        return _narrow_ints(values.astype(np.int64))
+    if magnitude > np.finfo(np.float32).max:
+        return values.astype(np.float64)
+    as_f32 = values.astype(np.float32)
+    error = np.abs(as_f32[finite_mask].astype(np.float64) - finite).max()
+    scale = max(finite.max() - finite.min(), magnitude)
+    return as_f32 if error <= FLOAT32_TOLERANCE * scale else values.astype(np.float64)
+
+
+def typed_array(values) -> dict | None:
+    """plotly.js typed-array spec for a numeric 1-D/2-D array or list, else None (keep as is)."""
+    if isinstance(values, np.ndarray):
+        array = values
+    elif isinstance(values, (list, tuple)) and len(values) >= MIN_TYPED_LENGTH:
+        try:
+            array = np.asarray(values)
+        except ValueError:  # ragged nested lists
+            return None
+    else:
+        return None
+    if array.ndim not in (1, 2) or array.size < MIN_TYPED_LENGTH:
+        return None
+    narrowed = _narrow(array.ravel())
+    if narrowed is None:
+        return None
+    little_endian = narrowed.astype(narrowed.dtype.newbyteorder("<"), copy=False)
+    spec = {"dtype": little_endian.dtype.str[1:], "bdata": base64.b64encode(little_endian.tobytes()).decode()}
+    if array.ndim == 2:
+        spec["shape"] = f"{array.shape[0]}, {array.shape[1]}"
+    return spec
+
+
+def _decode(spec: dict) -> np.ndarray:
+    """Array from a typed-array spec (plotly.py already emits float64/int ones for NumPy input)."""
+    array = np.frombuffer(base64.b64decode(spec["bdata"]), dtype=np.dtype(spec["dtype"]).newbyteorder("<"))
+    if "shape" in spec:
+        array = array.reshape([int(n) for n in spec["shape"].split(",")])
+    return array
+
+
+def _child(source, key):
+    """source[key] for a plotly object (trace or nested property), None when unavailable."""
+    if source is None or isinstance(source, np.ndarray):
+        return None
+    try:
+        return source[key]
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def _encode_arrays(value, source=None):
+    """Copy of a trace property tree with numeric arrays replaced by (narrowed) typed-array specs.
+
+    source is the matching plotly object, so float64 arrays plotly.py already encoded are
+    re-encoded from the original NumPy array instead of being base64-decoded first.
+    """
+    if isinstance(value, dict):
+        if "bdata" in value and "dtype" in value:
+            if value["dtype"] != "f8":
+                return value
+            raw = source if isinstance(source, np.ndarray) else _decode(value)
+            return typed_array(raw) or value
+        return {key: _encode_arrays(item, _child(source, key)) for key, item in value.items()}
+    encoded = typed_array(value)
+    if encoded is not None:
+        return encoded
+    if isinstance(value, (list, tuple)) and any(isinstance(item, dict) for item in value):
+        return [_encode_arrays(item, _child(source, i)) for i, item in enumerate(value)]
+    return value
+
+
+def compact_figure(fig: go.Figure | dict) -> dict:
+    """Figure dict with every numeric trace array as a narrowed typed array; layout untouched."""
+    if isinstance(fig, go.Figure):
+        figure = fig.to_plotly_json()
+        traces = fig.data
+    else:
+        figure, traces = dict(fig), ()
+    figure["data"] = [
+        _encode_arrays(trace, traces[i] if i < len(traces) else None) for i, trace in enumerate(figure.get("data", []))
+    ]
+    return figure
+
+
+def to_compact_json(fig: go.Figure | dict) -> str:
+    """compact_figure(fig) serialized with JSON_ENGINE."""
+    return pio.json.to_json_plotly(compact_figure(fig), engine=JSON_ENGINE)
+
+
+def without_template(figure: dict) -> dict:
+    """Figure dict minus layout.template, when the template is registered and named in layout.meta
+    (the browser restores it, assets/chart_templates.js); other figures are returned unchanged."""
+    layout = figure.get("layout", {})
+    if "template" not in layout or not (layout.get("meta") or {}).get("template"):
+        return figure
+    return {**figure, "layout": {key: value for key, value in layout.items() if key != "template"}}
+
+
+def wire_figure(fig: go.Figure | dict) -> go.Figure | dict:
+    """The figure as it should be placed in a component prop, per FIGURE_ENCODING and FIGURE_TEMPLATE.
+
+    fig may also be a figure dict in plotly.py's JSON form (e.g. pre-rendered, utils/figure_store.py).
+    """
+    if FIGURE_ENCODING != "compact" and FIGURE_TEMPLATE != "reference":
+        return fig
+    with phase("serialize"):
+        if FIGURE_ENCODING == "compact":
+            figure = compact_figure(fig)
+        else:
+            figure = fig.to_plotly_json() if isinstance(fig, go.Figure) else fig
+        return without_template(figure) if FIGURE_TEMPLATE == "reference" else figure
@@ -0,0 +1,113 @@
+"""
+Pre-rendered figure store: figure JSON for every (graph, theme, chart config) variant, written
+by `python -m prerender` and read by the page-render scheduler (components/render.py) instead of
+loading and building. Enabled by PRERENDER_DIR. See docs/11-DEPLOYMENT.md §2.
+
+Layout: <directory>/manifest.json lists each graph's current version; its figures live in
+<directory>/<graph id>/<version>/<theme>-<config bits>.json. A rebuild writes a new version
+directory and then atomically replaces the manifest, so readers never see a half-written graph.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from utils.cache import LRUCache
+from utils.config import normalize_chart_config
+
+# Bump when the file layout or figure format changes; stores in another format are ignored
+STORE_FORMAT = 1
+
+MANIFEST_NAME = "manifest.json"
+
+
+def variant_name(theme: str, config: dict | None) -> str:
+    """File stem of a figure variant: the theme plus one bit per figure-affecting config toggle
+    (utils.config.FIGURE_CONFIG_KEYS), so configs differing only in show_modebar share a file."""
+    bits = "".join("1" if enabled else "0" for _key, enabled in normalize_chart_config(config))
+    return f"{theme}-{bits}"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.stem, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+
+
+class FigureStore:
+    """Versioned on-disk figure JSON, one directory per graph version.
+
+    Reads are memoized: the manifest is re-read only when its mtime changes (so a rebuild is
+    picked up without restarting workers), and parsed figures are kept in an LRU keyed by path.
+    Versioned paths never change content, so a cached figure can only be superseded, not stale.
+    """
+
+    def __init__(self, directory: str | os.PathLike, cache_size: int = 256) -> None:
+        self.directory = Path(directory)
+        self._manifest: dict = {}
+        self._manifest_mtime: int | None = None
+        self._figures = LRUCache(maxsize=cache_size)
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST_NAME
+
+    def manifest(self) -> dict:
+        """Current manifest ({"format", "graphs": {graph id: entry}}), empty when there is none."""
+        try:
+            mtime = self.manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._manifest, self._manifest_mtime = {}, None
+            return self._manifest
+        if mtime != self._manifest_mtime:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            self._manifest = manifest if manifest.get("format") == STORE_FORMAT else {}
+            self._manifest_mtime = mtime
+        return self._manifest
+
+    def figure_path(self, graph_id: str, version: str, theme: str, config: dict | None) -> Path:
+        return self.directory / graph_id / version / f"{variant_name(theme, config)}.json"
+
+    def get(self, graph_id: str, theme: str, config: dict | None) -> dict | None:
+        """The stored figure dict for a variant, or None if the graph or variant is not pre-rendered."""
+        entry = self.manifest().get("graphs", {}).get(graph_id)
+        if entry is None:
+            return None
+        path = self.figure_path(graph_id, entry["version"], theme, config)
+        figure = self._figures.get(path)
+        if figure is None:
+            try:
+                figure = json.loads(path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                return None
+            self._figures.set(path, figure)
+        return figure
+
+    def write_figure(self, graph_id: str, version: str, theme: str, config: dict | None, figure_json: str) -> None:
+        """Write one variant into a (not yet published) graph version."""
+        path = self.figure_path(graph_id, version, theme, config)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(path, figure_json)
+
+    def publish(self, entries: dict[str, dict]) -> None:
+        """Make graph versions current (graph id -> manifest entry with at least "version"),
+        then delete the versions they replace."""
+        manifest = self.manifest()
+        graphs = dict(manifest.get("graphs", {}))
+        graphs.update(entries)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.manifest_path, json.dumps({"format": STORE_FORMAT, "graphs": graphs}, indent=2, sort_keys=True))
+        for graph_id, entry in entries.items():
+            for old in (self.directory / graph_id).iterdir():
+                if old.is_dir() and old.name != entry["version"]:
+                    shutil.rmtree(old, ignore_errors=True)
@@ -0,0 +1,183 @@
+"""
+Background jobs for expensive figures: Dash background callbacks on a diskcache-backed manager
+that runs at most BACKGROUND_WORKERS jobs at a time (across all web workers sharing the
+directory), so heavy builds never occupy a request worker and cannot pile up. See
+docs/05-DASH-GUIDE.md §6 and docs/11-DEPLOYMENT.md §2.
+
+On top of Dash's DiskcacheManager (one subprocess per job, result and progress in the cache):
+  - Jobs wait in arrival order for one of the worker slots; a waiting job reports queued_progress.
+  - Identical requests (same callback, arguments and result period) share one job: a request
+    arriving while it runs subscribes to it, and one arriving after it finished gets the stored
+    result without starting a job. Results are kept for result_ttl seconds.
+  - Cancelling (a callback's cancel inputs, e.g. navigating away) only stops a shared job when
+    its last subscriber cancels. Errors and no-update results are not shared.
+"""
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import time
+from typing import Any, Callable
+
+import diskcache
+import psutil
+from dash import DiskcacheManager
+
+from utils.config import BACKGROUND_JOBS_DIR, BACKGROUND_RESULT_TTL_SEC, BACKGROUND_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Cache keys of the worker slots (pids of running jobs) and the queue (pids of waiting jobs)
+RUNNING_KEY = "jobs-running"
+WAITING_KEY = "jobs-waiting"
+
+# Seconds between a waiting job's checks for a free slot
+_POLL_SEC = 0.1
+
+
+def _alive(pid: int) -> bool:
+    try:
+        return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+@contextlib.contextmanager
+def worker_slot(cache: diskcache.Cache, workers: int, on_wait: Callable[[], None] | None = None):
+    """Hold one of `workers` slots shared through cache for the duration of the block.
+
+    Waiting processes are served in arrival order; slots and queue entries of processes that
+    died (e.g. a cancelled job that was killed) are dropped on the next check.
+    """
+    pid = os.getpid()
+    with cache.transact():
+        cache.set(WAITING_KEY, [*cache.get(WAITING_KEY, []), pid])
+    waited = False
+    while True:
+        with cache.transact():
+            running = [p for p in cache.get(RUNNING_KEY, []) if _alive(p)]
+            waiting = [p for p in cache.get(WAITING_KEY, []) if _alive(p)]
+            free = max(0, workers - len(running))
+            if pid in waiting[:free]:
+                waiting.remove(pid)
+                running.append(pid)
+            cache.set(RUNNING_KEY, running)
+            cache.set(WAITING_KEY, waiting)
+        if pid in running:
+            break
+        if not waited and on_wait is not None:
+            on_wait()
+        waited = True
+        time.sleep(_POLL_SEC)
+    try:
+        yield
+    finally:
+        with cache.transact():
+            cache.set(RUNNING_KEY, [p for p in cache.get(RUNNING_KEY, []) if p != pid])
+
+
+def _shareable(result: Any) -> bool:
+    """False for results Dash stores for errors and PreventUpdate, which are not reused."""
+    return not (isinstance(result, dict) and ("background_callback_error" in result or "_dash_no_update" in result))
+
+
+class JobManager(DiskcacheManager):
+    """DiskcacheManager with a worker-slot limit, shared jobs and shared results (module docstring).
+
+    Job ids handed to the browser are the job processes' pids, or 0 for a request answered from
+    a stored result; only pids of jobs this manager started are ever terminated.
+    """
+
+    def __init__(
+        self,
+        cache: diskcache.Cache,
+        workers: int = BACKGROUND_WORKERS,
+        result_ttl: float = BACKGROUND_RESULT_TTL_SEC,
+        queued_progress: list | None = None,
+    ) -> None:
+        # Results are stored per result period, so equal requests within one period share them
+        super().__init__(cache, cache_by=[lambda: int(time.time() // result_ttl)], expire=result_ttl)
+        self.workers = max(1, workers)
+        self.queued_progress = queued_progress
+
+    @staticmethod
+    def _job_key(key: str) -> str:
+        return f"{key}-job"
+
+    def make_job_fn(self, fn, progress, key=None):
+        job_fn = super().make_job_fn(fn, progress, key)
+        cache, workers, queued_progress = self.handle, self.workers, self.queued_progress
+
+        def pooled_job_fn(result_key, progress_key, user_callback_args, context):
+            on_wait = (lambda: cache.set(progress_key, queued_progress)) if progress and queued_progress else None
+            with worker_slot(cache, workers, on_wait):
+                job_fn(result_key, progress_key, user_callback_args, context)
+
+        return pooled_job_fn
+
+    def call_job_fn(self, key, job_fn, args, context):
+        """Start a job for key, or subscribe to the one already running; 0 when a result is stored."""
+        if self.result_ready(key):
+            return 0
+        with self.handle.transact():
+            record = self.handle.get(self._job_key(key))
+            if record is not None and self.job_running(record["pid"]):
+                record["subscribers"] += 1
+                self.handle.set(self._job_key(key), record, expire=self.expire)
+                return record["pid"]
+        # Started outside the transaction so the forked job never inherits the cache's write lock
+        pid = super().call_job_fn(key, job_fn, args, context)
+        with self.handle.transact():
+            self.handle.set(self._job_key(key), {"pid": pid, "subscribers": 1}, expire=self.expire)
+            self.handle.set(f"job-{pid}", key, expire=self.expire)
+        return pid
+
+    def terminate_job(self, job):
+        """Drop one subscriber of a job (called when a request got its result or was cancelled);
+        the process is killed when none are left."""
+        pid = int(job) if job else 0
+        if not pid:
+            return
+        with self.handle.transact():
+            key = self.handle.get(f"job-{pid}")
+            if key is None:
+                return
+            record = self.handle.get(self._job_key(key))
+            if record is not None and record["pid"] == pid and record["subscribers"] > 1:
+                record["subscribers"] -= 1
+                self.handle.set(self._job_key(key), record, expire=self.expire)
+                return
+            self.handle.delete(self._job_key(key))
+            self.handle.delete(f"job-{pid}")
+        super().terminate_job(pid)
+
+    def terminate_unhealthy_job(self, job):
+        pid = int(job) if job else 0
+        if pid and self.handle.get(f"job-{pid}") is not None and not self.job_running(pid):
+            self.terminate_job(pid)
+            return True
+        return False
+
+    def get_progress(self, key):
+        # Not consumed on read: every subscriber of a shared job polls the same progress entry
+        return self.handle.get(self._make_progress_key(key))
+
+    def get_result(self, key, job):
+        result = super().get_result(key, job)
+        if result is not self.UNDEFINED and not _shareable(result):
+            self.clear_cache_entry(key)
+        return result
+
+    def stats(self) -> dict:
+        """Jobs running in a worker slot and waiting for one."""
+        running = [p for p in self.handle.get(RUNNING_KEY, []) if _alive(p)]
+        waiting = [p for p in self.handle.get(WAITING_KEY, []) if _alive(p)]
+        return {"workers": self.workers, "running": len(running), "waiting": len(waiting)}
+
+
+def job_manager(directory: str | None = BACKGROUND_JOBS_DIR, **kwargs) -> JobManager | None:
+    """JobManager on a diskcache in directory (shared by every web worker), or None when unset."""
+    if not directory:
+        return None
+    return JobManager(diskcache.Cache(directory), **kwargs)
@@ -0,0 +1,230 @@
+"""
+Callback instrumentation: per-request wall time split into phases (import, load, build, serialize),
+response bytes and cache hits, sent as a Server-Timing header and aggregated into per-callback
+Prometheus histograms served at /metrics. See docs/05-DASH-GUIDE.md §6 and
+docs/11-DEPLOYMENT.md §2.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+from collections import defaultdict
+from typing import Iterator
+
+# Histogram upper bounds: seconds for durations, bytes for response sizes
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+DASH_UPDATE_PATH = "/_dash-update-component"
+
+# Per-request state while a Dash callback request is handled; None outside of one
+_current: contextvars.ContextVar[dict | None] = contextvars.ContextVar("callback_metrics", default=None)
+# Guards per-request state updated from page-render worker threads (components/render.py)
+_state_lock = threading.Lock()
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label tuple (Prometheus semantics)."""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...], buckets: tuple[float, ...]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            series = self._series.setdefault(labels, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                label_text = ",".join(f'{key}="{value}"' for key, value in zip(self.label_names, labels))
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{label_text},le="{bound:g}"}} {bucket_count}')
+                lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {count}')
+                lines.append(f"{self.name}_sum{{{label_text}}} {total:.6f}")
+                lines.append(f"{self.name}_count{{{label_text}}} {count}")
+        return lines
+
+
+CALLBACK_SECONDS = Histogram(
+    "dash_callback_duration_seconds",
+    "Wall time of Dash callback requests, including response serialization.",
+    ("callback",),
+    DURATION_BUCKETS,
+)
+PHASE_SECONDS = Histogram(
+    "dash_callback_phase_seconds",
+    "Time per callback request spent loading data, building figures and serializing.",
+    ("callback", "phase"),
+    DURATION_BUCKETS,
+)
+RESPONSE_BYTES = Histogram(
+    "dash_callback_response_bytes",
+    "Size of Dash callback responses.",
+    ("callback",),
+    BYTES_BUCKETS,
+)
+HISTOGRAMS = (CALLBACK_SECONDS, PHASE_SECONDS, RESPONSE_BYTES)
+
+# (callback, cache, "hit" | "miss") -> count
+_cache_lookups: dict[tuple[str, str, str], int] = defaultdict(int)
+_cache_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the block's wall time to phase `name` of the current callback request (no-op outside one).
+
+    Cells built concurrently each add their own time, so a phase can exceed the request's wall time.
+    """
+    state = _current.get()
+    if state is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        with _state_lock:
+            state["phases"][name] = state["phases"].get(name, 0.0) + elapsed
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup ("figure", "loader", "aggregate", "prerendered") for the current callback request."""
+    state = _current.get()
+    if state is not None:
+        with _state_lock:
+            counts = state["cache"].setdefault(cache, [0, 0])
+            counts[0 if hit else 1] += 1
+
+
+def _callback_labels(callback_map: dict) -> dict[str, str]:
+    """Output key -> callback label: the function name, plus the first output id when names repeat."""
+    names = {key: getattr(entry["callback"], "__name__", "callback") for key, entry in callback_map.items() if "callback" in entry}
+    repeated = {name for name in names.values() if list(names.values()).count(name) > 1}
+    labels = {}
+    for key, name in names.items():
+        if name in repeated:
+            first_output = key.strip(".").split("...")[0].split(".")[0]
+            name = f"{name}:{first_output}"
+        labels[key] = name
+    return labels
+
+
+def _timed_callback(func, label: str):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        state = _current.get()
+        if state is not None:
+            state["callback"] = label
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if state is not None:
+                state["callback_time"] = time.perf_counter() - started
+
+    return wrapper
+
+
+def _server_timing(state: dict, total: float) -> str:
+    """Server-Timing header value (durations in ms)."""
+    phases = state["phases"]
+    entries = [f"total;dur={total * 1000:.1f}"]
+    entries.append(f'callback;dur={state.get("callback_time", 0.0) * 1000:.1f};desc="{state["callback"]}"')
+    entries += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in phases.items()]
+    for cache, (hits, misses) in state["cache"].items():
+        entries.append(f'cache-{cache};desc="{hits} hit / {misses} miss"')
+    return ", ".join(entries)
+
+
+def instrument(app, allow_remote: bool = False) -> None:
+    """Wrap every callback registered on app so far and add Server-Timing headers and /metrics.
+
+    Call after all callbacks are registered. Serialization time is the request time not spent
+    in the callback function itself (Dash's JSON encoding of the outputs), plus any encoding
+    the callback records with phase("serialize"). /metrics only answers loopback clients
+    unless allow_remote is set.
+    """
+    import flask
+
+    labels = _callback_labels(app.callback_map)
+    for key, entry in app.callback_map.items():
+        # Clientside callbacks run in the browser and have no server function
+        if "callback" in entry:
+            entry["callback"] = _timed_callback(entry["callback"], labels[key])
+
+    server = app.server
+
+    @server.before_request
+    def _start_callback_metrics():
+        if flask.request.path.endswith(DASH_UPDATE_PATH):
+            flask.g.callback_metrics_token = _current.set(
+                {"started": time.perf_counter(), "callback": "unknown", "phases": {}, "cache": {}}
+            )
+
+    @server.after_request
+    def _finish_callback_metrics(response):
+        state = _current.get()
+        if state is None:
+            return response
+        total = time.perf_counter() - state["started"]
+        label = state["callback"]
+        callback_time = state.get("callback_time", 0.0)
+        in_callback_serialize = state["phases"].get("serialize", 0.0)
+        state["phases"]["serialize"] = in_callback_serialize + max(0.0, total - callback_time)
+        size = response.calculate_content_length()
+        if size is None and not response.direct_passthrough:
+            size = len(response.get_data())
+        CALLBACK_SECONDS.observe((label,), total)
+        for name, seconds in state["phases"].items():
+            PHASE_SECONDS.observe((label, name), seconds)
+        if size is not None:
+            RESPONSE_BYTES.observe((label,), size)
+        with _cache_lock:
+            for cache, (hits, misses) in state["cache"].items():
+                _cache_lookups[(label, cache, "hit")] += hits
+                _cache_lookups[(label, cache, "miss")] += misses
+        response.headers["Server-Timing"] = _server_timing(state, total)
+        return response
+
+    @server.teardown_request
+    def _reset_callback_metrics(_exc):
+        token = flask.g.pop("callback_metrics_token", None)
+        if token is not None:
+            _current.reset(token)
+
+    @server.route("/metrics")
+    def metrics():
+        if not allow_remote and flask.request.remote_addr not in ("127.0.0.1", "::1"):
+            flask.abort(403)
+        return flask.Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+def render_metrics() -> str:
+    """All callback metrics in Prometheus text exposition format."""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines += histogram.render()
+    lines += [
+        "# HELP dash_callback_cache_lookups_total Cache lookups made while handling callbacks.",
+        "# TYPE dash_callback_cache_lookups_total counter",
+    ]
+    with _cache_lock:
+        for (label, cache, result), count in sorted(_cache_lookups.items()):
+            lines.append(f'dash_callback_cache_lookups_total{{callback="{label}",cache="{cache}",result="{result}"}} {count}')
+    return "\n".join(lines) + "\n"
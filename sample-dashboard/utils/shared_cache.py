@@ -0,0 +1,125 @@
+"""
+Cross-worker loader cache: results are written once to Arrow IPC (Feather v2) files and every
+worker memory-maps them, so N gunicorn workers share one copy of each dataset in the page cache
+instead of materializing N. Enabled by LOADER_CACHE_DIR; needs pyarrow. See
+docs/06-DATA-PATTERNS.md §4 and §7 (multi-worker caching).
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:  # optional dependency
+    pa = ipc = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, workers may load concurrently
+    fcntl = None
+
+_META_KEY = b"dashboard_cache"
+
+
+class ArrowFileCache:
+    """Loader results as uncompressed Arrow IPC files in `directory`, one per (loader, args).
+
+    Each file carries a version stamp and write time in its schema metadata. Writers hold an
+    exclusive lock file per entry, so one worker refreshes while the others wait and then map
+    the new file. Files are written to a temp name and atomically renamed into place, so readers
+    never see a partial file; mapped old files stay valid after the rename.
+    """
+
+    def __init__(self, directory: str | os.PathLike, ttl: float) -> None:
+        if pa is None:
+            raise ImportError("ArrowFileCache requires pyarrow (pip install pyarrow)")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+    def path_for(self, name: str, args: tuple, kwargs: dict) -> Path:
+        """Cache file path for a loader call; args are hashed into the name."""
+        digest = hashlib.sha1(repr((args, sorted(kwargs.items()))).encode()).hexdigest()[:16]
+        return self.directory / f"{name}-{digest}.arrow"
+
+    @contextlib.contextmanager
+    def _locked(self, path: Path) -> Iterator[None]:
+        with open(path.with_suffix(".lock"), "a+") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read(self, path: Path) -> tuple[pd.DataFrame, dict] | None:
+        """Memory-map a cache file into pandas; returns (df, meta) or None if missing/unreadable.
+
+        Numeric columns without nulls are zero-copy views of the mapping (split_blocks);
+        other columns are converted.
+        """
+        try:
+            source = pa.memory_map(str(path), "r")
+            table = ipc.open_file(source).read_all()
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        meta = json.loads((table.schema.metadata or {}).get(_META_KEY, b"{}"))
+        return table.to_pandas(split_blocks=True), meta
+
+    def write(self, path: Path, df: pd.DataFrame, version: str) -> None:
+        """Atomically replace the cache file with df, stamped with version and the write time."""
+        table = pa.Table.from_pandas(df)
+        meta = {"version": version, "written_at": time.time()}
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _META_KEY: json.dumps(meta)})
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=path.stem, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_name)
+            raise
+
+    def _fresh(self, meta: dict) -> bool:
+        return time.time() - meta.get("written_at", 0) <= self.ttl
+
+    def load(self, name: str, loader: Callable[..., pd.DataFrame], args: tuple, kwargs: dict) -> tuple[pd.DataFrame, str]:
+        """Return (df, version) for a loader call, from the shared file when fresh.
+
+        Otherwise take the entry's lock, re-check (another worker may just have refreshed it),
+        and only then run the loader and publish its result.
+        """
+        path = self.path_for(name, args, kwargs)
+        cached = self.read(path)
+        if cached is not None and self._fresh(cached[1]):
+            return cached[0], cached[1]["version"]
+        with self._locked(path):
+            cached = self.read(path)
+            if cached is not None and self._fresh(cached[1]):
+                return cached[0], cached[1]["version"]
+            version = f"{name}:{uuid.uuid4().hex[:12]}"
+            df = loader(*args, **kwargs)
+            self.write(path, df, version)
+            # Serve the mapped copy; the file may already be gone (another worker's clear())
+            cached = self.read(path)
+        return (cached[0] if cached is not None else df), version
+
+    def clear(self, name: str | None = None) -> None:
+        """Delete cache files (all, or one loader's) so the next load repopulates them."""
+        pattern = f"{name}-*.arrow" if name else "*.arrow"
+        for path in self.directory.glob(pattern):
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
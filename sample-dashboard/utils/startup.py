@@ -0,0 +1,93 @@
+"""
+Startup helpers: lazily imported modules, import timing and a startup report (per-module import
+time, time to app ready and to the first rendered layout). Import this module first so its clock
+starts with the process. See docs/03-ARCHITECTURE.md (startup and warm-up).
+"""
+from __future__ import annotations
+
+import contextlib
+import importlib
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Iterator
+
+_STARTED = time.perf_counter()
+_lock = threading.Lock()
+# Serializes LazyModule imports: a second thread must not see a partially initialized module
+_import_lock = threading.RLock()
+
+# Module name (or import block label) -> import time in ms, recorded by timed_imports / import_timed
+IMPORT_TIMES: dict[str, float] = {}
+# Milestone name ("app_ready", "first_layout", "warm_up") -> ms since startup
+MILESTONES: dict[str, float] = {}
+
+
+def _elapsed_ms(since: float) -> float:
+    return round((time.perf_counter() - since) * 1000, 1)
+
+
+@contextlib.contextmanager
+def timed_imports(label: str) -> Iterator[None]:
+    """Record the time spent in a block of import statements under label."""
+    started = time.perf_counter()
+    yield
+    with _lock:
+        IMPORT_TIMES.setdefault(label, _elapsed_ms(started))
+
+
+def import_timed(name: str) -> ModuleType:
+    """importlib.import_module that records how long the import took (when not already loaded)."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    with timed_imports(name):
+        return importlib.import_module(name)
+
+
+class LazyModule(ModuleType):
+    """Module stand-in that imports the real module (timed) on first attribute access."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self._module: ModuleType | None = None
+
+    def __getattr__(self, attr: str):
+        if attr.startswith("__") or attr == "_module":
+            raise AttributeError(attr)
+        if self._module is None:
+            with _import_lock:
+                if self._module is None:
+                    self._module = import_timed(self.__name__)
+        return getattr(self._module, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """The module if already imported, else a LazyModule that imports it on first use."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def mark(milestone: str) -> bool:
+    """Record the first time a milestone is reached, in ms since startup; True if this was the first."""
+    with _lock:
+        if milestone in MILESTONES:
+            return False
+        MILESTONES[milestone] = _elapsed_ms(_STARTED)
+        return True
+
+
+def startup_report() -> dict:
+    """Recorded import times (slowest first) and milestones, e.g. for logging or a debug endpoint."""
+    with _lock:
+        imports = dict(sorted(IMPORT_TIMES.items(), key=lambda item: -item[1]))
+        return {"imports_ms": imports, "milestones_ms": dict(MILESTONES)}
+
+
+def format_startup_report() -> str:
+    """startup_report() as aligned text lines for printing on boot."""
+    report = startup_report()
+    lines = ["Startup report (ms)"]
+    lines += [f"  import {name:<32} {ms:>8.1f}" for name, ms in report["imports_ms"].items()]
+    lines += [f"  {name:<39} {ms:>8.1f}" for name, ms in report["milestones_ms"].items()]
+    return "\n".join(lines)
@@ -0,0 +1,105 @@
+"""
+Project Plotly templates: plotly_white / plotly_dark with the utils/theme.py palettes applied,
+pruned to the trace types the chart builders produce and to cartesian layout defaults, and
+registered once in plotly.io.templates. With FIGURE_TEMPLATE=reference figures go out without
+their template and the browser restores it from /_dashboard/chart-templates.js
+(assets/chart_templates.js). See docs/04-PLOTLY-GUIDE.md §4.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from functools import lru_cache
+
+import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from utils.theme import CHART_COLORWAY, CHART_COLORWAY_DARK, DARK, LIGHT, THEMES, get_colorway, get_palette
+
+# Registered template name per theme, and the plotly template each one starts from
+TEMPLATE_NAMES = {"light": "dashboard_light", "dark": "dashboard_dark"}
+BASE_TEMPLATES = {"light": "plotly_white", "dark": "plotly_dark"}
+
+# Trace types the builders produce (plotly.express and the fast path); other trace defaults are dropped
+TRACE_TYPES = ("bar", "box", "heatmap", "histogram", "pie", "scatter", "scattergl")
+
+# Layout defaults for subplot types and components the dashboard never draws
+UNUSED_LAYOUT_KEYS = (
+    "geo",
+    "polar",
+    "ternary",
+    "scene",
+    "mapbox",
+    "map",
+    "smith",
+    "annotationdefaults",
+    "shapedefaults",
+    "sliderdefaults",
+    "updatemenudefaults",
+)
+
+TEMPLATES_URL = "/_dashboard/chart-templates.js"
+
+_lock = threading.Lock()
+_registered = False
+
+
+def build_template(theme: str) -> go.layout.Template:
+    """The project template for a theme: base template + palette, without unused defaults."""
+    base = pio.templates[BASE_TEMPLATES["dark" if theme == "dark" else "light"]].to_plotly_json()
+    palette = get_palette(theme)
+    layout = {key: value for key, value in base["layout"].items() if key not in UNUSED_LAYOUT_KEYS}
+    layout.update(
+        paper_bgcolor=palette["chart_paper"],
+        plot_bgcolor=palette["chart_plot"],
+        colorway=get_colorway(theme),
+        font={**layout.get("font", {}), "color": palette["text_primary"]},
+    )
+    data = {trace_type: traces for trace_type, traces in base["data"].items() if trace_type in TRACE_TYPES}
+    return go.layout.Template(layout=layout, data=data)
+
+
+def register_templates() -> dict[str, str]:
+    """Register the project templates in plotly.io.templates (once); returns TEMPLATE_NAMES."""
+    global _registered
+    with _lock:
+        if not _registered:
+            for theme in THEMES:
+                pio.templates[TEMPLATE_NAMES[theme]] = build_template(theme)
+            _registered = True
+    return TEMPLATE_NAMES
+
+
+def templates_version() -> str:
+    """Short hash of everything the templates are built from, for cache-busting the script URL.
+
+    Computed from the inputs rather than the templates, so building them is not needed at startup.
+    """
+    inputs = [plotly.__version__, LIGHT, DARK, CHART_COLORWAY, CHART_COLORWAY_DARK, TRACE_TYPES, UNUSED_LAYOUT_KEYS]
+    return hashlib.sha1(json.dumps(inputs, sort_keys=True).encode()).hexdigest()[:12]
+
+
+@lru_cache(maxsize=1)
+def templates_script() -> str:
+    """JavaScript defining window.dashboardTemplates (template name -> template JSON)."""
+    register_templates()
+    templates = {name: pio.templates[name].to_plotly_json() for name in TEMPLATE_NAMES.values()}
+    return f"window.dashboardTemplates = {pio.json.to_json_plotly(templates)};\n"
+
+
+def serve_templates(app) -> None:
+    """Serve templates_script() at TEMPLATES_URL and load it in the page ahead of the graphs.
+
+    The URL carries templates_version(), so browsers can cache the script indefinitely.
+    """
+    import flask
+
+    @app.server.route(TEMPLATES_URL)
+    def chart_templates():
+        response = flask.Response(templates_script(), mimetype="application/javascript")
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+    app.config.external_scripts.append(f"{app.get_relative_path(TEMPLATES_URL)}?v={templates_version()}")
@@ -2,6 +2,9 @@
 Theme constants for the sample dashboard. Aligns with docs/08-UI-ACCESSIBILITY.md (light and dark).
 """
 
+# Theme names used by theme-store
+THEMES = ("light", "dark")
+
 # Light theme palette (rich royal pastels)
 LIGHT = {
     "background": "#faf8ff",